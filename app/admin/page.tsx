@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react';
 import { useRouter } from 'next/navigation';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
+import { Button } from '@/components/ui/button';
 import { StatCard } from '@/components/admin/stat-card';
 import { EventForm } from '@/components/admin/event-form';
 import { EventsTable } from '@/components/admin/events-table';
@@ -17,6 +18,7 @@ import {
     Loader2
 } from 'lucide-react';
 import { toast } from 'sonner';
+import { fetchPage } from '@/lib/utils';
 
 interface AdminStats {
     totalUsers: number;
@@ -60,6 +62,8 @@ export default function AdminPage() {
     const [isLoading, setIsLoading] = useState(true);
     const [stats, setStats] = useState<AdminStats | null>(null);
     const [events, setEvents] = useState<Event[]>([]);
+    const [eventsCursor, setEventsCursor] = useState<string | null>(null);
+    const [isLoadingMoreEvents, setIsLoadingMoreEvents] = useState(false);
     const [activeUsers, setActiveUsers] = useState<User[]>([]);
     const [razorpayKeyId, setRazorpayKeyId] = useState<string>('');
     const [currentTab, setCurrentTab] = useState('dashboard');
@@ -116,12 +120,16 @@ export default function AdminPage() {
             }
 
             // Load events
-            const eventsRes = await fetch('/api/events', {
-                headers: { 'Authorization': `Bearer ${token}` }
+            // A failed events load should not block the rest of the dashboard
+            const eventsPage = await fetchPage<Event>('/api/events', {
+                init: { headers: { 'Authorization': `Bearer ${token}` } }
+            }).catch(error => {
+                console.error('Failed to load events:', error);
+                return null;
             });
-            if (eventsRes.ok) {
-                const eventsData = await eventsRes.json();
-                setEvents(eventsData);
+            if (eventsPage) {
+                setEvents(eventsPage.items);
+                setEventsCursor(eventsPage.nextCursor);
             }
 
             // Load active users
@@ -140,6 +148,25 @@ export default function AdminPage() {
         }
     };
 
+    const loadMoreEvents = async () => {
+        if (!eventsCursor || isLoadingMoreEvents) return;
+        setIsLoadingMoreEvents(true);
+        try {
+            const token = localStorage.getItem('token');
+            const page = await fetchPage<Event>('/api/events', {
+                after: eventsCursor,
+                init: { headers: { 'Authorization': `Bearer ${token}` } }
+            });
+            setEvents(prev => [...prev, ...page.items]);
+            setEventsCursor(page.nextCursor);
+        } catch (error) {
+            console.error('Failed to load more events:', error);
+            toast.error('Failed to load more events');
+        } finally {
+            setIsLoadingMoreEvents(false);
+        }
+    };
+
     const handleEventCreated = () => {
         loadData();
         setCurrentTab('events');
@@ -267,10 +294,18 @@ export default function AdminPage() {
                                 </p>
                             </div>
                             <div className="text-sm text-muted-foreground">
-                                {events.length} event{events.length !== 1 ? 's' : ''}
+                                {stats?.totalEvents ?? events.length} event{(stats?.totalEvents ?? events.length) !== 1 ? 's' : ''}
                             </div>
                         </div>
                         <EventsTable events={events} onEventDeleted={handleEventDeleted} />
+                        {eventsCursor && (
+                            <div className="flex justify-center">
+                                <Button variant="outline" onClick={loadMoreEvents} disabled={isLoadingMoreEvents}>
+                                    {isLoadingMoreEvents && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                                    Load more events
+                                </Button>
+                            </div>
+                        )}
                     </TabsContent>
 
                     {/* Create Event Tab */}
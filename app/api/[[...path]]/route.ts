@@ -1,6 +1,9 @@
 import { NextRequest } from 'next/server';
 
 import { verifyToken, requireAuth } from '../../../backend/middleware/auth.js';
+import { cachedResponse, invalidateResponseCache } from '../../../backend/utils/responseCache.js';
+import { PASSWORD_HASHER_BUSY } from '../../../backend/utils/passwordHasher.js';
+import { runWithRequestContext, getDatabaseCommandCount } from '../../../backend/utils/requestContext.js';
 
 // Auth Controllers
 import { signup, login, getMe, updateProfile, getUserProfile } from '../../../backend/controllers/authController.js';
@@ -12,6 +15,7 @@ import {
   getStoryById,
   likeStory,
   commentOnStory,
+  getStoryComments,
   deleteStory
 } from '../../../backend/controllers/storyController.js';
 
@@ -35,6 +39,9 @@ import {
   getUserPayments
 } from '../../../backend/controllers/paymentController.js';
 
+// Media Controllers
+import { uploadMedia, getMedia } from '../../../backend/controllers/mediaController.js';
+
 // Admin Controllers
 import {
   getAdminStats,
@@ -44,11 +51,44 @@ import {
   getRecentActivity,
   deleteEventByAdmin,
   deleteStoryByAdmin,
-  getActiveUsers
+  getActiveUsers,
+  getCacheStats,
+  getPoolStats
 } from '../../../backend/controllers/adminController.js';
 
+// Reports the handler's own duration so clients can tell it apart from
+// network and connection time, and in `db` the number of MongoDB commands it
+// issued, so tests can catch per-item queries creeping back in
+async function withServerTiming(handler: () => Promise<Response>) {
+  const start = performance.now();
+  const response = await handler();
+  try {
+    response.headers.set(
+      'Server-Timing',
+      `app;dur=${(performance.now() - start).toFixed(1)}, db;desc=${getDatabaseCommandCount()}`
+    );
+  } catch {
+    // Redirects and proxied responses have immutable headers
+  }
+  return response;
+}
+
+// Lets this process's cached GETs built from `collections` pick up a write
+// immediately. Only successful writes invalidate: a rejected or failed
+// request changed nothing and must not be able to flush the cache.
+function invalidatesOnSuccess(response: Response, collections: string[]) {
+  if (response.ok) {
+    invalidateResponseCache(collections);
+  }
+  return response;
+}
+
 // GET Handler
-export async function GET(request: NextRequest, { params }: { params: Promise<{ path?: string[] }> }) {
+export function GET(request: NextRequest, context: { params: Promise<{ path?: string[] }> }) {
+  return runWithRequestContext(() => withServerTiming(() => handleGet(request, context)));
+}
+
+async function handleGet(request: NextRequest, { params }: { params: Promise<{ path?: string[] }> }) {
   const { path: routePath = [] } = await params || {};
   const pathString = routePath.join('/');
 
@@ -61,7 +101,10 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
 
     // Story Routes
     if (pathString === 'stories') {
-      return await getStories();
+      return await cachedResponse(request, { collections: ['stories', 'users', 'media'] }, () => getStories({
+        after: request.nextUrl.searchParams.get('after'),
+        limit: request.nextUrl.searchParams.get('limit')
+      }));
     }
 
     if (pathString.startsWith('stories/') && routePath.length === 2) {
@@ -69,20 +112,42 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
       return await getStoryById(storyId);
     }
 
+    if (pathString.match(/^stories\/[^/]+\/comments$/)) {
+      const storyId = routePath[1];
+      return await getStoryComments(storyId, {
+        after: request.nextUrl.searchParams.get('after'),
+        limit: request.nextUrl.searchParams.get('limit')
+      });
+    }
+
     // Event Routes
     if (pathString === 'events') {
-      return await getEvents();
+      const user = verifyToken(request);
+      const searchParams = request.nextUrl.searchParams;
+      // isAttending differs per viewer
+      return await cachedResponse(request, { collections: ['events', 'users'], viewerId: user?.userId }, () => getEvents(user, {
+        includeRsvps: searchParams.get('include') === 'rsvps',
+        creatorId: searchParams.get('creatorId'),
+        attending: searchParams.get('attending'),
+        after: searchParams.get('after'),
+        limit: searchParams.get('limit')
+      }));
     }
 
     if (pathString.startsWith('events/') && routePath.length === 2) {
       const eventId = routePath[1];
-      return await getEventById(eventId);
+      return await cachedResponse(request, { collections: ['events', 'users'] }, () => getEventById(eventId));
     }
 
     // User Routes
     if (pathString.startsWith('users/') && routePath.length === 2) {
       const userId = routePath[1];
-      return await getUserProfile(userId);
+      return await cachedResponse(request, { collections: ['users'] }, () => getUserProfile(userId));
+    }
+
+    // Media Routes
+    if (pathString.startsWith('media/') && routePath.length === 2) {
+      return await getMedia(routePath[1]);
     }
 
     // Payment Routes
@@ -115,7 +180,10 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
 
     if (pathString === 'admin/users') {
       const user = requireAuth(request);
-      return await getAllUsers(user);
+      return await getAllUsers(user, {
+        after: request.nextUrl.searchParams.get('after'),
+        limit: request.nextUrl.searchParams.get('limit')
+      });
     }
 
     if (pathString === 'admin/activity') {
@@ -128,6 +196,16 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
       return await getActiveUsers(user);
     }
 
+    if (pathString === 'admin/cache-stats') {
+      const user = requireAuth(request);
+      return await getCacheStats(user);
+    }
+
+    if (pathString === 'admin/pool-stats') {
+      const user = requireAuth(request);
+      return await getPoolStats(user);
+    }
+
     return Response.json({ error: 'Not found' }, { status: 404 });
   } catch (error: any) {
     console.error('API Error:', error);
@@ -138,14 +216,18 @@ export async function GET(request: NextRequest, { params }: { params: Promise<{
 }
 
 // POST Handler
-export async function POST(request: NextRequest, { params }: { params: Promise<{ path?: string[] }> }) {
+export function POST(request: NextRequest, context: { params: Promise<{ path?: string[] }> }) {
+  return runWithRequestContext(() => withServerTiming(() => handlePost(request, context)));
+}
+
+async function handlePost(request: NextRequest, { params }: { params: Promise<{ path?: string[] }> }) {
   const { path: routePath = [] } = await params || {};
   const pathString = routePath.join('/');
 
   try {
     // Auth Routes
     if (pathString === 'auth/signup') {
-      return await signup(request);
+      return invalidatesOnSuccess(await signup(request), ['users']);
     }
 
     if (pathString === 'auth/login') {
@@ -155,31 +237,33 @@ export async function POST(request: NextRequest, { params }: { params: Promise<{
     // Story Routes
     if (pathString === 'stories') {
       const user = requireAuth(request);
-      return await createStory(request, user);
+      return invalidatesOnSuccess(await createStory(request, user), ['stories']);
     }
 
     if (pathString.match(/stories\/[^/]+\/like/)) {
       const user = requireAuth(request);
       const storyId = routePath[1];
-      return await likeStory(storyId, user);
+      const full = request.nextUrl.searchParams.get('full') === 'true';
+      return invalidatesOnSuccess(await likeStory(storyId, user, { full }), ['stories']);
     }
 
     if (pathString.match(/stories\/[^/]+\/comment/)) {
       const user = requireAuth(request);
       const storyId = routePath[1];
-      return await commentOnStory(request, storyId, user);
+      return invalidatesOnSuccess(await commentOnStory(request, storyId, user), ['stories']);
     }
 
     // Event Routes
     if (pathString === 'events') {
       const user = requireAuth(request);
-      return await createEvent(request, user);
+      return invalidatesOnSuccess(await createEvent(request, user), ['events']);
     }
 
     if (pathString.match(/events\/[^/]+\/rsvp/)) {
       const user = requireAuth(request);
       const eventId = routePath[1];
-      return await toggleRSVP(eventId, user);
+      const full = request.nextUrl.searchParams.get('full') === 'true';
+      return invalidatesOnSuccess(await toggleRSVP(eventId, user, { full }), ['events']);
     }
 
     // Payment Routes - RazorPay
@@ -190,7 +274,8 @@ export async function POST(request: NextRequest, { params }: { params: Promise<{
 
     if (pathString === 'payments/razorpay/verify-payment') {
       const user = requireAuth(request);
-      return await verifyRazorpayPayment(request, user);
+      // A verified payment adds the payer to the event's RSVPs
+      return invalidatesOnSuccess(await verifyRazorpayPayment(request, user), ['events']);
     }
 
     if (pathString === 'payments/razorpay/webhook') {
@@ -205,41 +290,30 @@ export async function POST(request: NextRequest, { params }: { params: Promise<{
 
     if (pathString === 'payments/paypal/capture-order') {
       const user = requireAuth(request);
-      return await capturePayPalOrder(request, user);
+      return invalidatesOnSuccess(await capturePayPalOrder(request, user), ['events']);
     }
 
     // Upload Route
     if (pathString === 'upload') {
       const user = requireAuth(request);
-
-      const formData = await request.formData();
-      const file = formData.get('file');
-      if (!(file instanceof File)) {
-        return Response.json({ error: "Invalid file" }, { status: 400 });
-      }
-
-      if (!file) {
-        return Response.json({ error: 'No file provided' }, { status: 400 });
-      }
-
-      const buffer = await file.arrayBuffer();
-      const base64 = Buffer.from(buffer).toString('base64');
-      const dataUrl = `data:${file.type};base64,${base64}`;
-
-      return Response.json({ url: dataUrl });
+      return invalidatesOnSuccess(await uploadMedia(request, user), ['media']);
     }
 
     return Response.json({ error: 'Not found' }, { status: 404 });
   } catch (error: any) {
     console.error('API Error:', error);
     const statusCode = error.message === 'Authentication required' ? 401 :
-      error.message === 'Admin access required' ? 403 : 500;
+      error.message === 'Admin access required' ? 403 :
+      error.message === PASSWORD_HASHER_BUSY ? 503 : 500;
     return Response.json({ error: error.message }, { status: statusCode });
-  }
 }
 
 // PUT Handler
-export async function PUT(request: NextRequest, { params }: { params: Promise<{ path?: string[] }> }) {
+export function PUT(request: NextRequest, context: { params: Promise<{ path?: string[] }> }) {
+  return runWithRequestContext(() => withServerTiming(() => handlePut(request, context)));
+}
+
+async function handlePut(request: NextRequest, { params }: { params: Promise<{ path?: string[] }> }) {
   const { path: routePath = [] } = await params || {};
   const pathString = routePath.join('/');
 
@@ -249,7 +323,7 @@ export async function PUT(request: NextRequest, { params }: { params: Promise<{
     // User Routes
     if (pathString.startsWith('users/') && routePath.length === 2) {
       const userId = routePath[1];
-      return await updateProfile(request, user, userId);
+      return invalidatesOnSuccess(await updateProfile(request, user, userId), ['users']);
     }
 
     return Response.json({ error: 'Not found' }, { status: 404 });
@@ -258,11 +332,14 @@ export async function PUT(request: NextRequest, { params }: { params: Promise<{
     const statusCode = error.message === 'Authentication required' ? 401 :
       error.message === 'Admin access required' ? 403 : 500;
     return Response.json({ error: error.message }, { status: statusCode });
-  }
 }
 
 // DELETE Handler
-export async function DELETE(request: NextRequest, { params }: { params: Promise<{ path?: string[] }> }) {
+export function DELETE(request: NextRequest, context: { params: Promise<{ path?: string[] }> }) {
+  return runWithRequestContext(() => withServerTiming(() => handleDelete(request, context)));
+}
+
+async function handleDelete(request: NextRequest, { params }: { params: Promise<{ path?: string[] }> }) {
   const { path: routePath = [] } = await params || {};
   const pathString = routePath.join('/');
 
@@ -272,24 +349,24 @@ export async function DELETE(request: NextRequest, { params }: { params: Promise
     // Story Routes
     if (pathString.startsWith('stories/') && routePath.length === 2) {
       const storyId = routePath[1];
-      return await deleteStory(storyId, user);
+      return invalidatesOnSuccess(await deleteStory(storyId, user), ['stories']);
     }
 
     // Event Routes
     if (pathString.startsWith('events/') && routePath.length === 2) {
       const eventId = routePath[1];
-      return await deleteEvent(eventId, user);
+      return invalidatesOnSuccess(await deleteEvent(eventId, user), ['events']);
     }
 
     // Admin Routes
     if (pathString.startsWith('admin/events/') && routePath.length === 3) {
       const eventId = routePath[2];
-      return await deleteEventByAdmin(user, eventId);
+      return invalidatesOnSuccess(await deleteEventByAdmin(user, eventId), ['events']);
     }
 
     if (pathString.startsWith('admin/stories/') && routePath.length === 3) {
       const storyId = routePath[2];
-      return await deleteStoryByAdmin(user, storyId);
+      return invalidatesOnSuccess(await deleteStoryByAdmin(user, storyId), ['stories']);
     }
 
     return Response.json({ error: 'Not found' }, { status: 404 });
@@ -298,5 +375,4 @@ export async function DELETE(request: NextRequest, { params }: { params: Promise
     const statusCode = error.message === 'Authentication required' ? 401 :
       error.message === 'Admin access required' ? 403 : 500;
     return Response.json({ error: error.message }, { status: statusCode });
-  }
 }
\ No newline at end of file
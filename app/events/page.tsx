@@ -14,6 +14,7 @@ import { Input } from '@/components/ui/input';
 import { Select, SelectTrigger, SelectValue, SelectContent, SelectItem } from '@/components/ui/select';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogDescription } from '@/components/ui/dialog';
 import { Label } from '@/components/ui/label';
+import { fetchPage } from '@/lib/utils';
 import { Textarea } from '@/components/ui/textarea';
 import { Calendar, MapPin, Users, ChevronRight, Sun, Moon, Plus, ShieldCheck, Trash2 } from 'lucide-react';
 
@@ -30,7 +31,7 @@ type EventType = {
   rsvpCount?: number;
   maxAttendees?: number;
   creator?: { id?: string; name?: string; profileImage?: string };
-  rsvps?: string[]; // user IDs
+  isAttending?: boolean; // whether the signed-in user has RSVP'd
 };
 
 export default function EventsPage() {
@@ -39,6 +40,8 @@ export default function EventsPage() {
   const [query, setQuery] = useState('');
   const [filterType, setFilterType] = useState<'all' | 'ride' | 'trackday' | 'meetup' | 'festival'>('all');
   const [loading, setLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [mounted, setMounted] = useState(false);
   const { toast } = useToast();
   const { darkMode } = useTheme();
@@ -62,8 +65,8 @@ export default function EventsPage() {
 
   // Fetch events
   useEffect(() => {
-    fetchAllEvents();
-  }, []);
+    fetchEvents();
+  }, [token]);
 
   useEffect(() => {
     applyFilters();
@@ -71,27 +74,39 @@ export default function EventsPage() {
 
 
 
-  const fetchAllEvents = async () => {
+  const fetchEvents = async () => {
     setLoading(true);
     try {
-      const res = await fetch('/api/events');
-      if (!res.ok) {
-        // fallback to empty or mock data
-        console.warn('Failed to fetch events, status:', res.status);
-        setEvents([]);
-        setFilteredEvents([]);
-        setLoading(false);
-        return;
-      }
-      const data = await res.json();
-      setEvents(Array.isArray(data) ? data : []);
+      const page = await fetchPage<EventType>('/api/events', {
+        init: { headers: token ? { Authorization: `Bearer ${token}` } : {} }
+      });
+      setEvents(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error('Error fetching events:', err);
       setEvents([]);
+      setNextCursor(null);
     }
     setLoading(false);
   };
 
+  const loadMoreEvents = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage<EventType>('/api/events', {
+        after: nextCursor,
+        init: { headers: token ? { Authorization: `Bearer ${token}` } : {} }
+      });
+      setEvents(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error('Error fetching more events:', err);
+      toast({ title: 'Error', description: 'Could not load more events', variant: 'destructive' });
+    }
+    setLoadingMore(false);
+  };
+
   const applyFilters = () => {
     let out = events.slice();
     if (filterType !== 'all') {
@@ -120,7 +135,9 @@ export default function EventsPage() {
         return;
       }
       const updated = await res.json();
-      setEvents(prev => prev.map(ev => ev.id === eventId ? { ...ev, ...updated } : ev));
+      setEvents(prev => prev.map(ev => ev.id === eventId
+        ? { ...ev, isAttending: updated.attending, rsvpCount: updated.rsvpCount }
+        : ev));
       toast({ title: 'RSVP updated', description: 'Your RSVP status changed' });
     } catch (err) {
       console.error(err);
@@ -302,10 +319,10 @@ export default function EventsPage() {
               <CardFooter>
                 <div className="w-full flex items-center gap-3">
                   <Button
-                    className={`flex-1 font-bold ${ev.rsvps?.includes(user?.id) ? 'bg-stone-800 text-white' : 'bg-gradient-to-r from-blue-600 to-red-600 text-white'}`}
+                    className={`flex-1 font-bold ${ev.isAttending ? 'bg-stone-800 text-white' : 'bg-gradient-to-r from-blue-600 to-red-600 text-white'}`}
                     onClick={() => handleRSVP(ev.id)}
                   >
-                    {ev.rsvps?.includes(user?.id) ? 'Cancel RSVP' : 'RSVP Now'}
+                    {ev.isAttending ? 'Cancel RSVP' : 'RSVP Now'}
                   </Button>
 
                   <Link href={`/events/${ev.id}`} className="inline-flex items-center gap-2 text-sm font-semibold">
@@ -316,6 +333,14 @@ export default function EventsPage() {
             </Card>
           ))}
         </div>
+
+        {nextCursor && !loading && (
+          <div className="mt-10 flex justify-center">
+            <Button variant="outline" onClick={loadMoreEvents} disabled={loadingMore}>
+              {loadingMore ? 'Loading...' : 'Load more events'}
+            </Button>
+          </div>
+        )}
       </main>
 
       {/* Create Event Dialog (admin) */}
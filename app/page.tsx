@@ -18,6 +18,7 @@ import { Heart, MessageCircle, Calendar, MapPin, Users, Plus, LogOut, User, Spar
 import { useTheme } from '@/components/providers/theme-provider';
 import { useAuth } from '@/components/providers/auth-provider';
 import { LOGO_URL } from '@/lib/mock-data';
+import { fetchPage } from '@/lib/utils';
 
 // Landing Page Components
 import { HeroSection } from '@/components/landing/hero-section';
@@ -32,6 +33,8 @@ export default function App() {
   const { user, token, showAuthDialog, setShowAuthDialog, authMode, setAuthMode, login, logout, updateUser } = useAuth();
   const [stories, setStories] = useState<any[]>([]);
   const [events, setEvents] = useState<any[]>([]);
+  const [eventsCursor, setEventsCursor] = useState<string | null>(null);
+  const [loadingMoreEvents, setLoadingMoreEvents] = useState(false);
   const [activeTab, setActiveTab] = useState('stories');
   const [loading, setLoading] = useState(false);
   const [mounted, setMounted] = useState(false);
@@ -88,16 +91,32 @@ export default function App() {
 
   const fetchEvents = async () => {
     try {
-      const res = await fetch('/api/events');
-      if (res.ok) {
-        const data = await res.json();
-        setEvents(data);
-      }
+      const page = await fetchPage('/api/events', {
+        init: { headers: token ? { Authorization: `Bearer ${token}` } : {} }
+      });
+      setEvents(page.items);
+      setEventsCursor(page.nextCursor);
     } catch (error) {
       console.error('Error fetching events:', error);
     }
   };
 
+  const loadMoreEvents = async () => {
+    if (!eventsCursor || loadingMoreEvents) return;
+    setLoadingMoreEvents(true);
+    try {
+      const page = await fetchPage('/api/events', {
+        after: eventsCursor,
+        init: { headers: token ? { Authorization: `Bearer ${token}` } : {} }
+      });
+      setEvents(prev => [...prev, ...page.items]);
+      setEventsCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error fetching more events:', error);
+    }
+    setLoadingMoreEvents(false);
+  };
+
   const handleAuth = async () => {
     setLoading(true);
     try {
@@ -304,7 +323,10 @@ export default function App() {
 
       if (res.ok) {
         const data = await res.json();
-        setStories(stories.map(s => s.id === storyId ? { ...s, likes: data.likes } : s));
+        const otherLikes = (story: any) => (story.likes || []).filter((id: string) => id !== user?.id);
+        setStories(stories.map(s => s.id === storyId
+          ? { ...s, likes: data.liked ? [...otherLikes(s), user?.id] : otherLikes(s) }
+          : s));
       }
     } catch (error) {
       console.error('Error liking story:', error);
@@ -320,10 +342,10 @@ export default function App() {
 
       if (res.ok) {
         const data = await res.json();
-        setEvents(events.map(e => e.id === eventId ? { ...e, rsvps: data.rsvps, rsvpCount: data.rsvps.length } : e));
+        setEvents(events.map(e => e.id === eventId ? { ...e, isAttending: data.attending, rsvpCount: data.rsvpCount } : e));
         toast({
-          title: data.rsvps.includes(user?.id) ? 'RSVP confirmed!' : 'RSVP cancelled',
-          description: data.rsvps.includes(user?.id) ? 'See you at the event!' : 'You cancelled your RSVP'
+          title: data.attending ? 'RSVP confirmed!' : 'RSVP cancelled',
+          description: data.attending ? 'See you at the event!' : 'You cancelled your RSVP'
         });
       }
     } catch (error) {
@@ -345,7 +367,7 @@ export default function App() {
 
       if (res.ok) {
         const data = await res.json();
-        updateUser(data);
+        updateUser(data, res.headers.get('X-Refreshed-Token'));
         setShowProfileDialog(false);
         toast({
           title: 'Profile updated!',
@@ -743,11 +765,18 @@ export default function App() {
 
                     {story.mediaUrls && story.mediaUrls.length > 0 && (
                       <div className="grid grid-cols-2 gap-2">
-                        {story.mediaUrls.map((url: string, idx: number) => (
-                          <div key={idx} className="relative aspect-video bg-stone-800 rounded-lg overflow-hidden border border-stone-700/20">
-                            <img src={url} alt="Story media" className="w-full h-full object-cover" />
-                          </div>
-                        ))}
+                        {story.mediaUrls.map((url: string, idx: number) => {
+                          const media = story.media?.[idx];
+                          return (
+                            <div key={idx} className="relative aspect-video bg-stone-800 rounded-lg overflow-hidden border border-stone-700/20">
+                              <picture className="block w-full h-full">
+                                {media?.srcset?.avif && <source type="image/avif" srcSet={media.srcset.avif} sizes="(min-width: 768px) 320px, 50vw" />}
+                                {media?.srcset?.webp && <source type="image/webp" srcSet={media.srcset.webp} sizes="(min-width: 768px) 320px, 50vw" />}
+                                <img src={url} alt="Story media" loading="lazy" className="w-full h-full object-cover" />
+                              </picture>
+                            </div>
+                          );
+                        })}
                       </div>
                     )}
                   </CardContent>
@@ -765,7 +794,7 @@ export default function App() {
                       </Button>
                       <Button variant="ghost" size="sm" className="gap-2 text-stone-400">
                         <MessageCircle className="w-5 h-5" />
-                        {story.comments?.length || 0}
+                        {story.commentCount || 0}
                       </Button>
                     </div>
                   </CardFooter>
@@ -847,17 +876,29 @@ export default function App() {
                     <CardFooter>
                       <Button
                         onClick={() => handleRSVP(event.id)}
-                        className={`w-full font-bold uppercase ${event.rsvps?.includes(user.id)
+                        className={`w-full font-bold uppercase ${event.isAttending
                           ? 'bg-stone-800 hover:bg-stone-700 text-white'
                           : 'bg-gradient-to-r from-blue-600 to-red-600 hover:from-blue-700 hover:to-red-700 text-white shadow-lg shadow-red-900/50'}`}
                       >
-                        {event.rsvps?.includes(user.id) ? 'Cancel RSVP' : 'RSVP Now'}
+                        {event.isAttending ? 'Cancel RSVP' : 'RSVP Now'}
                       </Button>
                     </CardFooter>
                   </Card>
                 ))}
               </div>
             )}
+            {eventsCursor && (
+              <div className="flex justify-center">
+                <Button
+                  variant="outline"
+                  onClick={loadMoreEvents}
+                  disabled={loadingMoreEvents}
+                  className="border-stone-700 text-stone-300 font-bold uppercase"
+                >
+                  {loadingMoreEvents ? 'Loading...' : 'Load More Events'}
+                </Button>
+              </div>
+            )}
           </TabsContent>
         </Tabs>
       </main>
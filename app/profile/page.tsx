@@ -11,36 +11,44 @@ import { Toaster } from '@/components/ui/toaster';
 import { useToast } from '@/hooks/use-toast';
 import { useTheme } from '@/components/providers/theme-provider';
 import { useAuth } from '@/components/providers/auth-provider';
+import { fetchPage } from '@/lib/utils';
 
 export default function ProfilePage() {
   const [mounted, setMounted] = useState(false);
   const { darkMode } = useTheme();
   const { user, token } = useAuth();
   const [events, setEvents] = useState<any[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
   const { toast } = useToast();
 
   useEffect(() => {
     setMounted(true);
     fetchEvents();
-  }, []);
+  }, [token]);
 
 
 
-  const fetchEvents = async () => {
+  // rides booked = events the signed-in user is attending, filtered server-side
+  const fetchEvents = async (after: string | null = null) => {
+    if (!token) {
+      setEvents([]);
+      setNextCursor(null);
+      return;
+    }
     try {
-      const res = await fetch('/api/events');
-      if (res.ok) {
-        const data = await res.json();
-        setEvents(data);
-      }
+      const page = await fetchPage('/api/events?attending=me', {
+        after,
+        init: { headers: { Authorization: `Bearer ${token}` } }
+      });
+      setEvents(prev => after ? [...prev, ...page.items] : page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error('fetchEvents', err);
     }
   };
 
-  // rides booked = events where event.rsvps includes user.id
-  const ridesBooked = user ? events.filter(e => Array.isArray(e.rsvps) && e.rsvps.includes(user.id)) : [];
+  const ridesBooked = user ? events : [];
 
   const handleCancelRsvp = async (eventId: string) => {
     if (!confirm('Cancel your RSVP?')) return;
@@ -52,9 +60,8 @@ export default function ProfilePage() {
         headers: { Authorization: token ? `Bearer ${token}` : '' },
       });
       if (res.ok) {
-        const data = await res.json();
-        // refresh events and user
-        await fetchEvents();
+        // the cancelled ride drops out of the attending list
+        setEvents(prev => prev.filter(e => e.id !== eventId));
         toast({
           title: 'RSVP cancelled',
           description: 'You\'ve been removed from the attendee list'
@@ -121,7 +128,7 @@ export default function ProfilePage() {
             <div className="flex items-center justify-between mb-6">
               <h3 className={`text-3xl font-black ${darkMode ? 'text-amber-50' : 'text-stone-900'}`}>Your Rides Booked</h3>
               <div className="text-sm text-stone-500">
-                {ridesBooked.length} {ridesBooked.length === 1 ? 'ride' : 'rides'}
+                {ridesBooked.length}{nextCursor ? '+' : ''} {ridesBooked.length === 1 && !nextCursor ? 'ride' : 'rides'}
               </div>
             </div>
 
@@ -155,7 +162,7 @@ export default function ProfilePage() {
                         </div>
 
                         <div className="text-sm text-stone-400">
-                          <div>Attending: {ev.rsvpCount || (ev.rsvps?.length ?? 0)}</div>
+                          <div>Attending: {ev.rsvpCount || 0}</div>
                         </div>
                       </div>
                     </CardHeader>
@@ -183,6 +190,14 @@ export default function ProfilePage() {
                 ))}
               </div>
             )}
+
+            {nextCursor && (
+              <div className="mt-6 flex justify-center">
+                <Button variant="outline" onClick={() => fetchEvents(nextCursor)}>
+                  Load more rides
+                </Button>
+              </div>
+            )}
           </section>
 
           {/* small footer inside profile page */}
@@ -38,3 +38,7 @@ export const RAZORPAY_WEBHOOK_SECRET = process.env.RAZORPAY_WEBHOOK_SECRET || 'p
 export const PAYPAL_CLIENT_ID = process.env.NEXT_PUBLIC_PAYPAL_CLIENT_ID || 'paypal_placeholder_client_id';
 export const PAYPAL_CLIENT_SECRET = process.env.PAYPAL_CLIENT_SECRET || 'paypal_placeholder_secret';
 export const PAYPAL_MODE = process.env.PAYPAL_MODE || 'sandbox'; // 'sandbox' or 'live'
+
+// Password hashing (bcrypt cost factor). Hashes below this cost are upgraded
+// on the next successful login.
+export const BCRYPT_COST = parseInt(process.env.BCRYPT_COST || '10', 10);
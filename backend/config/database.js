@@ -1,37 +1,78 @@
 import { MongoClient } from 'mongodb';
+import { ensureIndexes } from './indexes.js';
+import { PoolMetrics } from './poolMetrics.js';
+import { countDatabaseCommand } from '../utils/requestContext.js';
 
 const MONGO_URL = process.env.MONGO_URL || 'mongodb://localhost:27017';
 const DB_NAME = process.env.DB_NAME || 'moto_saga_db';
 
-let cachedClient = null;
-let cachedDb = null;
+export const MONGO_MAX_POOL_SIZE = parseInt(process.env.MONGO_MAX_POOL_SIZE || '10', 10);
+export const MONGO_MIN_POOL_SIZE = parseInt(process.env.MONGO_MIN_POOL_SIZE || '2', 10);
+const MONGO_MAX_IDLE_TIME_MS = parseInt(process.env.MONGO_MAX_IDLE_TIME_MS || '0', 10);
+const MONGO_WAIT_QUEUE_TIMEOUT_MS = parseInt(process.env.MONGO_WAIT_QUEUE_TIMEOUT_MS || '0', 10);
 
-export async function connectToDatabase() {
-  if (cachedClient && cachedDb) {
-    return { client: cachedClient, db: cachedDb };
-  }
+const poolMetrics = new PoolMetrics({
+  maxPoolSize: MONGO_MAX_POOL_SIZE,
+  minPoolSize: MONGO_MIN_POOL_SIZE
+});
 
-  try {
-    const client = new MongoClient(MONGO_URL, {
-      maxPoolSize: 10,
-      minPoolSize: 2,
-      serverSelectionTimeoutMS: 5000,
-    });
+// Concurrent first callers all await this one promise, so only one client
+// is ever created per process. Cleared on failure so the next call retries.
+let connection = null;
+
+async function connect() {
+  const client = new MongoClient(MONGO_URL, {
+    maxPoolSize: MONGO_MAX_POOL_SIZE,
+    minPoolSize: MONGO_MIN_POOL_SIZE,
+    maxIdleTimeMS: MONGO_MAX_IDLE_TIME_MS,
+    waitQueueTimeoutMS: MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    serverSelectionTimeoutMS: 5000,
+    monitorCommands: true
+  });
+  poolMetrics.attach(client);
+  client.on('commandStarted', countDatabaseCommand);
 
+  try {
     await client.connect();
-    const db = client.db(DB_NAME);
+  } catch (error) {
+    await client.close().catch(() => {});
+    throw error;
+  }
+  const db = client.db(DB_NAME);
 
-    cachedClient = client;
-    cachedDb = db;
+  // A failure here must not take the API down
+  await ensureIndexes(db).catch(error => {
+    console.error('MongoDB index bootstrap error:', error);
+  });
 
-    return { client, db };
-  } catch (error) {
-    console.error('MongoDB connection error:', error);
-    throw new Error('Failed to connect to database');
+  return { client, db };
+}
+
+export async function connectToDatabase() {
+  if (!connection) {
+    connection = connect().catch(error => {
+      connection = null;
+      console.error('MongoDB connection error:', error);
+      throw new Error('Failed to connect to database');
+    });
   }
+  return await connection;
 }
 
 export async function getDatabase() {
   const { db } = await connectToDatabase();
   return db;
 }
+
+// Called at server start so the first request does not pay for the
+// handshake; minPoolSize connections are opened in the background
+export async function warmUpDatabase() {
+  const startedAt = Date.now();
+  const { db } = await connectToDatabase();
+  await db.command({ ping: 1 });
+  console.log(`MongoDB ready in ${Date.now() - startedAt}ms (pool ${MONGO_MIN_POOL_SIZE}-${MONGO_MAX_POOL_SIZE})`);
+}
+
+export function getPoolMetrics() {
+  return poolMetrics.snapshot();
+}
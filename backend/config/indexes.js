@@ -0,0 +1,99 @@
+// Index definitions for every collection the models and controllers query.
+// Names are explicit so the startup check can compare against listIndexes().
+export const INDEX_SPECS = {
+  users: [
+    { key: { id: 1 }, name: 'id_unique', unique: true },
+    { key: { email: 1 }, name: 'email_unique', unique: true },
+    { key: { createdAt: -1, id: -1 }, name: 'createdAt_id' },
+    { key: { updatedAt: -1 }, name: 'updatedAt_desc' }
+  ],
+  stories: [
+    { key: { id: 1 }, name: 'id_unique', unique: true },
+    { key: { userId: 1, createdAt: -1 }, name: 'userId_createdAt' },
+    { key: { createdAt: -1, id: -1 }, name: 'createdAt_id' },
+    { key: { updatedAt: -1 }, name: 'updatedAt_desc' }
+  ],
+  events: [
+    { key: { id: 1 }, name: 'id_unique', unique: true },
+    { key: { creatorId: 1, date: 1 }, name: 'creatorId_date' },
+    { key: { date: 1, id: 1 }, name: 'date_id' },
+    { key: { creatorId: 1, date: 1, id: 1 }, name: 'creatorId_date_id' },
+    { key: { rsvps: 1, date: 1, id: 1 }, name: 'rsvps_date_id' },
+    { key: { createdAt: -1 }, name: 'createdAt_desc' },
+    { key: { updatedAt: -1 }, name: 'updatedAt_desc' }
+  ],
+  comments: [
+    { key: { id: 1 }, name: 'id_unique', unique: true },
+    { key: { storyId: 1, createdAt: 1, id: 1 }, name: 'storyId_createdAt' }
+  ],
+  media: [
+    { key: { key: 1 }, name: 'key_unique', unique: true },
+    { key: { url: 1, status: 1 }, name: 'url_status' },
+    { key: { updatedAt: -1 }, name: 'updatedAt_desc' }
+  ],
+  payments: [
+    { key: { id: 1 }, name: 'id_unique', unique: true },
+    // Orders are created with an empty gatewayOrderId until the gateway responds
+    {
+      key: { gatewayOrderId: 1 },
+      name: 'gatewayOrderId_unique',
+      unique: true,
+      partialFilterExpression: { gatewayOrderId: { $type: 'string', $gt: '' } }
+    },
+    { key: { userId: 1, createdAt: -1 }, name: 'userId_createdAt' },
+    { key: { eventId: 1, createdAt: -1 }, name: 'eventId_createdAt' },
+    { key: { status: 1, createdAt: -1 }, name: 'status_createdAt' },
+    { key: { createdAt: -1 }, name: 'createdAt_desc' }
+  ]
+};
+
+export async function findMissingIndexes(db) {
+  const missing = [];
+
+  for (const [collectionName, specs] of Object.entries(INDEX_SPECS)) {
+    let existing = [];
+    try {
+      existing = await db.collection(collectionName).listIndexes().toArray();
+    } catch (error) {
+      // NamespaceNotFound: the collection has not been created yet
+      if (error.codeName !== 'NamespaceNotFound') {
+        throw error;
+      }
+    }
+
+    const existingNames = new Set(existing.map(index => index.name));
+    for (const spec of specs) {
+      if (!existingNames.has(spec.name)) {
+        missing.push(`${collectionName}.${spec.name}`);
+      }
+    }
+  }
+
+  return missing;
+}
+
+// createIndexes is a no-op for indexes that already exist with the same
+// definition, so this is safe to run on every process start
+export async function ensureIndexes(db) {
+  const missing = await findMissingIndexes(db);
+  if (missing.length === 0) {
+    return [];
+  }
+
+  console.warn(`MongoDB missing indexes: ${missing.join(', ')}`);
+
+  for (const [collectionName, specs] of Object.entries(INDEX_SPECS)) {
+    try {
+      await db.collection(collectionName).createIndexes(specs);
+    } catch (error) {
+      console.error(`Failed to create indexes on ${collectionName}:`, error.message);
+    }
+  }
+
+  const stillMissing = await findMissingIndexes(db);
+  if (stillMissing.length > 0) {
+    console.error(`MongoDB indexes still missing after bootstrap: ${stillMissing.join(', ')}`);
+  }
+
+  return stillMissing;
+}
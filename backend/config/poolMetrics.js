@@ -0,0 +1,99 @@
+// Connection pool counters for capacity planning, fed by the driver's CMAP
+// events. Checkout wait is the time between a request asking the pool for a
+// connection and getting one; a growing p99 with inUse pinned at
+// maxPoolSize means the pool is too small for the load.
+const WAIT_SAMPLE_SIZE = 1000;
+
+export class PoolMetrics {
+  constructor({ maxPoolSize, minPoolSize }) {
+    this.maxPoolSize = maxPoolSize;
+    this.minPoolSize = minPoolSize;
+    this.open = 0;
+    this.inUse = 0;
+    this.peakInUse = 0;
+    this.waiting = 0;
+    this.peakWaiting = 0;
+    this.checkouts = 0;
+    this.checkoutFailures = 0;
+    this.waitSamples = [];
+    this.maxWaitMs = 0;
+    // Checkout start times per server, in request order; the driver serves
+    // its wait queue FIFO
+    this.pendingStarts = new Map();
+  }
+
+  attach(client) {
+    client.on('connectionCreated', () => {
+      this.open += 1;
+    });
+    client.on('connectionClosed', () => {
+      this.open = Math.max(0, this.open - 1);
+    });
+    client.on('connectionCheckOutStarted', (event) => {
+      this.pending(event.address).push(Date.now());
+      this.waiting += 1;
+      this.peakWaiting = Math.max(this.peakWaiting, this.waiting);
+    });
+    client.on('connectionCheckedOut', (event) => {
+      const startedAt = this.pending(event.address).shift();
+      this.waiting = Math.max(0, this.waiting - 1);
+      this.checkouts += 1;
+      this.inUse += 1;
+      this.peakInUse = Math.max(this.peakInUse, this.inUse);
+      // Drivers from 6.9 report the wait themselves
+      this.recordWait(event.durationMS ?? (startedAt ? Date.now() - startedAt : 0));
+    });
+    client.on('connectionCheckOutFailed', (event) => {
+      this.pending(event.address).shift();
+      this.waiting = Math.max(0, this.waiting - 1);
+      this.checkoutFailures += 1;
+    });
+    client.on('connectionCheckedIn', () => {
+      this.inUse = Math.max(0, this.inUse - 1);
+    });
+  }
+
+  pending(address) {
+    if (!this.pendingStarts.has(address)) {
+      this.pendingStarts.set(address, []);
+    }
+    return this.pendingStarts.get(address);
+  }
+
+  recordWait(ms) {
+    this.waitSamples.push(ms);
+    if (this.waitSamples.length > WAIT_SAMPLE_SIZE) {
+      this.waitSamples.shift();
+    }
+    this.maxWaitMs = Math.max(this.maxWaitMs, ms);
+  }
+
+  snapshot() {
+    const sorted = [...this.waitSamples].sort((a, b) => a - b);
+    const percentile = (pct) => {
+      if (sorted.length === 0) {
+        return 0;
+      }
+      return sorted[Math.min(sorted.length - 1, Math.ceil((pct / 100) * sorted.length) - 1)];
+    };
+
+    return {
+      maxPoolSize: this.maxPoolSize,
+      minPoolSize: this.minPoolSize,
+      open: this.open,
+      inUse: this.inUse,
+      peakInUse: this.peakInUse,
+      waiting: this.waiting,
+      peakWaiting: this.peakWaiting,
+      checkouts: this.checkouts,
+      checkoutFailures: this.checkoutFailures,
+      checkoutWaitMs: {
+        samples: sorted.length,
+        p50: percentile(50),
+        p95: percentile(95),
+        p99: percentile(99),
+        max: this.maxWaitMs
+      }
+    };
+  }
+}
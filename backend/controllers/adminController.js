@@ -1,96 +1,44 @@
-import { getDatabase } from '../config/database.js';
-import { PaymentModel } from '../models/Payment.js';
+import { getPoolMetrics } from '../config/database.js';
+import { getRequestContext } from '../utils/requestContext.js';
+import { AdminStatsModel, activeUsersPipeline } from '../models/AdminStats.js';
 import { EventModel } from '../models/Event.js';
 import { UserModel } from '../models/User.js';
+import { CommentModel } from '../models/Comment.js';
+import { getUserSnippetCache } from '../utils/userSnippetCache.js';
+import { parsePageParams, keysetFilter, toPage, pageHeaders } from '../utils/pagination.js';
+
+// Maps each of `ids` to the number of documents in `collectionName` whose
+// `field` references it, using one $group instead of a count per id
+async function countByField(db, collectionName, field, ids) {
+  const counts = await db.collection(collectionName).aggregate([
+    { $match: { [field]: { $in: ids } } },
+    { $group: { _id: `$${field}`, count: { $sum: 1 } } }
+  ]).toArray();
+
+  return new Map(counts.map(({ _id, count }) => [_id, count]));
+}
 
 export async function getAdminStats(authUser) {
   if (authUser.role !== 'admin') {
     return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
-  const db = await getDatabase();
-  const paymentModel = new PaymentModel(db);
-
-  // Get basic stats
-  const totalUsers = await db.collection('users').countDocuments();
-  const totalStories = await db.collection('stories').countDocuments();
-  const totalEvents = await db.collection('events').countDocuments();
-
-  // Get users by role
-  const usersByRole = await db.collection('users').aggregate([
-    { $group: { _id: '$role', count: { $sum: 1 } } }
-  ]).toArray();
-
-  // Get payment stats
-  const paymentStats = await paymentModel.getStats();
-
-  // Get recent activity counts (last 7 days)
-  const sevenDaysAgo = new Date();
-  sevenDaysAgo.setDate(sevenDaysAgo.getDate() - 7);
-
-  const recentUsers = await db.collection('users').countDocuments({
-    createdAt: { $gte: sevenDaysAgo.toISOString() }
-  });
-
-  const recentStories = await db.collection('stories').countDocuments({
-    createdAt: { $gte: sevenDaysAgo.toISOString() }
-  });
-
-  const recentEvents = await db.collection('events').countDocuments({
-    createdAt: { $gte: sevenDaysAgo.toISOString() }
-  });
-
-  // Calculate active users (last 30 days)
-  const thirtyDaysAgo = new Date();
-  thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
-
-  const activeUserIds = new Set();
-
-  // Users who created stories in last 30 days
-  const activeStoryCreators = await db.collection('stories')
-    .find({ createdAt: { $gte: thirtyDaysAgo.toISOString() } })
-    .project({ userId: 1 })
-    .toArray();
-  activeStoryCreators.forEach(s => activeUserIds.add(s.userId));
-
-  // Users who created events in last 30 days
-  const activeEventCreators = await db.collection('events')
-    .find({ createdAt: { $gte: thirtyDaysAgo.toISOString() } })
-    .project({ creatorId: 1 })
-    .toArray();
-  activeEventCreators.forEach(e => activeUserIds.add(e.creatorId));
-
-  // Users who made payments in last 30 days
-  const activePaymentUsers = await db.collection('payments')
-    .find({ createdAt: { $gte: thirtyDaysAgo.toISOString() } })
-    .project({ userId: 1 })
-    .toArray();
-  activePaymentUsers.forEach(p => activeUserIds.add(p.userId));
-
-  // Users who RSVPd to events in last 30 days
-  const recentEventsWithRsvps = await db.collection('events')
-    .find({ updatedAt: { $gte: thirtyDaysAgo.toISOString() } })
-    .project({ rsvps: 1 })
-    .toArray();
-  recentEventsWithRsvps.forEach(e => {
-    if (e.rsvps) {
-      e.rsvps.forEach(userId => activeUserIds.add(userId));
-    }
-  });
-
-  const activeUsersCount = activeUserIds.size;
+  const context = await getRequestContext();
+  const statsModel = context.model(AdminStatsModel);
+  statsModel.startReconcileJob();
+
+  // Single point read of the materialized snapshot; it is only rebuilt
+  // inline the very first time, afterwards stale snapshots refresh in the background
+  let snapshot = await statsModel.get();
+  if (!snapshot || !snapshot.reconciledAt) {
+    snapshot = await statsModel.reconcile();
+  } else if (statsModel.isStale(snapshot)) {
+    statsModel.reconcile().catch(error => {
+      console.error('Admin stats reconciliation error:', error.message);
+    });
+  }
 
-  return Response.json({
-    totalUsers,
-    totalStories,
-    totalEvents,
-    activeUsersCount,
-    usersByRole,
-    recentUsers,
-    recentStories,
-    recentEvents,
-    ...paymentStats
-  });
+  return Response.json(AdminStatsModel.toResponse(snapshot));
 }
 
 export async function getAdminContent(authUser) {
@@ -98,7 +46,8 @@ export async function getAdminContent(authUser) {
     return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
-  const db = await getDatabase();
+  const context = await getRequestContext();
+  const { db } = context;
 
   const stories = await db.collection('stories')
     .find({})
@@ -115,30 +64,41 @@ export async function getAdminContent(authUser) {
   return Response.json({ stories, events });
 }
 
-export async function getAllUsers(authUser) {
+export async function getAllUsers(authUser, query = {}) {
   if (authUser.role !== 'admin') {
     return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
-  const db = await getDatabase();
+  const page = parsePageParams(query);
+  if (!page) {
+    return Response.json({ error: 'Invalid pagination parameters' }, { status: 400 });
+  }
 
-  // Get all users with their activity counts
-  const users = await db.collection('users')
-    .find({})
-    .sort({ createdAt: -1 })
+  const context = await getRequestContext();
+  const { db } = context;
+
+  // Get one page of users, newest first
+  const docs = await db.collection('users')
+    .find(keysetFilter('createdAt', page.after, -1))
+    .project({ password: 0 })
+    .sort({ createdAt: -1, id: -1 })
+    .limit(page.limit + 1)
     .toArray();
+  const { items: users, nextCursor } = toPage(docs, page.limit, 'createdAt');
 
-  // Add story and event counts for each user
-  for (let user of users) {
-    const storyCount = await db.collection('stories').countDocuments({ userId: user.id });
-    const eventCount = await db.collection('events').countDocuments({ creatorId: user.id });
+  // Add story and event counts for the page in two grouped queries
+  const userIds = users.map(user => user.id);
+  const [storyCounts, eventCounts] = await Promise.all([
+    countByField(db, 'stories', 'userId', userIds),
+    countByField(db, 'events', 'creatorId', userIds)
+  ]);
 
-    user.storyCount = storyCount;
-    user.eventCount = eventCount;
-    delete user.password; // Remove password from response
+  for (let user of users) {
+    user.storyCount = storyCounts.get(user.id) || 0;
+    user.eventCount = eventCounts.get(user.id) || 0;
   }
 
-  return Response.json(users);
+  return Response.json(users, { headers: pageHeaders(nextCursor) });
 }
 
 export async function getAllPayments(authUser) {
@@ -146,17 +106,23 @@ export async function getAllPayments(authUser) {
     return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
-  const db = await getDatabase();
+  const context = await getRequestContext();
+  const { db } = context;
   const payments = await db.collection('payments')
     .find({})
     .sort({ createdAt: -1 })
     .limit(200)
     .toArray();
 
-  // Populate user and event details
+  // Populate user and event details with one batched lookup each
+  const [users, events] = await Promise.all([
+    context.model(UserModel).findSnippetsByIds(payments.map(payment => payment.userId), { withEmail: true }),
+    context.model(EventModel).findManyByIds(payments.map(payment => payment.eventId), { id: 1, title: 1, date: 1 })
+  ]);
+
   for (let payment of payments) {
-    const user = await db.collection('users').findOne({ id: payment.userId });
-    const event = await db.collection('events').findOne({ id: payment.eventId });
+    const user = users.get(payment.userId);
+    const event = events.get(payment.eventId);
 
     if (user) {
       payment.user = {
@@ -183,8 +149,9 @@ export async function getRecentActivity(authUser) {
     return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
-  const db = await getDatabase();
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const { db } = context;
+  const userModel = context.model(UserModel);
 
   // Get recent activities from last 30 days
   const thirtyDaysAgo = new Date();
@@ -219,27 +186,23 @@ export async function getRecentActivity(authUser) {
     delete user.password;
   }
 
-  // Populate user info for stories
+  // Populate user info for stories and events from the snippet cache
+  const authors = await userModel.findSnippetsByIds(
+    [...recentStories.map(story => story.userId), ...recentEvents.map(event => event.creatorId)],
+    { withEmail: true }
+  );
+
   for (let story of recentStories) {
-    const user = await userModel.findById(story.userId);
+    const user = authors.get(story.userId);
     if (user) {
-      story.user = {
-        id: user.id,
-        name: user.name,
-        email: user.email
-      };
+      story.user = { id: user.id, name: user.name, email: user.email };
     }
   }
 
-  // Populate user info for events
   for (let event of recentEvents) {
-    const user = await userModel.findById(event.creatorId);
+    const user = authors.get(event.creatorId);
     if (user) {
-      event.creator = {
-        id: user.id,
-        name: user.name,
-        email: user.email
-      };
+      event.creator = { id: user.id, name: user.name, email: user.email };
     }
   }
 
@@ -295,15 +258,17 @@ export async function deleteEventByAdmin(authUser, eventId) {
     return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
-  const db = await getDatabase();
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const eventModel = context.model(EventModel);
 
   const event = await eventModel.findById(eventId);
   if (!event) {
     return Response.json({ error: 'Event not found' }, { status: 404 });
   }
 
-  await eventModel.delete(eventId);
+  if (await eventModel.delete(eventId)) {
+    await context.model(AdminStatsModel).increment({ totalEvents: -1 });
+  }
 
   return Response.json({
     message: 'Event deleted successfully',
@@ -316,14 +281,19 @@ export async function deleteStoryByAdmin(authUser, storyId) {
     return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
-  const db = await getDatabase();
+  const context = await getRequestContext();
+  const { db } = context;
 
   const story = await db.collection('stories').findOne({ id: storyId });
   if (!story) {
     return Response.json({ error: 'Story not found' }, { status: 404 });
   }
 
-  await db.collection('stories').deleteOne({ id: storyId });
+  const result = await db.collection('stories').deleteOne({ id: storyId });
+  if (result.deletedCount > 0) {
+    await context.model(CommentModel).deleteByStory(storyId);
+    await context.model(AdminStatsModel).increment({ totalStories: -1 });
+  }
 
   return Response.json({
     message: 'Story deleted successfully',
@@ -336,80 +306,60 @@ export async function getActiveUsers(authUser) {
     return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
-  const db = await getDatabase();
+  const context = await getRequestContext();
+  const { db } = context;
 
   // Calculate active users (last 30 days)
   const thirtyDaysAgo = new Date();
   thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
 
-  const activeUserIds = new Set();
-
-  // Users who created stories in last 30 days
-  const activeStoryCreators = await db.collection('stories')
-    .find({ createdAt: { $gte: thirtyDaysAgo.toISOString() } })
-    .project({ userId: 1 })
-    .toArray();
-  activeStoryCreators.forEach(s => activeUserIds.add(s.userId));
+  // De-duplicate activity and join full user details in one pipeline
+  const activeUsers = await db.collection('stories').aggregate([
+    ...activeUsersPipeline(thirtyDaysAgo.toISOString()),
+    {
+      $lookup: {
+        from: 'users',
+        localField: '_id',
+        foreignField: 'id',
+        pipeline: [{ $project: { password: 0 } }],
+        as: 'user'
+      }
+    },
+    { $unwind: '$user' },
+    {
+      $replaceRoot: {
+        newRoot: {
+          $mergeObjects: [
+            '$user',
+            { recentActivity: { stories: '$stories', events: '$events', payments: '$payments' } }
+          ]
+        }
+      }
+    }
+  ], { allowDiskUse: true }).toArray();
 
-  // Users who created events in last 30 days
-  const activeEventCreators = await db.collection('events')
-    .find({ createdAt: { $gte: thirtyDaysAgo.toISOString() } })
-    .project({ creatorId: 1 })
-    .toArray();
-  activeEventCreators.forEach(e => activeUserIds.add(e.creatorId));
+  return Response.json({
+    count: activeUsers.length,
+    users: activeUsers
+  });
+}
 
-  // Users who made payments in last 30 days
-  const activePaymentUsers = await db.collection('payments')
-    .find({ createdAt: { $gte: thirtyDaysAgo.toISOString() } })
-    .project({ userId: 1 })
-    .toArray();
-  activePaymentUsers.forEach(p => activeUserIds.add(p.userId));
+export async function getCacheStats(authUser) {
+  if (authUser.role !== 'admin') {
+    return Response.json({ error: 'Admin access required' }, { status: 403 });
+  }
 
-  // Users who RSVPd to events in last 30 days
-  const recentEventsWithRsvps = await db.collection('events')
-    .find({ updatedAt: { $gte: thirtyDaysAgo.toISOString() } })
-    .project({ rsvps: 1 })
-    .toArray();
-  recentEventsWithRsvps.forEach(e => {
-    if (e.rsvps) {
-      e.rsvps.forEach(userId => activeUserIds.add(userId));
-    }
+  return Response.json({
+    userSnippets: getUserSnippetCache().stats()
   });
+}
 
-  // Get full user details for active users
-  const activeUsers = [];
-  for (const userId of activeUserIds) {
-    const user = await db.collection('users').findOne({ id: userId });
-    if (user) {
-      // Get activity counts
-      const storyCount = await db.collection('stories').countDocuments({
-        userId: user.id,
-        createdAt: { $gte: thirtyDaysAgo.toISOString() }
-      });
-      const eventCount = await db.collection('events').countDocuments({
-        creatorId: user.id,
-        createdAt: { $gte: thirtyDaysAgo.toISOString() }
-      });
-      const paymentCount = await db.collection('payments').countDocuments({
-        userId: user.id,
-        createdAt: { $gte: thirtyDaysAgo.toISOString() }
-      });
-
-      delete user.password;
-      activeUsers.push({
-        ...user,
-        recentActivity: {
-          stories: storyCount,
-          events: eventCount,
-          payments: paymentCount
-        }
-      });
-    }
+export async function getPoolStats(authUser) {
+  if (authUser.role !== 'admin') {
+    return Response.json({ error: 'Admin access required' }, { status: 403 });
   }
 
   return Response.json({
-    count: activeUsers.length,
-    users: activeUsers
+    mongo: getPoolMetrics()
   });
 }
-
@@ -1,27 +1,24 @@
-import jwt from 'jsonwebtoken';
-import { JWT_SECRET, JWT_EXPIRES_IN } from '../config/constants.js';
+import { signToken, resolveProfileClaim } from '../middleware/auth.js';
 import { UserModel } from '../models/User.js';
-import { getDatabase } from '../config/database.js';
+import { AdminStatsModel } from '../models/AdminStats.js';
+import { getRequestContext } from '../utils/requestContext.js';
 
 export async function signup(request) {
-  const db = await getDatabase();
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const userModel = context.model(UserModel);
   
   const body = await request.json();
   const user = await userModel.create(body);
+  await context.model(AdminStatsModel).increment({ totalUsers: 1, [AdminStatsModel.roleCounter(user.role)]: 1 });
   
-  const token = jwt.sign(
-    { userId: user.id, email: user.email, role: user.role },
-    JWT_SECRET,
-    { expiresIn: JWT_EXPIRES_IN }
-  );
+  const token = signToken(user);
   
   return Response.json({ user, token });
 }
 
 export async function login(request) {
-  const db = await getDatabase();
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const userModel = context.model(UserModel);
   
   const body = await request.json();
   const { email, password } = body;
@@ -40,26 +37,39 @@ export async function login(request) {
     return Response.json({ error: 'Invalid credentials' }, { status: 401 });
   }
   
-  const token = jwt.sign(
-    { userId: user.id, email: user.email, role: user.role },
-    JWT_SECRET,
-    { expiresIn: JWT_EXPIRES_IN }
-  );
+  // Upgrade hashes made with an older cost factor; the login does not wait
+  if (userModel.needsRehash(user)) {
+    userModel.rehashPassword(user, password).catch(error => {
+      console.error('Password rehash error:', error.message);
+    });
+  }
   
   const sanitizedUser = userModel.sanitizeUser(user);
+  const token = signToken(sanitizedUser);
+  
   return Response.json({ user: sanitizedUser, token });
 }
 
+// Answers from the token's profile claim while its version is current; an
+// outdated claim is replaced via X-Refreshed-Token so the next call is cheap
 export async function getMe(request, authUser) {
-  const db = await getDatabase();
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const userModel = context.model(UserModel);
+  
+  const profile = await resolveProfileClaim(authUser, userModel);
+  if (profile) {
+    return Response.json(profile);
+  }
   
   const user = await userModel.findById(authUser.userId);
   if (!user) {
     return Response.json({ error: 'User not found' }, { status: 404 });
   }
   
-  return Response.json(userModel.sanitizeUser(user));
+  const sanitizedUser = userModel.sanitizeUser(user);
+  return Response.json(sanitizedUser, {
+    headers: { 'X-Refreshed-Token': signToken(sanitizedUser, { exp: authUser.exp }) }
+  });
 }
 
 export async function updateProfile(request, authUser, userId) {
@@ -67,18 +77,22 @@ export async function updateProfile(request, authUser, userId) {
     return Response.json({ error: 'Unauthorized' }, { status: 403 });
   }
   
-  const db = await getDatabase();
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const userModel = context.model(UserModel);
   
   const body = await request.json();
-  const updatedUser = await userModel.update(userId, body);
+  const updatedUser = userModel.sanitizeUser(await userModel.update(userId, body));
   
-  return Response.json(userModel.sanitizeUser(updatedUser));
+  // The caller's profile claim is now outdated; hand back a current one
+  const headers = authUser.userId === userId
+    ? { 'X-Refreshed-Token': signToken(updatedUser, { exp: authUser.exp }) }
+    : {};
+  return Response.json(updatedUser, { headers });
 }
 
 export async function getUserProfile(userId) {
-  const db = await getDatabase();
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const userModel = context.model(UserModel);
   
   const user = await userModel.findById(userId);
   if (!user) {
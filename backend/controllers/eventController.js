@@ -1,6 +1,8 @@
 import { EventModel } from '../models/Event.js';
 import { UserModel } from '../models/User.js';
-import { getDatabase } from '../config/database.js';
+import { AdminStatsModel } from '../models/AdminStats.js';
+import { getRequestContext } from '../utils/requestContext.js';
+import { parsePageParams, pageHeaders } from '../utils/pagination.js';
 
 export async function createEvent(request, authUser) {
   // Only admins can create events
@@ -8,8 +10,8 @@ export async function createEvent(request, authUser) {
     return Response.json({ error: 'Only administrators can create events' }, { status: 403 });
   }
   
-  const db = await getDatabase();
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const eventModel = context.model(EventModel);
   
   const body = await request.json();
   const eventData = {
@@ -18,37 +20,42 @@ export async function createEvent(request, authUser) {
   };
   
   const event = await eventModel.create(eventData);
+  await context.model(AdminStatsModel).increment({ totalEvents: 1 });
   return Response.json(event);
 }
 
-export async function getEvents() {
-  const db = await getDatabase();
-  const eventModel = new EventModel(db);
-  const userModel = new UserModel(db);
+// `attending=me` lists the signed-in user's RSVPs, `creatorId` one host's events
+export async function getEvents(authUser = null, { includeRsvps = false, creatorId = null, attending = null, ...query } = {}) {
+  const page = parsePageParams(query);
+  if (!page) {
+    return Response.json({ error: 'Invalid pagination parameters' }, { status: 400 });
+  }
+  if (attending && attending !== 'me') {
+    return Response.json({ error: "attending only accepts 'me'" }, { status: 400 });
+  }
+  if (attending && !authUser) {
+    return Response.json({ error: 'Unauthorized' }, { status: 401 });
+  }
   
-  const events = await eventModel.findAll();
+  const context = await getRequestContext();
+  const eventModel = context.model(EventModel);
   
-  // Populate creator info and RSVP counts
-  for (let event of events) {
-    const creator = await userModel.findById(event.creatorId);
-    if (creator) {
-      event.creator = {
-        id: creator.id,
-        name: creator.name,
-        role: creator.role,
-        profileImage: creator.profileImage
-      };
-    }
-    event.rsvpCount = event.rsvps ? event.rsvps.length : 0;
-  }
+  // Creator info and RSVP counts are joined server-side in one pipeline
+  const { items: events, nextCursor } = await eventModel.findAllWithCreators({
+    viewerId: authUser ? authUser.userId : null,
+    includeRsvps,
+    creatorId,
+    attendeeId: attending ? authUser.userId : null,
+    ...page
+  });
   
-  return Response.json(events);
+  return Response.json(events, { headers: pageHeaders(nextCursor) });
 }
 
 export async function getEventById(eventId) {
-  const db = await getDatabase();
-  const eventModel = new EventModel(db);
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const eventModel = context.model(EventModel);
+  const userModel = context.model(UserModel);
   
   const event = await eventModel.findById(eventId);
   if (!event) {
@@ -56,45 +63,37 @@ export async function getEventById(eventId) {
   }
   
   // Populate creator info
-  const creator = await userModel.findById(event.creatorId);
+  const creator = await userModel.findSnippetById(event.creatorId);
   if (creator) {
-    event.creator = {
-      id: creator.id,
-      name: creator.name,
-      role: creator.role,
-      profileImage: creator.profileImage
-    };
+    event.creator = creator;
   }
   event.rsvpCount = event.rsvps ? event.rsvps.length : 0;
   
   return Response.json(event);
 }
 
-export async function toggleRSVP(eventId, authUser) {
-  const db = await getDatabase();
-  const eventModel = new EventModel(db);
-  
-  const event = await eventModel.findById(eventId);
-  if (!event) {
-    return Response.json({ error: 'Event not found' }, { status: 404 });
-  }
-  
-  const rsvps = event.rsvps || [];
-  const hasRSVP = rsvps.includes(authUser.userId);
-  
-  let updatedEvent;
-  if (hasRSVP) {
-    updatedEvent = await eventModel.removeRSVP(eventId, authUser.userId);
-  } else {
-    updatedEvent = await eventModel.addRSVP(eventId, authUser.userId);
+// Returns { attending, rsvpCount } unless the full event document is requested
+export async function toggleRSVP(eventId, authUser, { full = false } = {}) {
+  const context = await getRequestContext();
+  const eventModel = context.model(EventModel);
+  
+  try {
+    const result = await eventModel.toggleRSVP(eventId, authUser.userId, { compact: !full });
+    return Response.json(result);
+  } catch (error) {
+    if (error.message === 'Event not found') {
+      return Response.json({ error: error.message }, { status: 404 });
+    }
+    if (error.message === 'Event is full') {
+      return Response.json({ error: error.message }, { status: 400 });
+    }
+    throw error;
   }
-  
-  return Response.json(updatedEvent);
 }
 
 export async function deleteEvent(eventId, authUser) {
-  const db = await getDatabase();
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const eventModel = context.model(EventModel);
   
   const event = await eventModel.findById(eventId);
   if (!event) {
@@ -105,6 +104,8 @@ export async function deleteEvent(eventId, authUser) {
     return Response.json({ error: 'Unauthorized' }, { status: 403 });
   }
   
-  await eventModel.delete(eventId);
+  if (await eventModel.delete(eventId)) {
+    await context.model(AdminStatsModel).increment({ totalEvents: -1 });
+  }
   return Response.json({ message: 'Event deleted successfully' });
 }
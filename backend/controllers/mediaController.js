@@ -0,0 +1,79 @@
+import { Readable } from 'stream';
+import { getRequestContext } from '../utils/requestContext.js';
+import { MediaModel, MEDIA_STATUS } from '../models/Media.js';
+import { getBlobStore } from '../storage/blobStore.js';
+import { receiveUpload, CONTENT_TYPES_BY_EXTENSION } from '../storage/upload.js';
+import { isDerivable, scheduleDerivatives } from '../storage/derivatives.js';
+
+const MEDIA_KEY_PATTERN = /^[a-f0-9]{64}\.[a-z0-9]{1,8}$/;
+
+export async function uploadMedia(request, authUser) {
+  let upload;
+  try {
+    upload = await receiveUpload(request);
+  } catch (error) {
+    // formidable reports size and multipart errors with an HTTP status
+    if (error.httpCode) {
+      return Response.json({ error: 'Invalid upload', details: error.message }, { status: error.httpCode });
+    }
+    throw error;
+  }
+
+  if (!upload) {
+    return Response.json({ error: 'No file provided' }, { status: 400 });
+  }
+
+  const store = getBlobStore();
+  const key = `${upload.hash}.${upload.extension}`;
+  await store.put(key, upload.filepath, upload.mimetype);
+  const url = store.urlFor(key);
+
+  // Thumbnails and medium renditions are produced after the response is sent
+  if (isDerivable(upload.mimetype)) {
+    const context = await getRequestContext();
+    const media = await context.model(MediaModel).create({ key, url, contentType: upload.mimetype, size: upload.size });
+    if (media.status === MEDIA_STATUS.PENDING) {
+      // Outlives the request, so it gets the database rather than the context
+      scheduleDerivatives(context.db, key);
+    }
+  }
+
+  return Response.json({
+    url,
+    key,
+    contentType: upload.mimetype,
+    size: upload.size
+  });
+}
+
+export async function getMedia(key) {
+  if (!MEDIA_KEY_PATTERN.test(key)) {
+    return Response.json({ error: 'Not found' }, { status: 404 });
+  }
+
+  const blob = await getBlobStore().get(key);
+  if (!blob) {
+    return Response.json({ error: 'Not found' }, { status: 404 });
+  }
+
+  const extension = key.split('.').pop();
+  const contentType = CONTENT_TYPES_BY_EXTENSION[extension] || 'application/octet-stream';
+  const headers = {
+    'Content-Type': contentType,
+    // Browsers must not sniff user bytes into something executable
+    'X-Content-Type-Options': 'nosniff',
+    // Content-addressed: the bytes behind a key never change
+    'Cache-Control': 'public, max-age=31536000, immutable',
+    'ETag': `"${key.split('.')[0]}"`
+  };
+  // Blobs stored before uploads were restricted may be anything; never
+  // render those inline
+  if (!/^(image|video)\//.test(contentType)) {
+    headers['Content-Disposition'] = 'attachment';
+  }
+  if (blob.size !== undefined) {
+    headers['Content-Length'] = String(blob.size);
+  }
+
+  return new Response(Readable.toWeb(blob.stream), { headers });
+}
@@ -2,7 +2,8 @@ import Razorpay from 'razorpay';
 import crypto from 'crypto';
 import { PaymentModel } from '../models/Payment.js';
 import { EventModel } from '../models/Event.js';
-import { getDatabase } from '../config/database.js';
+import { AdminStatsModel } from '../models/AdminStats.js';
+import { getRequestContext } from '../utils/requestContext.js';
 import { 
   RAZORPAY_KEY_ID, 
   RAZORPAY_KEY_SECRET, 
@@ -14,6 +15,12 @@ import {
   PAYMENT_GATEWAYS
 } from '../config/constants.js';
 
+// Counts a payment towards completed revenue; callers only invoke it when
+// markCompleted reports that they made the transition
+async function recordPaymentCompleted(context, payment) {
+  await context.model(AdminStatsModel).increment({ completedPayments: 1, totalRevenue: payment.amount });
+}
+
 // Initialize Razorpay
 let razorpayInstance = null;
 function getRazorpayInstance() {
@@ -28,9 +35,9 @@ function getRazorpayInstance() {
 
 // RazorPay: Create Order
 export async function createRazorpayOrder(request, authUser) {
-  const db = await getDatabase();
-  const paymentModel = new PaymentModel(db);
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const paymentModel = context.model(PaymentModel);
+  const eventModel = context.model(EventModel);
   
   const body = await request.json();
   const { eventId, quantity = 1 } = body;
@@ -81,6 +88,7 @@ export async function createRazorpayOrder(request, authUser) {
       userEmail: authUser.email,
       userName: authUser.name || ''
     });
+    await context.model(AdminStatsModel).increment({ totalPayments: 1 });
     
     return Response.json({
       orderId: razorpayOrder.id,
@@ -100,9 +108,9 @@ export async function createRazorpayOrder(request, authUser) {
 
 // RazorPay: Verify Payment
 export async function verifyRazorpayPayment(request, authUser) {
-  const db = await getDatabase();
-  const paymentModel = new PaymentModel(db);
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const paymentModel = context.model(PaymentModel);
+  const eventModel = context.model(EventModel);
   
   const body = await request.json();
   const { razorpay_order_id, razorpay_payment_id, razorpay_signature } = body;
@@ -133,19 +141,20 @@ export async function verifyRazorpayPayment(request, authUser) {
     }
     
     // Update payment status
-    await paymentModel.updateStatus(payment.id, PAYMENT_STATUS.COMPLETED, {
+    const completed = await paymentModel.markCompleted(payment.id, {
       gatewayPaymentId: razorpay_payment_id,
       razorpay_signature
     });
+    if (completed) {
+      await recordPaymentCompleted(context, payment);
+    }
     
-    // Add user to event RSVPs
-    const event = await eventModel.findById(payment.eventId);
-    if (event) {
-      const rsvps = event.rsvps || [];
-      if (!rsvps.includes(authUser.userId)) {
-        await eventModel.addRSVP(payment.eventId, authUser.userId);
+    // Add user to event RSVPs (no-op if already attending or the event is gone)
+    await eventModel.addRSVP(payment.eventId, authUser.userId).catch(error => {
+      if (error.message !== 'Event not found') {
+        throw error;
       }
-    }
+    });
     
     return Response.json({ 
       verified: true, 
@@ -164,8 +173,8 @@ export async function verifyRazorpayPayment(request, authUser) {
 
 // RazorPay: Webhook Handler
 export async function razorpayWebhook(request) {
-  const db = await getDatabase();
-  const paymentModel = new PaymentModel(db);
+  const context = await getRequestContext();
+  const paymentModel = context.model(PaymentModel);
   
   try {
     const body = await request.text();
@@ -191,10 +200,13 @@ export async function razorpayWebhook(request) {
       
       const payment = await paymentModel.findByGatewayOrderId(orderId);
       if (payment) {
-        await paymentModel.updateStatus(payment.id, PAYMENT_STATUS.COMPLETED, {
+        const completed = await paymentModel.markCompleted(payment.id, {
           gatewayPaymentId: paymentId,
           webhookProcessed: true
         });
+        if (completed) {
+          await recordPaymentCompleted(context, payment);
+        }
       }
     } else if (event.event === 'payment.failed') {
       const razorpayPayment = event.payload.payment.entity;
@@ -218,9 +230,9 @@ export async function razorpayWebhook(request) {
 
 // PayPal: Create Order
 export async function createPayPalOrder(request, authUser) {
-  const db = await getDatabase();
-  const paymentModel = new PaymentModel(db);
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const paymentModel = context.model(PaymentModel);
+  const eventModel = context.model(EventModel);
   
   const body = await request.json();
   const { eventId, quantity = 1 } = body;
@@ -328,6 +340,7 @@ export async function createPayPalOrder(request, authUser) {
       userEmail: authUser.email,
       userName: authUser.name || ''
     });
+    await context.model(AdminStatsModel).increment({ totalPayments: 1 });
     
     return Response.json({
       orderId: orderData.id,
@@ -344,9 +357,9 @@ export async function createPayPalOrder(request, authUser) {
 
 // PayPal: Capture Payment
 export async function capturePayPalOrder(request, authUser) {
-  const db = await getDatabase();
-  const paymentModel = new PaymentModel(db);
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const paymentModel = context.model(PaymentModel);
+  const eventModel = context.model(EventModel);
   
   const body = await request.json();
   const { orderId } = body;
@@ -403,19 +416,20 @@ export async function capturePayPalOrder(request, authUser) {
       return Response.json({ error: 'Payment record not found' }, { status: 404 });
     }
     
-    await paymentModel.updateStatus(payment.id, PAYMENT_STATUS.COMPLETED, {
+    const completed = await paymentModel.markCompleted(payment.id, {
       gatewayPaymentId: captureId,
       captureData
     });
+    if (completed) {
+      await recordPaymentCompleted(context, payment);
+    }
     
-    // Add user to event RSVPs
-    const event = await eventModel.findById(payment.eventId);
-    if (event) {
-      const rsvps = event.rsvps || [];
-      if (!rsvps.includes(authUser.userId)) {
-        await eventModel.addRSVP(payment.eventId, authUser.userId);
+    // Add user to event RSVPs (no-op if already attending or the event is gone)
+    await eventModel.addRSVP(payment.eventId, authUser.userId).catch(error => {
+      if (error.message !== 'Event not found') {
+        throw error;
       }
-    }
+    });
     
     return Response.json({
       success: true,
@@ -434,9 +448,9 @@ export async function capturePayPalOrder(request, authUser) {
 
 // Get payment details
 export async function getPaymentDetails(paymentId, authUser) {
-  const db = await getDatabase();
-  const paymentModel = new PaymentModel(db);
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const paymentModel = context.model(PaymentModel);
+  const eventModel = context.model(EventModel);
   
   const payment = await paymentModel.findById(paymentId);
   if (!payment) {
@@ -464,15 +478,19 @@ export async function getPaymentDetails(paymentId, authUser) {
 
 // Get user's payments
 export async function getUserPayments(authUser) {
-  const db = await getDatabase();
-  const paymentModel = new PaymentModel(db);
-  const eventModel = new EventModel(db);
+  const context = await getRequestContext();
+  const paymentModel = context.model(PaymentModel);
+  const eventModel = context.model(EventModel);
   
   const payments = await paymentModel.findByUser(authUser.userId);
   
-  // Populate event details
+  // Populate event details with a single $in query
+  const events = await eventModel.findManyByIds(
+    payments.map(payment => payment.eventId),
+    { id: 1, title: 1, date: 1, location: 1, imageUrl: 1 }
+  );
   for (let payment of payments) {
-    const event = await eventModel.findById(payment.eventId);
+    const event = events.get(payment.eventId);
     if (event) {
       payment.event = {
         id: event.id,
@@ -1,59 +1,77 @@
 import { StoryModel } from '../models/Story.js';
 import { UserModel } from '../models/User.js';
-import { getDatabase } from '../config/database.js';
+import { CommentModel } from '../models/Comment.js';
+import { MediaModel } from '../models/Media.js';
+import { AdminStatsModel } from '../models/AdminStats.js';
+import { getRequestContext } from '../utils/requestContext.js';
+import { parsePageParams, pageHeaders } from '../utils/pagination.js';
+
+// Adds `media`, parallel to `mediaUrls`, carrying srcset metadata for every
+// upload whose renditions are ready; other entries fall back to the original
+async function attachMedia(context, stories) {
+  const described = await context.model(MediaModel).describeUrls(stories.flatMap(story => story.mediaUrls || []));
+  for (let story of stories) {
+    story.media = (story.mediaUrls || []).map(url => described.get(url) || { url, thumbnail: url, srcset: {} });
+  }
+}
 
 export async function createStory(request, authUser) {
-  const db = await getDatabase();
-  const storyModel = new StoryModel(db);
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const storyModel = context.model(StoryModel);
+  const userModel = context.model(UserModel);
   
   const body = await request.json();
+  
+  // Media must be uploaded through /api/upload and referenced by URL
+  const mediaUrls = body.mediaUrls || [];
+  if (!Array.isArray(mediaUrls) || mediaUrls.some(url => typeof url !== 'string' || url.startsWith('data:'))) {
+    return Response.json({ error: 'mediaUrls must be URLs returned by /api/upload, not inline data' }, { status: 400 });
+  }
+  
   const storyData = {
     ...body,
     userId: authUser.userId
   };
   
   const story = await storyModel.create(storyData);
+  await context.model(AdminStatsModel).increment({ totalStories: 1 });
   
   // Populate user info
-  const user = await userModel.findById(authUser.userId);
-  story.user = {
-    id: user.id,
-    name: user.name,
-    role: user.role,
-    profileImage: user.profileImage
-  };
+  story.user = await userModel.findSnippetById(authUser.userId);
+  await attachMedia(context, [story]);
   
   return Response.json(story);
 }
 
-export async function getStories() {
-  const db = await getDatabase();
-  const storyModel = new StoryModel(db);
-  const userModel = new UserModel(db);
+export async function getStories(query = {}) {
+  const page = parsePageParams(query);
+  if (!page) {
+    return Response.json({ error: 'Invalid pagination parameters' }, { status: 400 });
+  }
   
-  const stories = await storyModel.findAll();
+  const context = await getRequestContext();
+  const storyModel = context.model(StoryModel);
+  const userModel = context.model(UserModel);
   
-  // Populate user info for each story
+  const { items: stories, nextCursor } = await storyModel.findAll(page);
+  
+  // Populate user info for all stories with a single $in query
+  const authors = await userModel.findSnippetsByIds(stories.map(story => story.userId));
   for (let story of stories) {
-    const user = await userModel.findById(story.userId);
+    const user = authors.get(story.userId);
     if (user) {
-      story.user = {
-        id: user.id,
-        name: user.name,
-        role: user.role,
-        profileImage: user.profileImage
-      };
+      story.user = user;
     }
   }
+  await attachMedia(context, stories);
   
-  return Response.json(stories);
+  return Response.json(stories, { headers: pageHeaders(nextCursor) });
 }
 
 export async function getStoryById(storyId) {
-  const db = await getDatabase();
-  const storyModel = new StoryModel(db);
-  const userModel = new UserModel(db);
+  const context = await getRequestContext();
+  const storyModel = context.model(StoryModel);
+  const userModel = context.model(UserModel);
   
   const story = await storyModel.findById(storyId);
   if (!story) {
@@ -61,41 +79,70 @@ export async function getStoryById(storyId) {
   }
   
   // Populate user info
-  const user = await userModel.findById(story.userId);
+  const user = await userModel.findSnippetById(story.userId);
   if (user) {
-    story.user = {
-      id: user.id,
-      name: user.name,
-      role: user.role,
-      profileImage: user.profileImage
-    };
+    story.user = user;
   }
   
+  await attachMedia(context, [story]);
+  
   return Response.json(story);
 }
 
-export async function likeStory(storyId, authUser) {
-  const db = await getDatabase();
-  const storyModel = new StoryModel(db);
-  
-  const story = await storyModel.toggleLike(storyId, authUser.userId);
-  return Response.json(story);
+// Returns { liked, likeCount } unless the full story document is requested
+export async function likeStory(storyId, authUser, { full = false } = {}) {
+  const context = await getRequestContext();
+  const storyModel = context.model(StoryModel);
+  
+  try {
+    const result = await storyModel.toggleLike(storyId, authUser.userId, { compact: !full });
+    return Response.json(result);
+  } catch (error) {
+    if (error.message === 'Story not found') {
+      return Response.json({ error: error.message }, { status: 404 });
+    }
+    throw error;
+  }
 }
 
 export async function commentOnStory(request, storyId, authUser) {
-  const db = await getDatabase();
-  const storyModel = new StoryModel(db);
+  const context = await getRequestContext();
+  const storyModel = context.model(StoryModel);
+  const commentModel = context.model(CommentModel);
   
   const body = await request.json();
   const { text } = body;
   
-  const story = await storyModel.addComment(storyId, authUser.userId, text);
+  if (!text) {
+    return Response.json({ error: 'Comment text is required' }, { status: 400 });
+  }
+  
+  const comment = await commentModel.create({ storyId, userId: authUser.userId, text });
+  const story = await storyModel.addComment(storyId, comment);
+  if (!story) {
+    await commentModel.delete(comment.id);
+    return Response.json({ error: 'Story not found' }, { status: 404 });
+  }
+  
   return Response.json(story);
 }
 
+export async function getStoryComments(storyId, query = {}) {
+  const page = parsePageParams(query);
+  if (!page) {
+    return Response.json({ error: 'Invalid pagination parameters' }, { status: 400 });
+  }
+  
+  const context = await getRequestContext();
+  const commentModel = context.model(CommentModel);
+  
+  const { items: comments, nextCursor } = await commentModel.findByStory(storyId, page);
+  return Response.json(comments, { headers: pageHeaders(nextCursor) });
+}
+
 export async function deleteStory(storyId, authUser) {
-  const db = await getDatabase();
-  const storyModel = new StoryModel(db);
+  const context = await getRequestContext();
+  const storyModel = context.model(StoryModel);
   
   const story = await storyModel.findById(storyId);
   if (!story) {
@@ -106,6 +153,9 @@ export async function deleteStory(storyId, authUser) {
     return Response.json({ error: 'Unauthorized' }, { status: 403 });
   }
   
-  await storyModel.delete(storyId);
+  if (await storyModel.delete(storyId)) {
+    await context.model(CommentModel).deleteByStory(storyId);
+    await context.model(AdminStatsModel).increment({ totalStories: -1 });
+  }
   return Response.json({ message: 'Story deleted successfully' });
 }
@@ -1,5 +1,100 @@
 import jwt from 'jsonwebtoken';
-import { JWT_SECRET } from '../config/constants.js';
+import { JWT_SECRET, JWT_EXPIRES_IN } from '../config/constants.js';
+
+// Tokens carry a copy of the public profile so /api/auth/me can answer
+// without reading the user document. JWTs are only signed, not encrypted, so
+// the copy is limited to fields any visitor can already see on the profile
+// page. It is trusted only while its profileVersion matches the user's
+// current one. Oversized profiles (e.g. an inline profile image) are left out
+// and fall back to a database read.
+const PROFILE_CLAIM_FIELDS = ['id', 'name', 'role', 'bio', 'profileImage', 'bikeInfo', 'clubInfo', 'createdAt'];
+const PROFILE_CLAIM_MAX_BYTES = 2048;
+
+// `exp` pins the expiry of a re-issued token to the one it replaces, so
+// refreshing the profile claim never extends a session
+export function signToken(user, { exp } = {}) {
+  const claims = { userId: user.id, email: user.email, role: user.role };
+
+  const profile = { profileVersion: user.profileVersion || 0 };
+  for (const field of PROFILE_CLAIM_FIELDS) {
+    if (user[field] !== undefined) {
+      profile[field] = user[field];
+    }
+  }
+  if (Buffer.byteLength(JSON.stringify(profile)) <= PROFILE_CLAIM_MAX_BYTES) {
+    claims.profile = profile;
+  }
+
+  if (exp) {
+    return jwt.sign({ ...claims, exp }, JWT_SECRET);
+  }
+  return jwt.sign(claims, JWT_SECRET, { expiresIn: JWT_EXPIRES_IN });
+}
+
+// Returns the profile from the token's claim if it is still current,
+// otherwise null. The version is read from the database, not a per-process
+// cache, so an edit made through any instance is seen immediately.
+export async function resolveProfileClaim(authUser, userModel) {
+  if (!authUser.profile) {
+    return null;
+  }
+  const version = await userModel.getProfileVersion(authUser.userId);
+  if (version !== authUser.profile.profileVersion) {
+    return null;
+  }
+  return { ...authUser.profile, email: authUser.email };
+}
+
+// Recently verified tokens, keyed by signature, so repeated calls with the
+// same token skip jwt.verify. Bounded LRU; entries die with the token's exp.
+const TOKEN_CACHE_MAX_ENTRIES = parseInt(process.env.TOKEN_CACHE_MAX_ENTRIES || '1000', 10);
+const verifiedTokens = new Map();
+
+// At most this many verification failures are logged per window; the rest
+// are counted and reported once when the window rolls over
+const FAILURE_LOG_WINDOW_MS = 60000;
+const FAILURE_LOG_LIMIT = 10;
+let failureWindowStart = 0;
+let failuresInWindow = 0;
+
+function logVerificationFailure(message) {
+  const now = Date.now();
+  if (now - failureWindowStart >= FAILURE_LOG_WINDOW_MS) {
+    const suppressed = failuresInWindow - FAILURE_LOG_LIMIT;
+    if (suppressed > 0) {
+      console.error(`Token verification error: ${suppressed} more failures suppressed`);
+    }
+    failureWindowStart = now;
+    failuresInWindow = 0;
+  }
+
+  failuresInWindow += 1;
+  if (failuresInWindow <= FAILURE_LOG_LIMIT) {
+    console.error('Token verification error:', message);
+  }
+}
+
+function getCachedClaims(token, signature) {
+  const entry = verifiedTokens.get(signature);
+  if (!entry || entry.token !== token) {
+    return null;
+  }
+  if (entry.claims.exp && entry.claims.exp * 1000 <= Date.now()) {
+    verifiedTokens.delete(signature);
+    return null;
+  }
+
+  verifiedTokens.delete(signature);
+  verifiedTokens.set(signature, entry);
+  return entry.claims;
+}
+
+function cacheClaims(token, signature, claims) {
+  verifiedTokens.set(signature, { token, claims });
+  while (verifiedTokens.size > TOKEN_CACHE_MAX_ENTRIES) {
+    verifiedTokens.delete(verifiedTokens.keys().next().value);
+  }
+}
 
 export function verifyToken(request) {
   const authHeader = request.headers.get('authorization');
@@ -8,11 +103,19 @@ export function verifyToken(request) {
   }
   
   const token = authHeader.substring(7);
+  const signature = token.slice(token.lastIndexOf('.') + 1);
+  const cached = getCachedClaims(token, signature);
+  if (cached) {
+    return cached;
+  }
+
   try {
-    const decoded = jwt.verify(token, JWT_SECRET);
+    // Shared between requests through the cache, so handed out read-only
+    const decoded = Object.freeze(jwt.verify(token, JWT_SECRET));
+    cacheClaims(token, signature, decoded);
     return decoded;
   } catch (error) {
-    console.error('Token verification error:', error.message);
+    logVerificationFailure(error.message);
     return null;
   }
 }
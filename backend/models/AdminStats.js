@@ -0,0 +1,265 @@
+import { PAYMENT_STATUS, USER_ROLES } from '../config/constants.js';
+
+const SNAPSHOT_ID = 'global';
+
+// usersByRole has one counter per USER_ROLES value. Roles are read from user
+// documents and become update paths, where a `.` or a leading `$` would
+// corrupt the snapshot or fail the write, so anything else is pooled here.
+const OTHER_ROLE = 'other';
+const KNOWN_ROLES = new Set(Object.values(USER_ROLES));
+const ROLE_BUCKETS = [...KNOWN_ROLES, OTHER_ROLE];
+
+function roleBucket(role) {
+  return KNOWN_ROLES.has(role) ? role : OTHER_ROLE;
+}
+
+// How often the snapshot is rebuilt from the source collections. Counters are
+// kept current by the write paths in between; windowed figures (recent and
+// active users) only move on reconciliation.
+export const ADMIN_STATS_RECONCILE_MS = parseInt(process.env.ADMIN_STATS_RECONCILE_MS || '300000', 10);
+
+// Groups everyone who created a story, event or payment, or RSVP'd to an
+// event updated, since `since` into one row per user with per-kind counts.
+// Runs against `stories`; the other sources are pulled in with $unionWith so
+// the de-duplication happens in MongoDB rather than in a Node Set.
+export function activeUsersPipeline(since) {
+  const window = { $gte: since };
+  const countKind = kind => ({ $sum: { $cond: [{ $eq: ['$kind', kind] }, 1, 0] } });
+
+  return [
+    { $match: { createdAt: window } },
+    { $project: { _id: 0, userId: 1, kind: { $literal: 'story' } } },
+    {
+      $unionWith: {
+        coll: 'events',
+        pipeline: [
+          { $match: { createdAt: window } },
+          { $project: { _id: 0, userId: '$creatorId', kind: { $literal: 'event' } } }
+        ]
+      }
+    },
+    {
+      $unionWith: {
+        coll: 'payments',
+        pipeline: [
+          { $match: { createdAt: window } },
+          { $project: { _id: 0, userId: 1, kind: { $literal: 'payment' } } }
+        ]
+      }
+    },
+    {
+      $unionWith: {
+        coll: 'events',
+        pipeline: [
+          { $match: { updatedAt: window } },
+          { $unwind: '$rsvps' },
+          { $project: { _id: 0, userId: '$rsvps', kind: { $literal: 'rsvp' } } }
+        ]
+      }
+    },
+    { $match: { userId: { $nin: [null, ''] } } },
+    {
+      $group: {
+        _id: '$userId',
+        stories: countKind('story'),
+        events: countKind('event'),
+        payments: countKind('payment')
+      }
+    }
+  ];
+}
+
+// Computed value of a counter plus the increments it missed while computing
+function withPending(field, value) {
+  return { $add: [value, { $ifNull: [`$sinceReconcile.${field}`, 0] }] };
+}
+
+let reconcileInFlight = null;
+let reconcileTimer = null;
+
+export class AdminStatsModel {
+  constructor(db) {
+    this.db = db;
+    this.collection = db.collection('admin_stats');
+  }
+
+  async get() {
+    return await this.collection.findOne({ _id: SNAPSHOT_ID });
+  }
+
+  // Best-effort: a failed counter update must never fail the write that
+  // triggered it, the next reconciliation will correct the drift. Each
+  // increment is also tallied under `sinceReconcile` so a reconciliation
+  // running concurrently can re-apply it.
+  async increment(counters) {
+    const pending = {};
+    for (const [field, amount] of Object.entries(counters)) {
+      pending[`sinceReconcile.${field}`] = amount;
+    }
+    try {
+      await this.collection.updateOne(
+        { _id: SNAPSHOT_ID },
+        { $inc: { ...counters, ...pending }, $set: { updatedAt: new Date().toISOString() } },
+        { upsert: true }
+      );
+    } catch (error) {
+      console.error('Admin stats increment error:', error.message);
+    }
+  }
+
+  async reconcile() {
+    // Concurrent callers share one rebuild
+    if (!reconcileInFlight) {
+      reconcileInFlight = this.rebuild()
+        .finally(() => {
+          reconcileInFlight = null;
+        });
+    }
+    return await reconcileInFlight;
+  }
+
+  // Clears the pending tally, computes the snapshot from the collections and
+  // writes it with whatever was tallied meanwhile added on top, in one
+  // update, so increments landing mid-computation are not overwritten. One
+  // that races the start of the computation may count twice until the next
+  // reconciliation; none are lost.
+  async rebuild() {
+    await this.collection.updateOne({ _id: SNAPSHOT_ID }, { $unset: { sinceReconcile: '' } });
+    const { _id, usersByRole, ...fields } = await this.computeSnapshot();
+
+    const set = {};
+    for (const [field, value] of Object.entries(fields)) {
+      set[field] = typeof value === 'number' ? withPending(field, value) : { $literal: value };
+    }
+    for (const role of ROLE_BUCKETS) {
+      set[`usersByRole.${role}`] = withPending(`usersByRole.${role}`, usersByRole[role] || 0);
+    }
+
+    return await this.collection.findOneAndUpdate(
+      { _id: SNAPSHOT_ID },
+      // usersByRole is rebuilt from scratch so keys written before roles
+      // were bucketed do not linger
+      [{ $unset: 'usersByRole' }, { $set: set }, { $unset: 'sinceReconcile' }],
+      { upsert: true, returnDocument: 'after' }
+    );
+  }
+
+  startReconcileJob() {
+    if (reconcileTimer || ADMIN_STATS_RECONCILE_MS <= 0) {
+      return;
+    }
+    reconcileTimer = setInterval(() => {
+      this.reconcile().catch(error => {
+        console.error('Admin stats reconciliation error:', error.message);
+      });
+    }, ADMIN_STATS_RECONCILE_MS);
+    reconcileTimer.unref?.();
+  }
+
+  isStale(snapshot) {
+    const reconciledAt = snapshot.reconciledAt ? new Date(snapshot.reconciledAt).getTime() : 0;
+    return Date.now() - reconciledAt > ADMIN_STATS_RECONCILE_MS;
+  }
+
+  async computeSnapshot() {
+    const db = this.db;
+    const users = db.collection('users');
+    const stories = db.collection('stories');
+    const events = db.collection('events');
+    const payments = db.collection('payments');
+
+    const sevenDaysAgo = new Date();
+    sevenDaysAgo.setDate(sevenDaysAgo.getDate() - 7);
+    const recentFilter = { createdAt: { $gte: sevenDaysAgo.toISOString() } };
+
+    const thirtyDaysAgo = new Date();
+    thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
+    const activeSince = thirtyDaysAgo.toISOString();
+
+    const [
+      totalUsers,
+      totalStories,
+      totalEvents,
+      roleCounts,
+      paymentTotals,
+      recentUsers,
+      recentStories,
+      recentEvents,
+      activeUsersCount
+    ] = await Promise.all([
+      users.countDocuments(),
+      stories.countDocuments(),
+      events.countDocuments(),
+      users.aggregate([{ $group: { _id: '$role', count: { $sum: 1 } } }]).toArray(),
+      payments.aggregate([
+        {
+          $group: {
+            _id: null,
+            totalPayments: { $sum: 1 },
+            completedPayments: {
+              $sum: { $cond: [{ $eq: ['$status', PAYMENT_STATUS.COMPLETED] }, 1, 0] }
+            },
+            totalRevenue: {
+              $sum: { $cond: [{ $eq: ['$status', PAYMENT_STATUS.COMPLETED] }, '$amount', 0] }
+            }
+          }
+        }
+      ]).toArray(),
+      users.countDocuments(recentFilter),
+      stories.countDocuments(recentFilter),
+      events.countDocuments(recentFilter),
+      this.countActiveUsers(activeSince)
+    ]);
+
+    const usersByRole = {};
+    for (const { _id, count } of roleCounts) {
+      const bucket = roleBucket(_id);
+      usersByRole[bucket] = (usersByRole[bucket] || 0) + count;
+    }
+
+    const { totalPayments = 0, completedPayments = 0, totalRevenue = 0 } = paymentTotals[0] || {};
+    const now = new Date().toISOString();
+
+    return {
+      _id: SNAPSHOT_ID,
+      totalUsers,
+      totalStories,
+      totalEvents,
+      usersByRole,
+      totalPayments,
+      completedPayments,
+      totalRevenue,
+      recentUsers,
+      recentStories,
+      recentEvents,
+      activeUsersCount,
+      reconciledAt: now,
+      updatedAt: now
+    };
+  }
+
+  async countActiveUsers(since) {
+    const [result] = await this.db.collection('stories')
+      .aggregate([...activeUsersPipeline(since), { $count: 'count' }], { allowDiskUse: true })
+      .toArray();
+    return result ? result.count : 0;
+  }
+
+  // The increment() key counting a new user with `role`
+  static roleCounter(role) {
+    return `usersByRole.${roleBucket(role)}`;
+  }
+
+  // Shapes the stored snapshot into the /api/admin/stats response
+  static toResponse(snapshot) {
+    const { _id, usersByRole, reconciledAt, updatedAt, sinceReconcile, ...counters } = snapshot;
+    return {
+      ...counters,
+      usersByRole: Object.entries(usersByRole || {})
+        .filter(([, count]) => count > 0)
+        .map(([role, count]) => ({ _id: role, count })),
+      statsUpdatedAt: updatedAt,
+      statsReconciledAt: reconciledAt
+    };
+  }
+}
@@ -0,0 +1,50 @@
+import { v4 as uuidv4 } from 'uuid';
+import { keysetFilter, toPage, DEFAULT_PAGE_LIMIT } from '../utils/pagination.js';
+
+export class CommentModel {
+  constructor(db) {
+    this.collection = db.collection('comments');
+  }
+
+  async create(commentData) {
+    const { storyId, userId, text } = commentData;
+
+    if (!text) {
+      throw new Error('Comment text is required');
+    }
+
+    const comment = {
+      id: uuidv4(),
+      storyId,
+      userId,
+      text,
+      createdAt: new Date().toISOString()
+    };
+
+    await this.collection.insertOne(comment);
+    delete comment._id;
+    return comment;
+  }
+
+  // Oldest first, keyed on (createdAt, id) within a story
+  async findByStory(storyId, { after = null, limit = DEFAULT_PAGE_LIMIT } = {}) {
+    const comments = await this.collection
+      .find({ storyId, ...keysetFilter('createdAt', after, 1) })
+      .project({ _id: 0 })
+      .sort({ createdAt: 1, id: 1 })
+      .limit(limit + 1)
+      .toArray();
+
+    return toPage(comments, limit, 'createdAt');
+  }
+
+  async delete(commentId) {
+    const result = await this.collection.deleteOne({ id: commentId });
+    return result.deletedCount > 0;
+  }
+
+  async deleteByStory(storyId) {
+    const result = await this.collection.deleteMany({ storyId });
+    return result.deletedCount;
+  }
+}
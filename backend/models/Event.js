@@ -1,9 +1,14 @@
 import { v4 as uuidv4 } from 'uuid';
 import { EVENT_TYPES } from '../config/constants.js';
+import { USER_SNIPPET_PROJECTION } from './User.js';
+import { keysetFilter, toPage, DEFAULT_PAGE_LIMIT } from '../utils/pagination.js';
 
 export class EventModel {
-  constructor(db) {
+  // `context` is the request context when built through it; findById then
+  // goes through its per-request batcher and memo
+  constructor(db, context = null) {
     this.collection = db.collection('events');
+    this.loader = context ? context.loader('events') : null;
   }
 
   async create(eventData) {
@@ -46,15 +51,76 @@ export class EventModel {
     return event;
   }
 
-  async findAll() {
-    return await this.collection
-      .find({})
-      .sort({ date: 1 })
-      .toArray();
+  // Soonest first, keyed on (date, id); the page is cut before the creator join.
+  // `creatorId` and `attendeeId` narrow the listing to one host's events or
+  // to the events a user has RSVP'd to.
+  async findAllWithCreators({
+    viewerId = null,
+    includeRsvps = false,
+    creatorId = null,
+    attendeeId = null,
+    after = null,
+    limit = DEFAULT_PAGE_LIMIT
+  } = {}) {
+    const rsvps = { $ifNull: ['$rsvps', []] };
+    const match = keysetFilter('date', after, 1);
+    if (creatorId) {
+      match.creatorId = creatorId;
+    }
+    if (attendeeId) {
+      match.rsvps = attendeeId;
+    }
+    const pipeline = [
+      { $match: match },
+      { $sort: { date: 1, id: 1 } },
+      { $limit: limit + 1 },
+      {
+        $lookup: {
+          from: 'users',
+          localField: 'creatorId',
+          foreignField: 'id',
+          pipeline: [{ $project: USER_SNIPPET_PROJECTION }],
+          as: 'creator'
+        }
+      },
+      { $unwind: { path: '$creator', preserveNullAndEmptyArrays: true } },
+      {
+        $addFields: {
+          rsvpCount: { $size: rsvps },
+          isAttending: viewerId ? { $in: [viewerId, rsvps] } : false
+        }
+      }
+    ];
+
+    if (!includeRsvps) {
+      pipeline.push({ $project: { rsvps: 0 } });
+    }
+
+    const events = await this.collection.aggregate(pipeline).toArray();
+    return toPage(events, limit, 'date');
   }
 
   async findById(id) {
-    return await this.collection.findOne({ id });
+    if (!this.loader) {
+      return await this.collection.findOne({ id });
+    }
+    const event = await this.loader.load(id);
+    // Callers decorate the result; the memoized document stays untouched
+    return event && { ...event };
+  }
+
+  async findManyByIds(ids, projection = {}) {
+    const uniqueIds = [...new Set(ids.filter(Boolean))];
+    if (uniqueIds.length === 0) {
+      return new Map();
+    }
+
+    const events = await this.collection
+      .find({ id: { $in: uniqueIds } })
+      .project(projection)
+      .toArray();
+
+    return new Map(events.map(event => [event.id, event]));
   }
 
   async findByCreator(creatorId) {
@@ -64,40 +130,93 @@ export class EventModel {
       .toArray();
   }
 
-  async addRSVP(eventId, userId) {
+  // Matches events that still have room, expressed in the query so the
+  // check and the write happen atomically
+  hasCapacityFilter() {
+    return {
+      $or: [
+        { maxAttendees: { $not: { $gt: 0 } } },
+        { $expr: { $lt: [{ $size: { $ifNull: ['$rsvps', []] } }, '$maxAttendees'] } }
+      ]
+    };
+  }
+
+  // Only called when a conditional update matched nothing
+  async explainRSVPFailure(eventId, userId) {
     const event = await this.findById(eventId);
     if (!event) {
       throw new Error('Event not found');
     }
-
-    const rsvps = event.rsvps || [];
-    if (rsvps.includes(userId)) {
-      throw new Error('Already RSVP\'d');
-    }
-
-    if (event.maxAttendees > 0 && rsvps.length >= event.maxAttendees) {
-      throw new Error('Event is full');
+    if ((event.rsvps || []).includes(userId)) {
+      return event;
     }
+    throw new Error('Event is full');
+  }
 
-    await this.collection.updateOne(
-      { id: eventId },
-      { $push: { rsvps: userId }, $set: { updatedAt: new Date().toISOString() } }
+  // Idempotent: an existing RSVP is returned unchanged
+  async addRSVP(eventId, userId) {
+    const event = await this.collection.findOneAndUpdate(
+      { id: eventId, rsvps: { $ne: userId }, ...this.hasCapacityFilter() },
+      { $push: { rsvps: userId }, $set: { updatedAt: new Date().toISOString() } },
+      { returnDocument: 'after' }
     );
+    this.loader?.clear(eventId);
 
-    return await this.findById(eventId);
+    return event || await this.explainRSVPFailure(eventId, userId);
   }
 
   async removeRSVP(eventId, userId) {
-    await this.collection.updateOne(
+    const event = await this.collection.findOneAndUpdate(
       { id: eventId },
-      { $pull: { rsvps: userId }, $set: { updatedAt: new Date().toISOString() } }
+      { $pull: { rsvps: userId }, $set: { updatedAt: new Date().toISOString() } },
+      { returnDocument: 'after' }
     );
+    this.loader?.clear(eventId);
+    return event;
+  }
 
-    return await this.findById(eventId);
+  // Single atomic round-trip: matches when the user is leaving or the event
+  // has room, then flips membership with a pipeline update. `compact`
+  // projects the result down to { attending, rsvpCount } inside MongoDB.
+  async toggleRSVP(eventId, userId, { compact = false } = {}) {
+    const rsvps = { $ifNull: ['$rsvps', []] };
+    const event = await this.collection.findOneAndUpdate(
+      { id: eventId, $or: [{ rsvps: userId }, this.hasCapacityFilter()] },
+      [
+        {
+          $set: {
+            rsvps: {
+              $cond: [
+                { $in: [userId, rsvps] },
+                { $filter: { input: rsvps, cond: { $ne: ['$$this', userId] } } },
+                { $concatArrays: [rsvps, [userId]] }
+              ]
+            },
+            updatedAt: new Date().toISOString()
+          }
+        }
+      ],
+      {
+        returnDocument: 'after',
+        projection: compact
+          ? { _id: 0, attending: { $in: [userId, '$rsvps'] }, rsvpCount: { $size: '$rsvps' } }
+          : undefined
+      }
+    );
+    this.loader?.clear(eventId);
+
+    if (!event) {
+      // Not found, or full and the user is not already attending
+      const existing = await this.findById(eventId);
+      throw new Error(existing ? 'Event is full' : 'Event not found');
+    }
+
+    return event;
   }
 
   async delete(eventId) {
     const result = await this.collection.deleteOne({ id: eventId });
+    this.loader?.clear(eventId);
     return result.deletedCount > 0;
   }
 
@@ -118,6 +237,7 @@ export class EventModel {
       { id: eventId },
       { $set: filteredUpdates }
     );
+    this.loader?.clear(eventId);
 
     return await this.findById(eventId);
   }
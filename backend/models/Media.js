@@ -0,0 +1,104 @@
+export const MEDIA_STATUS = {
+  PENDING: 'pending',
+  READY: 'ready',
+  FAILED: 'failed',
+  SKIPPED: 'skipped'
+};
+
+// One document per uploaded original, keyed by its content-addressed key,
+// recording the derived renditions once they have been generated
+export class MediaModel {
+  constructor(db) {
+    this.collection = db.collection('media');
+  }
+
+  async create(mediaData) {
+    const { key, url, contentType, size } = mediaData;
+
+    const now = new Date().toISOString();
+    await this.collection.updateOne(
+      { key },
+      {
+        $setOnInsert: {
+          key,
+          url,
+          contentType,
+          size,
+          status: MEDIA_STATUS.PENDING,
+          renditions: [],
+          createdAt: now,
+          updatedAt: now
+        }
+      },
+      { upsert: true }
+    );
+
+    // Uploading the same bytes again retries a derivation that failed
+    await this.collection.updateOne(
+      { key, status: MEDIA_STATUS.FAILED },
+      { $set: { status: MEDIA_STATUS.PENDING, reason: '', updatedAt: now } }
+    );
+
+    return await this.findByKey(key);
+  }
+
+  async findByKey(key) {
+    return await this.collection.findOne({ key });
+  }
+
+  async markReady(key, { width, height, renditions }) {
+    await this.collection.updateOne(
+      { key },
+      {
+        $set: {
+          status: MEDIA_STATUS.READY,
+          width,
+          height,
+          renditions,
+          updatedAt: new Date().toISOString()
+        }
+      }
+    );
+  }
+
+  async markStatus(key, status, reason = '') {
+    await this.collection.updateOne(
+      { key },
+      { $set: { status, reason, updatedAt: new Date().toISOString() } }
+    );
+  }
+
+  // Maps each url to its srcset metadata with one $in query
+  async describeUrls(urls) {
+    const uniqueUrls = [...new Set(urls.filter(Boolean))];
+    if (uniqueUrls.length === 0) {
+      return new Map();
+    }
+
+    const docs = await this.collection
+      .find({ url: { $in: uniqueUrls }, status: MEDIA_STATUS.READY })
+      .project({ _id: 0, url: 1, width: 1, height: 1, renditions: 1 })
+      .toArray();
+
+    return new Map(docs.map(doc => [doc.url, MediaModel.toSrcset(doc)]));
+  }
+
+  // { url, width, height, thumbnail, srcset: { avif: 'a 320w, b 960w', webp: ... } }
+  static toSrcset(doc) {
+    const srcset = {};
+    for (const rendition of doc.renditions || []) {
+      const entry = `${rendition.url} ${rendition.width}w`;
+      srcset[rendition.format] = srcset[rendition.format] ? `${srcset[rendition.format]}, ${entry}` : entry;
+    }
+
+    const thumbnail = (doc.renditions || []).find(r => r.name === 'thumb' && r.format === 'webp');
+
+    return {
+      url: doc.url,
+      width: doc.width,
+      height: doc.height,
+      thumbnail: thumbnail ? thumbnail.url : doc.url,
+      srcset
+    };
+  }
+}
@@ -2,8 +2,9 @@ import { v4 as uuidv4 } from 'uuid';
 import { PAYMENT_STATUS, PAYMENT_GATEWAYS } from '../config/constants.js';
 
 export class PaymentModel {
-  constructor(db) {
+  constructor(db, context = null) {
     this.collection = db.collection('payments');
+    this.loader = context ? context.loader('payments') : null;
   }
 
   async create(paymentData) {
@@ -46,7 +47,11 @@ export class PaymentModel {
   }
 
   async findById(id) {
-    return await this.collection.findOne({ id });
+    if (!this.loader) {
+      return await this.collection.findOne({ id });
+    }
+    const payment = await this.loader.load(id);
+    return payment && { ...payment };
   }
 
   async findByGatewayOrderId(gatewayOrderId) {
@@ -86,10 +91,39 @@ export class PaymentModel {
       { id: paymentId },
       { $set: updates }
     );
+    this.loader?.clear(paymentId);
 
     return await this.findById(paymentId);
   }
 
+  // Completes a payment unless it already is; true only for the call that
+  // made the transition, so racing verify/webhook/capture handlers can tell
+  // which one should count it
+  async markCompleted(paymentId, metadata = {}) {
+    const now = new Date().toISOString();
+    const updates = {
+      status: PAYMENT_STATUS.COMPLETED,
+      updatedAt: now
+    };
+
+    if (Object.keys(metadata).length > 0) {
+      updates.metadata = metadata;
+    }
+
+    if (metadata.gatewayPaymentId) {
+      updates.gatewayPaymentId = metadata.gatewayPaymentId;
+      updates.completedAt = now;
+    }
+
+    const result = await this.collection.updateOne(
+      { id: paymentId, status: { $ne: PAYMENT_STATUS.COMPLETED } },
+      { $set: updates }
+    );
+    this.loader?.clear(paymentId);
+
+    return result.modifiedCount === 1;
+  }
+
   async getStats() {
     const totalPayments = await this.collection.countDocuments();
     const completedPayments = await this.collection.countDocuments({ 
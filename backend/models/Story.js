@@ -1,8 +1,14 @@
 import { v4 as uuidv4 } from 'uuid';
+import { keysetFilter, toPage, DEFAULT_PAGE_LIMIT } from '../utils/pagination.js';
+
+// Comments live in their own collection; the story only keeps a count and
+// the newest few for feed previews
+export const RECENT_COMMENTS_LIMIT = 3;
 
 export class StoryModel {
-  constructor(db) {
+  constructor(db, context = null) {
     this.collection = db.collection('stories');
+    this.loader = context ? context.loader('stories') : null;
   }
 
   async create(storyData) {
@@ -20,7 +26,8 @@ export class StoryModel {
       mediaUrls: mediaUrls || [],
       location: location || '',
       likes: [],
-      comments: [],
+      commentCount: 0,
+      recentComments: [],
       createdAt: new Date().toISOString(),
       updatedAt: new Date().toISOString()
     };
@@ -29,16 +36,23 @@ export class StoryModel {
     return story;
   }
 
-  async findAll(limit = 50) {
-    return await this.collection
-      .find({})
-      .sort({ createdAt: -1 })
-      .limit(limit)
+  // Newest first, keyed on (createdAt, id) so deep pages cost the same as the first
+  async findAll({ after = null, limit = DEFAULT_PAGE_LIMIT } = {}) {
+    const stories = await this.collection
+      .find(keysetFilter('createdAt', after, -1))
+      .sort({ createdAt: -1, id: -1 })
+      .limit(limit + 1)
       .toArray();
+
+    return toPage(stories, limit, 'createdAt');
   }
 
   async findById(id) {
-    return await this.collection.findOne({ id });
+    if (!this.loader) {
+      return await this.collection.findOne({ id });
+    }
+    const story = await this.loader.load(id);
+    return story && { ...story };
   }
 
   async findByUser(userId) {
@@ -48,52 +62,69 @@ export class StoryModel {
       .toArray();
   }
 
-  async toggleLike(storyId, userId) {
-    const story = await this.findById(storyId);
+  // Single atomic round-trip: the pipeline update adds or removes userId
+  // depending on whether it is already present. `compact` projects the
+  // result down to { liked, likeCount } inside MongoDB.
+  async toggleLike(storyId, userId, { compact = false } = {}) {
+    const likes = { $ifNull: ['$likes', []] };
+    const story = await this.collection.findOneAndUpdate(
+      { id: storyId },
+      [
+        {
+          $set: {
+            likes: {
+              $cond: [
+                { $in: [userId, likes] },
+                { $filter: { input: likes, cond: { $ne: ['$$this', userId] } } },
+                { $concatArrays: [likes, [userId]] }
+              ]
+            },
+            updatedAt: new Date().toISOString()
+          }
+        }
+      ],
+      {
+        returnDocument: 'after',
+        projection: compact
+          ? { _id: 0, liked: { $in: [userId, '$likes'] }, likeCount: { $size: '$likes' } }
+          : undefined
+      }
+    );
+    this.loader?.clear(storyId);
+
     if (!story) {
       throw new Error('Story not found');
     }
 
-    const likes = story.likes || [];
-    const hasLiked = likes.includes(userId);
-
-    if (hasLiked) {
-      await this.collection.updateOne(
-        { id: storyId },
-        { $pull: { likes: userId }, $set: { updatedAt: new Date().toISOString() } }
-      );
-    } else {
-      await this.collection.updateOne(
-        { id: storyId },
-        { $push: { likes: userId }, $set: { updatedAt: new Date().toISOString() } }
-      );
-    }
-
-    return await this.findById(storyId);
+    return story;
   }
 
-  async addComment(storyId, userId, text) {
-    if (!text) {
-      throw new Error('Comment text is required');
-    }
-
-    const comment = {
-      id: uuidv4(),
-      userId,
-      text,
-      createdAt: new Date().toISOString()
+  // Records a comment already stored by CommentModel; returns null when
+  // the story does not exist
+  async addComment(storyId, comment) {
+    const preview = {
+      id: comment.id,
+      userId: comment.userId,
+      text: comment.text,
+      createdAt: comment.createdAt
     };
 
-    await this.collection.updateOne(
+    const story = await this.collection.findOneAndUpdate(
       { id: storyId },
-      { $push: { comments: comment }, $set: { updatedAt: new Date().toISOString() } }
+      {
+        $inc: { commentCount: 1 },
+        $push: { recentComments: { $each: [preview], $slice: -RECENT_COMMENTS_LIMIT } },
+        $set: { updatedAt: new Date().toISOString() }
+      },
+      { returnDocument: 'after' }
     );
-
-    return await this.findById(storyId);
+    this.loader?.clear(storyId);
+    return story;
   }
 
   async delete(storyId) {
     const result = await this.collection.deleteOne({ id: storyId });
+    this.loader?.clear(storyId);
     return result.deletedCount > 0;
   }
 }
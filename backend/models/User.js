@@ -1,10 +1,18 @@
 import { v4 as uuidv4 } from 'uuid';
-import bcrypt from 'bcryptjs';
 import { USER_ROLES } from '../config/constants.js';
+import { hashPassword, comparePassword, needsRehash } from '../utils/passwordHasher.js';
+import { getUserSnippetCache } from '../utils/userSnippetCache.js';
+
+// Public fields embedded as `user` / `creator` on stories and events
+export const USER_SNIPPET_PROJECTION = { _id: 0, id: 1, name: 1, role: 1, profileImage: 1 };
+
+// What the snippet cache holds: the public fields plus email for admin views
+const CACHED_SNIPPET_PROJECTION = { ...USER_SNIPPET_PROJECTION, email: 1 };
 
 export class UserModel {
-  constructor(db) {
+  constructor(db, context = null) {
     this.collection = db.collection('users');
+    this.loader = context ? context.loader('users') : null;
   }
 
   async create(userData) {
@@ -22,7 +30,7 @@ export class UserModel {
     }
 
     // Hash password
-    const hashedPassword = await bcrypt.hash(password, 10);
+    const hashedPassword = await hashPassword(password);
 
     const user = {
       id: uuidv4(),
@@ -34,6 +42,7 @@ export class UserModel {
       profileImage: '',
       bikeInfo: role === USER_ROLES.RIDER ? bikeInfo : null,
       clubInfo: role === USER_ROLES.CLUB ? clubInfo : null,
+      profileVersion: 1,
       createdAt: new Date().toISOString(),
       updatedAt: new Date().toISOString()
     };
@@ -47,7 +56,49 @@ export class UserModel {
   }
 
   async findById(id) {
-    return await this.collection.findOne({ id });
+    if (!this.loader) {
+      return await this.collection.findOne({ id });
+    }
+    const user = await this.loader.load(id);
+    return user && { ...user };
+  }
+
+  // Served from the snippet cache; misses are loaded with a single $in query
+  async loadCachedSnippets(ids) {
+    const uniqueIds = [...new Set(ids.filter(Boolean))];
+    if (uniqueIds.length === 0) {
+      return new Map();
+    }
+
+    return await getUserSnippetCache().getMany(uniqueIds, async (missingIds) => {
+      const users = await this.collection
+        .find({ id: { $in: missingIds } })
+        .project(CACHED_SNIPPET_PROJECTION)
+        .toArray();
+      return new Map(users.map(user => [user.id, user]));
+    });
+  }
+
+  async findSnippetsByIds(ids, { withEmail = false } = {}) {
+    const snippets = await this.loadCachedSnippets(ids);
+    return new Map([...snippets].map(([id, { email, ...snippet }]) => [
+      id,
+      withEmail ? { ...snippet, email } : snippet
+    ]));
+  }
+
+  async findSnippetById(id, options) {
+    const snippets = await this.findSnippetsByIds([id], options);
+    return snippets.get(id) || null;
+  }
+
+  // Current profile version, or null if the user does not exist. Users
+  // created before versioning count as version 0. A point read on id_unique
+  // rather than the snippet cache, which is per process without REDIS_URL
+  // and could hide an edit made through another instance for a full TTL.
+  async getProfileVersion(id) {
+    const user = await this.collection.findOne({ id }, { projection: { _id: 0, profileVersion: 1 } });
+    return user ? (user.profileVersion || 0) : null;
   }
 
   async update(id, updates) {
@@ -64,14 +115,32 @@ export class UserModel {
 
     await this.collection.updateOne(
       { id },
-      { $set: filteredUpdates }
+      { $set: filteredUpdates, $inc: { profileVersion: 1 } }
     );
+    this.loader?.clear(id);
+    await getUserSnippetCache().invalidate(id);
 
     return await this.findById(id);
   }
 
   async verifyPassword(user, password) {
-    return await bcrypt.compare(password, user.password);
+    return await comparePassword(password, user.password);
+  }
+
+  // True when the stored hash was made with a lower cost than BCRYPT_COST
+  needsRehash(user) {
+    return needsRehash(user.password);
+  }
+
+  // Called after a successful login with the verified plaintext. Guarded on
+  // the old hash so a concurrent password change is never overwritten.
+  async rehashPassword(user, password) {
+    const hashedPassword = await hashPassword(password);
+    await this.collection.updateOne(
+      { id: user.id, password: user.password },
+      { $set: { password: hashedPassword } }
+    );
+    this.loader?.clear(user.id);
   }
 
   sanitizeUser(user) {
@@ -0,0 +1,64 @@
+// Moves comments embedded in stories.comments into the comments collection
+// and replaces the array with commentCount / recentComments.
+//
+// Usage: MONGO_URL=... DB_NAME=... node backend/scripts/migrate-comments.js
+//
+// Safe to re-run: comments are upserted by id and only stories that still
+// carry an embedded `comments` array are touched.
+import { connectToDatabase } from '../config/database.js';
+import { RECENT_COMMENTS_LIMIT } from '../models/Story.js';
+
+async function migrateComments() {
+  const { client, db } = await connectToDatabase();
+  const stories = db.collection('stories');
+  const comments = db.collection('comments');
+
+  let migratedStories = 0;
+  let migratedComments = 0;
+
+  const cursor = stories
+    .find({ comments: { $exists: true } })
+    .project({ id: 1, comments: 1, commentCount: 1 });
+
+  for await (const story of cursor) {
+    const embedded = (story.comments || [])
+      .filter(comment => comment && comment.id)
+      .sort((a, b) => (a.createdAt || '').localeCompare(b.createdAt || ''));
+
+    if (embedded.length > 0) {
+      await comments.bulkWrite(
+        embedded.map(comment => ({
+          updateOne: {
+            filter: { id: comment.id },
+            update: { $setOnInsert: { ...comment, storyId: story.id } },
+            upsert: true
+          }
+        })),
+        { ordered: false }
+      );
+    }
+
+    const commentCount = await comments.countDocuments({ storyId: story.id });
+    await stories.updateOne(
+      { id: story.id },
+      {
+        $set: {
+          commentCount,
+          recentComments: embedded.slice(-RECENT_COMMENTS_LIMIT)
+        },
+        $unset: { comments: '' }
+      }
+    );
+
+    migratedStories += 1;
+    migratedComments += embedded.length;
+  }
+
+  console.log(`Migrated ${migratedComments} comments from ${migratedStories} stories`);
+  await client.close();
+}
+
+migrateComments().catch(error => {
+  console.error('Comment migration failed:', error);
+  process.exit(1);
+});
@@ -0,0 +1,167 @@
+import fs from 'fs';
+import path from 'path';
+import { Readable } from 'stream';
+import { pipeline } from 'stream/promises';
+
+// Pluggable storage for uploaded media. Keys are content-addressed
+// (`<sha256>.<ext>`), so a put for an existing key is a no-op.
+//
+//   BLOB_STORE=local (default)  files under UPLOAD_DIR, served from /api/media
+//   BLOB_STORE=s3               any S3-compatible endpoint (AWS, MinIO, ...)
+
+const MEDIA_ROUTE = '/api/media';
+
+export class LocalBlobStore {
+  constructor(root = process.env.UPLOAD_DIR || path.join(process.cwd(), 'uploads')) {
+    this.root = root;
+  }
+
+  pathFor(key) {
+    return path.join(this.root, key);
+  }
+
+  async exists(key) {
+    try {
+      await fs.promises.access(this.pathFor(key));
+      return true;
+    } catch (error) {
+      return false;
+    }
+  }
+
+  // Moves the fully written source file into place
+  async put(key, sourcePath) {
+    await fs.promises.mkdir(this.root, { recursive: true });
+    if (await this.exists(key)) {
+      await fs.promises.rm(sourcePath, { force: true });
+      return;
+    }
+    try {
+      await fs.promises.rename(sourcePath, this.pathFor(key));
+    } catch (error) {
+      // EXDEV: temp dir on another filesystem
+      if (error.code !== 'EXDEV') {
+        throw error;
+      }
+      await pipeline(fs.createReadStream(sourcePath), fs.createWriteStream(this.pathFor(key)));
+      await fs.promises.rm(sourcePath, { force: true });
+    }
+  }
+
+  async get(key) {
+    try {
+      const stat = await fs.promises.stat(this.pathFor(key));
+      return { stream: fs.createReadStream(this.pathFor(key)), size: stat.size };
+    } catch (error) {
+      if (error.code === 'ENOENT') {
+        return null;
+      }
+      throw error;
+    }
+  }
+
+  urlFor(key) {
+    return `${MEDIA_ROUTE}/${key}`;
+  }
+}
+
+export class S3BlobStore {
+  constructor({
+    bucket = process.env.S3_BUCKET,
+    region = process.env.S3_REGION || 'us-east-1',
+    endpoint = process.env.S3_ENDPOINT,
+    publicUrl = process.env.S3_PUBLIC_URL
+  } = {}) {
+    if (!bucket) {
+      throw new Error('S3_BUCKET is required when BLOB_STORE=s3');
+    }
+    this.bucket = bucket;
+    this.region = region;
+    this.endpoint = endpoint;
+    this.publicUrl = publicUrl ? publicUrl.replace(/\/$/, '') : null;
+    this.sdk = null;
+    this.client = null;
+  }
+
+  // The AWS SDK is an optional dependency, only loaded when S3 is selected
+  async getClient() {
+    if (!this.client) {
+      try {
+        this.sdk = await import('@aws-sdk/client-s3');
+      } catch (error) {
+        throw new Error('BLOB_STORE=s3 requires the @aws-sdk/client-s3 package');
+      }
+      this.client = new this.sdk.S3Client({
+        region: this.region,
+        endpoint: this.endpoint,
+        // MinIO and most local stand-ins only support path-style addressing
+        forcePathStyle: Boolean(this.endpoint)
+      });
+    }
+    return this.client;
+  }
+
+  async exists(key) {
+    const client = await this.getClient();
+    try {
+      await client.send(new this.sdk.HeadObjectCommand({ Bucket: this.bucket, Key: key }));
+      return true;
+    } catch (error) {
+      if (error.$metadata?.httpStatusCode === 404) {
+        return false;
+      }
+      throw error;
+    }
+  }
+
+  async put(key, sourcePath, contentType) {
+    const client = await this.getClient();
+    try {
+      if (!(await this.exists(key))) {
+        const { size } = await fs.promises.stat(sourcePath);
+        await client.send(new this.sdk.PutObjectCommand({
+          Bucket: this.bucket,
+          Key: key,
+          Body: fs.createReadStream(sourcePath),
+          ContentLength: size,
+          ContentType: contentType,
+          CacheControl: 'public, max-age=31536000, immutable'
+        }));
+      }
+    } finally {
+      await fs.promises.rm(sourcePath, { force: true });
+    }
+  }
+
+  async get(key) {
+    const client = await this.getClient();
+    try {
+      const object = await client.send(new this.sdk.GetObjectCommand({ Bucket: this.bucket, Key: key }));
+      const stream = object.Body instanceof Readable ? object.Body : Readable.fromWeb(object.Body);
+      return { stream, size: object.ContentLength };
+    } catch (error) {
+      if (error.$metadata?.httpStatusCode === 404) {
+        return null;
+      }
+      throw error;
+    }
+  }
+
+  urlFor(key) {
+    return this.publicUrl ? `${this.publicUrl}/${key}` : `${MEDIA_ROUTE}/${key}`;
+  }
+}
+
+let blobStore = null;
+
+export function getBlobStore() {
+  if (!blobStore) {
+    blobStore = process.env.BLOB_STORE === 's3' ? new S3BlobStore() : new LocalBlobStore();
+  }
+  return blobStore;
+}
+
+// Lets tests and scripts swap in a stand-in store
+export function setBlobStore(store) {
+  blobStore = store;
+}
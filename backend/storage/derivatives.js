@@ -0,0 +1,115 @@
+import os from 'os';
+import fs from 'fs';
+import path from 'path';
+import crypto from 'crypto';
+import { getBlobStore } from './blobStore.js';
+import { MediaModel, MEDIA_STATUS } from '../models/Media.js';
+
+// Feed cards are at most ~320px wide on phones; the medium size covers the
+// story detail view. Originals are never upscaled.
+export const RENDITIONS = [
+  { name: 'thumb', width: 320 },
+  { name: 'medium', width: 960 }
+];
+
+export const RENDITION_FORMATS = [
+  { format: 'avif', options: { quality: 50 } },
+  { format: 'webp', options: { quality: 75 } }
+];
+
+// Animated and vector formats are served as uploaded. HEIC is too: prebuilt
+// sharp binaries decode AVIF but have no HEVC decoder, so it would only ever
+// end up FAILED.
+const DERIVABLE_TYPES = new Set(['image/jpeg', 'image/png', 'image/webp', 'image/avif']);
+
+export function isDerivable(contentType) {
+  return DERIVABLE_TYPES.has(contentType);
+}
+
+// sharp ships with Next.js as an optional dependency; without it uploads
+// still work, they just keep only the original
+let sharpLoader = null;
+function loadSharp() {
+  if (!sharpLoader) {
+    sharpLoader = import('sharp')
+      .then(module => module.default)
+      .catch(() => {
+        console.warn('sharp is not installed, image derivatives are disabled');
+        return null;
+      });
+  }
+  return sharpLoader;
+}
+
+async function readAll(stream) {
+  const chunks = [];
+  for await (const chunk of stream) {
+    chunks.push(chunk);
+  }
+  return Buffer.concat(chunks);
+}
+
+async function storeBuffer(store, data, extension, contentType) {
+  const key = `${crypto.createHash('sha256').update(data).digest('hex')}.${extension}`;
+  const tempPath = path.join(os.tmpdir(), `derivative-${crypto.randomUUID()}`);
+  await fs.promises.writeFile(tempPath, data);
+  await store.put(key, tempPath, contentType);
+  return key;
+}
+
+export async function generateDerivatives(db, key, store = getBlobStore()) {
+  const mediaModel = new MediaModel(db);
+
+  const sharp = await loadSharp();
+  if (!sharp) {
+    await mediaModel.markStatus(key, MEDIA_STATUS.SKIPPED, 'sharp unavailable');
+    return;
+  }
+
+  const blob = await store.get(key);
+  if (!blob) {
+    await mediaModel.markStatus(key, MEDIA_STATUS.FAILED, 'original not found');
+    return;
+  }
+
+  const original = await readAll(blob.stream);
+  const { width, height } = await sharp(original).rotate().metadata();
+
+  const renditions = [];
+  for (const { name, width: targetWidth } of RENDITIONS) {
+    for (const { format, options } of RENDITION_FORMATS) {
+      const { data, info } = await sharp(original)
+        .rotate()
+        .resize({ width: targetWidth, withoutEnlargement: true })
+        .toFormat(format, options)
+        .toBuffer({ resolveWithObject: true });
+
+      const renditionKey = await storeBuffer(store, data, format, `image/${format}`);
+      renditions.push({
+        name,
+        format,
+        width: info.width,
+        height: info.height,
+        size: info.size,
+        key: renditionKey,
+        url: store.urlFor(renditionKey)
+      });
+    }
+  }
+
+  await mediaModel.markReady(key, { width, height, renditions });
+}
+
+// Derivatives are generated off the request path, one image at a time so a
+// burst of uploads cannot monopolise the CPU
+let queue = Promise.resolve();
+
+export function scheduleDerivatives(db, key) {
+  queue = queue
+    .then(() => generateDerivatives(db, key))
+    .catch(async (error) => {
+      console.error(`Derivative generation failed for ${key}:`, error.message);
+      await new MediaModel(db).markStatus(key, MEDIA_STATUS.FAILED, error.message).catch(() => {});
+    });
+  return queue;
+}
@@ -0,0 +1,80 @@
+import os from 'os';
+import fs from 'fs';
+import { Readable } from 'stream';
+import formidable from 'formidable';
+
+export const UPLOAD_MAX_BYTES = parseInt(process.env.UPLOAD_MAX_BYTES || String(25 * 1024 * 1024), 10);
+
+const EXTENSIONS_BY_TYPE = {
+  'image/jpeg': 'jpg',
+  'image/png': 'png',
+  'image/gif': 'gif',
+  'image/webp': 'webp',
+  'image/avif': 'avif',
+  'image/heic': 'heic',
+  'video/mp4': 'mp4',
+  'video/quicktime': 'mov',
+  'video/webm': 'webm'
+};
+
+export const CONTENT_TYPES_BY_EXTENSION = Object.fromEntries(
+  Object.entries(EXTENSIONS_BY_TYPE).map(([type, ext]) => [ext, type])
+);
+
+// Streams the multipart `file` field of `request` to a temp file, hashing it
+// on the way through, so the upload is never held in memory.
+// Resolves to { filepath, hash, mimetype, size, extension } or null when the
+// request carries no file. Only the image and video types above are
+// accepted, anything else (HTML, SVG, ...) is rejected with a 415 since it
+// would be served back from our origin.
+export async function receiveUpload(request) {
+  if (!request.body) {
+    return null;
+  }
+
+  const form = formidable({
+    uploadDir: os.tmpdir(),
+    maxFiles: 1,
+    maxFileSize: UPLOAD_MAX_BYTES,
+    hashAlgorithm: 'sha256'
+  });
+
+  // formidable reads from a Node request; adapt the web Request body to one
+  const nodeRequest = Readable.fromWeb(request.body);
+  nodeRequest.headers = Object.fromEntries(request.headers);
+
+  const [, files] = await form.parse(nodeRequest);
+  const file = Array.isArray(files.file) ? files.file[0] : files.file;
+
+  // Drop any stray parts that were written under other field names
+  for (const [field, entries] of Object.entries(files)) {
+    if (field !== 'file') {
+      for (const entry of [].concat(entries)) {
+        await fs.promises.rm(entry.filepath, { force: true });
+      }
+    }
+  }
+
+  if (!file || file.size === 0) {
+    if (file) {
+      await fs.promises.rm(file.filepath, { force: true });
+    }
+    return null;
+  }
+
+  const extension = EXTENSIONS_BY_TYPE[file.mimetype];
+  if (!extension) {
+    await fs.promises.rm(file.filepath, { force: true });
+    const error = new Error(`Unsupported file type: ${file.mimetype || 'unknown'}`);
+    error.httpCode = 415;
+    throw error;
+  }
+
+  return {
+    filepath: file.filepath,
+    hash: file.hash,
+    mimetype: file.mimetype,
+    size: file.size,
+    extension
+  };
+}
@@ -0,0 +1,113 @@
+// Small key/value cache backends with a common async interface:
+//   getMany(keys) -> Map<key, value>, setMany([[key, value]]), delete(key), clear()
+// Values must be JSON-serialisable so both backends behave the same.
+
+// In-process cache with per-entry TTL and least-recently-used eviction.
+// Map iteration order is insertion order, so re-inserting on read keeps the
+// least recently used entry first.
+export class MemoryCache {
+  constructor({ maxEntries = 10000, ttlMs = 60000 } = {}) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.entries = new Map();
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  async getMany(keys) {
+    const found = new Map();
+    const now = Date.now();
+    for (const key of keys) {
+      const entry = this.entries.get(key);
+      if (!entry) {
+        continue;
+      }
+      this.entries.delete(key);
+      if (entry.expiresAt <= now) {
+        continue;
+      }
+      this.entries.set(key, entry);
+      found.set(key, entry.value);
+    }
+    return found;
+  }
+
+  async setMany(pairs) {
+    const expiresAt = Date.now() + this.ttlMs;
+    for (const [key, value] of pairs) {
+      this.entries.delete(key);
+      this.entries.set(key, { value, expiresAt });
+    }
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+  }
+
+  async delete(key) {
+    this.entries.delete(key);
+  }
+
+  async clear() {
+    this.entries.clear();
+  }
+}
+
+// Redis-compatible backend. `client` only needs the node-redis v4 methods
+// mGet, set(key, value, { PX }) and del, so tests can pass a local stand-in.
+// Eviction is left to the server's maxmemory-policy (allkeys-lru).
+export class RedisCache {
+  constructor(client, { ttlMs = 60000, prefix = 'cache:' } = {}) {
+    this.client = client;
+    this.ttlMs = ttlMs;
+    this.prefix = prefix;
+  }
+
+  get size() {
+    return undefined;
+  }
+
+  async getMany(keys) {
+    const found = new Map();
+    if (keys.length === 0) {
+      return found;
+    }
+    const values = await this.client.mGet(keys.map(key => this.prefix + key));
+    keys.forEach((key, i) => {
+      if (values[i] !== null && values[i] !== undefined) {
+        found.set(key, JSON.parse(values[i]));
+      }
+    });
+    return found;
+  }
+
+  async setMany(pairs) {
+    await Promise.all(pairs.map(([key, value]) =>
+      this.client.set(this.prefix + key, JSON.stringify(value), { PX: this.ttlMs })
+    ));
+  }
+
+  async delete(key) {
+    await this.client.del(this.prefix + key);
+  }
+
+  async clear() {
+    // Keys expire on their own; a shared Redis is never flushed from here
+  }
+}
+
+// Connects a node-redis client for REDIS_URL. The package is optional and
+// only loaded when Redis is configured.
+export async function createRedisClient(url) {
+  let redis;
+  try {
+    redis = await import('redis');
+  } catch (error) {
+    throw new Error('REDIS_URL is set but the redis package is not installed');
+  }
+  const client = redis.createClient({ url });
+  client.on('error', error => console.error('Redis client error:', error.message));
+  await client.connect();
+  return client;
+}
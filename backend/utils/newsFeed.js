@@ -0,0 +1,141 @@
+// Server-side cache in front of NewsAPI for the landing page news section.
+//
+// Entries are fresh for NEWS_CACHE_TTL_MS. After that they are still served
+// while one background refresh runs (stale-while-revalidate). Concurrent
+// misses for the same key share a single upstream call. If the upstream
+// fails, the last good payload keeps being served, and the upstream is left
+// alone for NEWS_UPSTREAM_BACKOFF_MS so a 429 is not answered with more calls.
+
+export const NEWSAPI_URL = process.env.NEWSAPI_URL || 'https://newsapi.org/v2/everything';
+export const NEWS_CACHE_TTL_MS = parseInt(process.env.NEWS_CACHE_TTL_MS || '600000', 10);
+export const NEWS_UPSTREAM_BACKOFF_MS = parseInt(process.env.NEWS_UPSTREAM_BACKOFF_MS || '30000', 10);
+const NEWS_UPSTREAM_TIMEOUT_MS = 5000;
+
+// `q` comes from the client, so the number of cached keys is capped
+const NEWS_CACHE_MAX_ENTRIES = 100;
+const MAX_PAGE_SIZE = 100;
+
+export const DEFAULT_NEWS_QUERY = 'motorcycle OR motorbike OR bike OR superbike OR "two wheeler"';
+export const DEFAULT_NEWS_PAGE_SIZE = 6;
+
+// trusted moto domains (example list — add/remove as you like)
+const TRUSTED_DOMAINS = [
+  'rideapart.com',
+  'motorcyclenews.com',
+  'motorcycle.com',
+  'visordown.com',
+  'asphaltandrubber.com',
+  'bikewale.com',
+  'bikernet.com',
+  'autoexpress.co.uk' // has moto content sometimes
+];
+
+export class NewsUpstreamError extends Error {
+  constructor(status, details) {
+    super('Upstream error');
+    this.status = status;
+    this.details = details;
+  }
+}
+
+const entries = new Map();
+const inFlight = new Map();
+let backoffUntil = 0;
+
+// Returns null for a pageSize that is not a whole number in range
+export function parseNewsParams({ q, pageSize }) {
+  const size = pageSize ? Number(pageSize) : DEFAULT_NEWS_PAGE_SIZE;
+  if (!Number.isInteger(size) || size < 1 || size > MAX_PAGE_SIZE) {
+    return null;
+  }
+  return { q: q || DEFAULT_NEWS_QUERY, pageSize: size };
+}
+
+async function fetchArticles({ q, pageSize }) {
+  const params = new URLSearchParams({
+    q,
+    language: 'en',
+    sortBy: 'publishedAt',
+    pageSize: String(pageSize),
+    // restrict to our trusted domains to keep it moto-only
+    domains: TRUSTED_DOMAINS.join(',')
+  });
+
+  const res = await fetch(`${NEWSAPI_URL}?${params.toString()}`, {
+    headers: { 'X-Api-Key': process.env.NEWSAPI_KEY },
+    cache: 'no-store',
+    signal: AbortSignal.timeout(NEWS_UPSTREAM_TIMEOUT_MS)
+  });
+
+  if (!res.ok) {
+    throw new NewsUpstreamError(res.status, await res.text());
+  }
+
+  const data = await res.json();
+  return (data.articles || []).map((a, i) => ({
+    id: `${a.publishedAt}-${i}`,
+    title: a.title,
+    excerpt: a.description || a.content || '',
+    image: a.urlToImage || null,
+    source: a.source?.name || 'Unknown',
+    date: a.publishedAt,
+    url: a.url,
+    category: 'Moto'
+  }));
+}
+
+function remember(key, entry) {
+  entries.delete(key);
+  entries.set(key, entry);
+  while (entries.size > NEWS_CACHE_MAX_ENTRIES) {
+    entries.delete(entries.keys().next().value);
+  }
+}
+
+// One upstream call per key at a time; every caller gets the same promise
+function refresh(key, params) {
+  if (!inFlight.has(key)) {
+    const request = fetchArticles(params)
+      .then((articles) => {
+        const entry = { articles, fetchedAt: Date.now() };
+        remember(key, entry);
+        return entry;
+      })
+      .catch((error) => {
+        backoffUntil = Date.now() + NEWS_UPSTREAM_BACKOFF_MS;
+        throw error;
+      })
+      .finally(() => {
+        inFlight.delete(key);
+      });
+    inFlight.set(key, request);
+  }
+  return inFlight.get(key);
+}
+
+// Resolves to { articles, status } where status is HIT, STALE or MISS
+export async function getNews(params) {
+  const key = `${params.q}|${params.pageSize}`;
+  const entry = entries.get(key);
+  const now = Date.now();
+
+  if (entry && now - entry.fetchedAt < NEWS_CACHE_TTL_MS) {
+    return { articles: entry.articles, status: 'HIT' };
+  }
+
+  if (entry) {
+    if (now >= backoffUntil) {
+      refresh(key, params).catch((error) => {
+        console.error('News refresh failed, serving cached articles:', error.message);
+      });
+    }
+    return { articles: entry.articles, status: 'STALE' };
+  }
+
+  if (now < backoffUntil && !inFlight.has(key)) {
+    throw new NewsUpstreamError(503, 'News upstream unavailable, retry later');
+  }
+
+  const fetched = await refresh(key, params);
+  return { articles: fetched.articles, status: 'MISS' };
+}
@@ -0,0 +1,92 @@
+// Keyset pagination helpers. A cursor is the (sort key, id) pair of the last
+// item on a page, encoded as base64url JSON so clients can treat it as opaque.
+// Sort keys are ISO date strings; documents missing one get a null key, which
+// MongoDB orders before every string, and are then ordered by id alone.
+
+export const DEFAULT_PAGE_LIMIT = 50;
+export const MAX_PAGE_LIMIT = 100;
+
+export function encodeCursor(key, id) {
+  return Buffer.from(JSON.stringify([key, id])).toString('base64url');
+}
+
+export function decodeCursor(cursor) {
+  try {
+    const decoded = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (!Array.isArray(decoded) || decoded.length !== 2) {
+      return null;
+    }
+    const [key, id] = decoded;
+    if ((typeof key !== 'string' && key !== null) || typeof id !== 'string') {
+      return null;
+    }
+    return { key, id };
+  } catch (error) {
+    return null;
+  }
+}
+
+// Returns { after, limit } or null when the query parameters are malformed
+export function parsePageParams({ after, limit } = {}, { defaultLimit = DEFAULT_PAGE_LIMIT, maxLimit = MAX_PAGE_LIMIT } = {}) {
+  let parsedLimit = defaultLimit;
+  if (limit !== null && limit !== undefined && limit !== '') {
+    parsedLimit = Number(limit);
+    if (!Number.isInteger(parsedLimit) || parsedLimit < 1) {
+      return null;
+    }
+  }
+
+  let cursor = null;
+  if (after) {
+    cursor = decodeCursor(after);
+    if (!cursor) {
+      return null;
+    }
+  }
+
+  return { after: cursor, limit: Math.min(parsedLimit, maxLimit) };
+}
+
+// Builds the filter selecting documents strictly after `cursor` in a
+// (field, id) ordering; `direction` is 1 for ascending, -1 for descending.
+// Null keys sort first ascending and last descending, as MongoDB sorts them.
+export function keysetFilter(field, cursor, direction) {
+  if (!cursor) {
+    return {};
+  }
+  const op = direction === 1 ? '$gt' : '$lt';
+  const sameKey = { [field]: cursor.key, id: { [op]: cursor.id } };
+
+  if (cursor.key === null) {
+    // Ascending, every keyed document is still ahead; descending, none is
+    return { $or: direction === 1 ? [sameKey, { [field]: { $ne: null } }] : [sameKey] };
+  }
+  const branches = [{ [field]: { [op]: cursor.key } }, sameKey];
+  if (direction !== 1) {
+    branches.push({ [field]: null });
+  }
+  return { $or: branches };
+}
+
+// Trims the look-ahead row fetched with `limit + 1` and derives the next cursor
+export function toPage(docs, limit, field) {
+  const hasMore = docs.length > limit;
+  const items = hasMore ? docs.slice(0, limit) : docs;
+  const last = items[items.length - 1];
+  const key = last?.[field] ?? null;
+  if (hasMore && key !== null && typeof key !== 'string') {
+    // The filter compares against the key's BSON type, so a cursor carrying
+    // a re-encoded value would skip or repeat documents; end the listing
+    console.warn(`Pagination stopped: non-string ${field} on ${last.id}`);
+    return { items, nextCursor: null };
+  }
+  return {
+    items,
+    nextCursor: hasMore ? encodeCursor(key, last.id) : null
+  };
+}
+
+// The response body stays a plain array; the next page is advertised in a header
+export function pageHeaders(nextCursor) {
+  return nextCursor ? { 'X-Next-Cursor': nextCursor } : {};
+}
@@ -0,0 +1,144 @@
+import os from 'os';
+import { Worker } from 'worker_threads';
+import { BCRYPT_COST } from '../config/constants.js';
+
+// bcrypt runs on a small pool of worker threads so a burst of signups and
+// logins does not stall every other request on the main event loop. The
+// queue in front of the pool is bounded; past it callers get a
+// PasswordHasherBusyError instead of waiting indefinitely.
+export const PASSWORD_HASH_WORKERS = parseInt(
+  process.env.PASSWORD_HASH_WORKERS || String(Math.max(1, Math.min(4, os.availableParallelism() - 1))),
+  10
+);
+export const PASSWORD_HASH_QUEUE_LIMIT = parseInt(process.env.PASSWORD_HASH_QUEUE_LIMIT || '100', 10);
+
+export const PASSWORD_HASHER_BUSY = 'Server busy, please retry';
+
+export class PasswordHasherBusyError extends Error {
+  constructor() {
+    super(PASSWORD_HASHER_BUSY);
+  }
+}
+
+// Evaluated in each worker. Kept inline rather than as a separate file so the
+// worker does not depend on how the bundler lays out server chunks.
+const WORKER_SOURCE = `
+const { parentPort } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+parentPort.on('message', ({ id, op, password, hash, cost }) => {
+  try {
+    const result = op === 'hash'
+      ? bcrypt.hashSync(password, cost)
+      : bcrypt.compareSync(password, hash);
+    parentPort.postMessage({ id, result });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
+`;
+
+class PasswordWorkerPool {
+  constructor({ size, queueLimit }) {
+    this.size = size;
+    this.queueLimit = queueLimit;
+    this.idle = [];
+    this.workers = new Set();
+    this.queue = [];
+    this.nextId = 0;
+  }
+
+  run(task) {
+    if (this.queue.length >= this.queueLimit) {
+      return Promise.reject(new PasswordHasherBusyError());
+    }
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ ...task, id: this.nextId++, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  dispatch() {
+    while (this.queue.length > 0) {
+      const worker = this.idle.pop() || this.spawn();
+      if (!worker) {
+        return;
+      }
+      const { resolve, reject, ...message } = this.queue.shift();
+      worker.current = { id: message.id, resolve, reject };
+      worker.ref();
+      worker.postMessage(message);
+    }
+  }
+
+  spawn() {
+    if (this.workers.size >= this.size) {
+      return null;
+    }
+
+    const worker = new Worker(WORKER_SOURCE, { eval: true });
+    this.workers.add(worker);
+
+    worker.on('message', ({ id, result, error }) => {
+      const current = worker.current;
+      worker.current = null;
+      // Idle workers must not keep the process alive
+      worker.unref();
+      if (current && current.id === id) {
+        if (error) {
+          current.reject(new Error(error));
+        } else {
+          current.resolve(result);
+        }
+      }
+      this.idle.push(worker);
+      this.dispatch();
+    });
+
+    // A crashed worker fails only its own task; a replacement is spawned
+    // for whatever is still queued
+    const retire = (error) => {
+      if (!this.workers.delete(worker)) {
+        return;
+      }
+      this.idle = this.idle.filter(w => w !== worker);
+      if (worker.current) {
+        worker.current.reject(error || new Error('Password worker exited'));
+        worker.current = null;
+      }
+      this.dispatch();
+    };
+    worker.on('error', retire);
+    worker.on('exit', () => retire());
+
+    return worker;
+  }
+}
+
+let pool = null;
+
+function getPool() {
+  if (!pool) {
+    pool = new PasswordWorkerPool({ size: PASSWORD_HASH_WORKERS, queueLimit: PASSWORD_HASH_QUEUE_LIMIT });
+  }
+  return pool;
+}
+
+export async function hashPassword(password, cost = BCRYPT_COST) {
+  return await getPool().run({ op: 'hash', password, cost });
+}
+
+export async function comparePassword(password, hash) {
+  return await getPool().run({ op: 'compare', password, hash });
+}
+
+// bcrypt hashes record their cost: $2a$<cost>$<salt+digest>
+export function hashCost(hash) {
+  const cost = parseInt(String(hash).split('$')[2], 10);
+  return Number.isNaN(cost) ? 0 : cost;
+}
+
+export function needsRehash(hash) {
+  return hashCost(hash) < BCRYPT_COST;
+}
@@ -0,0 +1,126 @@
+import { AsyncLocalStorage } from 'async_hooks';
+import { getDatabase } from '../config/database.js';
+
+// Batches and memoizes lookups by key. Every load() issued in the same tick
+// is collected into one call of `batchLoad(keys)`, which must resolve to a
+// Map of key -> value; keys missing from it resolve to null. Results are
+// remembered until cleared, so repeated loads cost nothing.
+export class DataLoader {
+  constructor(batchLoad) {
+    this.batchLoad = batchLoad;
+    this.cache = new Map();
+    this.pending = null;
+  }
+
+  load(key) {
+    if (!this.cache.has(key)) {
+      if (!this.pending) {
+        this.pending = new Map();
+        // Let callers that start in the same tick join the batch first
+        Promise.resolve().then(() => process.nextTick(() => this.dispatch()));
+      }
+      let settle;
+      const promise = new Promise((resolve, reject) => {
+        settle = { resolve, reject };
+      });
+      this.pending.set(key, settle);
+      this.cache.set(key, promise);
+    }
+    return this.cache.get(key);
+  }
+
+  async loadMany(keys) {
+    return await Promise.all(keys.map(key => this.load(key)));
+  }
+
+  prime(key, value) {
+    if (!this.cache.has(key)) {
+      this.cache.set(key, Promise.resolve(value));
+    }
+  }
+
+  clear(key) {
+    this.cache.delete(key);
+  }
+
+  async dispatch() {
+    const batch = this.pending;
+    this.pending = null;
+    const keys = [...batch.keys()];
+
+    try {
+      const values = await this.batchLoad(keys);
+      for (const [key, { resolve }] of batch) {
+        resolve(values.has(key) ? values.get(key) : null);
+      }
+    } catch (error) {
+      for (const [key, { reject }] of batch) {
+        // A failed lookup is retried by the next load
+        this.cache.delete(key);
+        reject(error);
+      }
+    }
+  }
+}
+
+// Per-request state: one instance of each model and one loader per
+// collection, shared by everything that runs inside the request
+export class RequestContext {
+  constructor(db) {
+    this.db = db;
+    this.models = new Map();
+    this.loaders = new Map();
+  }
+
+  model(ModelClass) {
+    if (!this.models.has(ModelClass)) {
+      this.models.set(ModelClass, new ModelClass(this.db, this));
+    }
+    return this.models.get(ModelClass);
+  }
+
+  // Documents of `collectionName` by their `id`, fetched with one $in query
+  // per batch
+  loader(collectionName) {
+    if (!this.loaders.has(collectionName)) {
+      const collection = this.db.collection(collectionName);
+      this.loaders.set(collectionName, new DataLoader(async (ids) => {
+        const docs = await collection.find({ id: { $in: ids } }).toArray();
+        return new Map(docs.map(doc => [doc.id, doc]));
+      }));
+    }
+    return this.loaders.get(collectionName);
+  }
+}
+
+const storage = new AsyncLocalStorage();
+
+export function runWithRequestContext(fn) {
+  return storage.run({ context: null, dbCommands: 0 }, fn);
+}
+
+// Fed by the driver's command monitoring, so a request can report how many
+// round trips to MongoDB it made
+export function countDatabaseCommand() {
+  const store = storage.getStore();
+  if (store) {
+    store.dbCommands += 1;
+  }
+}
+
+export function getDatabaseCommandCount() {
+  return storage.getStore()?.dbCommands ?? 0;
+}
+
+// The current request's context. Outside a request (scripts, background
+// jobs) every call gets a fresh, unshared one.
+export async function getRequestContext() {
+  const store = storage.getStore();
+  if (!store) {
+    return new RequestContext(await getDatabase());
+  }
+  if (!store.context) {
+    store.context = getDatabase().then(db => new RequestContext(db));
+  }
+  return await store.context;
+}
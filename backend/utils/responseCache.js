@@ -0,0 +1,129 @@
+import crypto from 'crypto';
+import { getDatabase } from '../config/database.js';
+
+// Short-lived cache for public GET responses. Each entry is tagged with a
+// watermark of the collections it was built from (newest updatedAt plus the
+// document count, so deletes move it too). Within the TTL an entry is served
+// without touching MongoDB; after it, one cheap watermark read decides
+// whether the body has to be rebuilt. ETags are derived from the watermark,
+// so a matching If-None-Match gets a 304 without the body being computed.
+
+export const RESPONSE_CACHE_TTL_MS = parseInt(process.env.RESPONSE_CACHE_TTL_MS || '5000', 10);
+const RESPONSE_CACHE_MAX_ENTRIES = 500;
+
+// Response headers worth replaying from a cached entry
+const CACHED_HEADERS = ['content-type', 'x-next-cursor'];
+
+const entries = new Map();
+const watermarks = new Map();
+
+async function collectionWatermark(db, name) {
+  const collection = db.collection(name);
+  const [latest, count] = await Promise.all([
+    collection.find({}).project({ _id: 0, updatedAt: 1 }).sort({ updatedAt: -1 }).limit(1).toArray(),
+    collection.estimatedDocumentCount()
+  ]);
+  return `${name}:${latest[0]?.updatedAt || ''}:${count}`;
+}
+
+async function getWatermark(collections) {
+  const key = collections.join(',');
+  const cached = watermarks.get(key);
+  if (cached && cached.expiresAt > Date.now()) {
+    return cached.value;
+  }
+
+  const db = await getDatabase();
+  const parts = await Promise.all(collections.map(name => collectionWatermark(db, name)));
+  const value = parts.join('|');
+  watermarks.set(key, { value, expiresAt: Date.now() + RESPONSE_CACHE_TTL_MS });
+  return value;
+}
+
+function cacheKey(request, viewerId) {
+  const url = request.nextUrl;
+  const params = [...url.searchParams.entries()].sort(([a], [b]) => a.localeCompare(b));
+  return `${url.pathname}?${new URLSearchParams(params)}#${viewerId || ''}`;
+}
+
+function remember(key, entry) {
+  entries.delete(key);
+  entries.set(key, entry);
+  while (entries.size > RESPONSE_CACHE_MAX_ENTRIES) {
+    entries.delete(entries.keys().next().value);
+  }
+}
+
+function matchesETag(request, etag) {
+  const header = request.headers.get('if-none-match');
+  if (!header) {
+    return false;
+  }
+  return header.trim() === '*' || header.split(',').some(tag => tag.trim() === etag);
+}
+
+// `collections` lists everything the response body is built from;
+// `viewerId` separates responses that differ per signed-in user
+export async function cachedResponse(request, { collections, viewerId = null }, compute) {
+  const key = cacheKey(request, viewerId);
+  const now = Date.now();
+  let entry = entries.get(key);
+
+  if (!entry || entry.expiresAt <= now) {
+    const watermark = await getWatermark(collections);
+
+    if (!entry || entry.watermark !== watermark) {
+      const response = await compute();
+      if (response.status !== 200) {
+        return response;
+      }
+
+      const headers = {};
+      for (const name of CACHED_HEADERS) {
+        const value = response.headers.get(name);
+        if (value) {
+          headers[name] = value;
+        }
+      }
+
+      const etag = `"${crypto.createHash('sha1').update(`${key}|${watermark}`).digest('hex')}"`;
+      entry = { body: await response.text(), headers, etag, watermark, collections };
+    }
+
+    entry.expiresAt = now + RESPONSE_CACHE_TTL_MS;
+    remember(key, entry);
+  }
+
+  const headers = {
+    'ETag': entry.etag,
+    // Clients may keep the body but must revalidate before reusing it
+    'Cache-Control': 'no-cache',
+    'Vary': 'Authorization'
+  };
+
+  if (matchesETag(request, entry.etag)) {
+    return new Response(null, { status: 304, headers });
+  }
+
+  return new Response(entry.body, { status: 200, headers: { ...entry.headers, ...headers } });
+}
+
+// Called after a successful write handled by this process, with the
+// collections it touched, so its own clients never see a stale listing;
+// other instances catch up within the TTL. Only entries built from those
+// collections are revalidated.
+export function invalidateResponseCache(collections) {
+  const touched = new Set(collections);
+  const isAffected = names => names.some(name => touched.has(name));
+
+  for (const key of watermarks.keys()) {
+    if (isAffected(key.split(','))) {
+      watermarks.delete(key);
+    }
+  }
+  for (const entry of entries.values()) {
+    if (isAffected(entry.collections)) {
+      entry.expiresAt = 0;
+    }
+  }
+}
@@ -0,0 +1,96 @@
+import { MemoryCache, RedisCache, createRedisClient } from './cache.js';
+
+// The {id, name, role, profileImage} snippet embedded on stories, events and
+// admin listings. Email is cached too for the admin views and stripped for
+// public responses by the callers.
+export const USER_SNIPPET_CACHE_TTL_MS = parseInt(process.env.USER_SNIPPET_CACHE_TTL_MS || '60000', 10);
+export const USER_SNIPPET_CACHE_MAX_ENTRIES = parseInt(process.env.USER_SNIPPET_CACHE_MAX_ENTRIES || '10000', 10);
+
+export class UserSnippetCache {
+  constructor(backend) {
+    this.backend = backend;
+    this.hits = 0;
+    this.misses = 0;
+    this.invalidations = 0;
+    this.errors = 0;
+  }
+
+  // Returns a Map of id -> snippet, calling `loadMissing(ids)` (which must
+  // also return a Map) once for whatever was not cached
+  async getMany(ids, loadMissing) {
+    let cached = new Map();
+    try {
+      cached = await this.backend.getMany(ids);
+    } catch (error) {
+      // A cache outage degrades to direct reads rather than failing requests
+      this.errors += 1;
+      console.error('User snippet cache read error:', error.message);
+    }
+
+    const missing = ids.filter(id => !cached.has(id));
+    this.hits += ids.length - missing.length;
+    this.misses += missing.length;
+
+    if (missing.length === 0) {
+      return cached;
+    }
+
+    const loaded = await loadMissing(missing);
+    try {
+      await this.backend.setMany([...loaded.entries()]);
+    } catch (error) {
+      this.errors += 1;
+      console.error('User snippet cache write error:', error.message);
+    }
+
+    return new Map([...cached, ...loaded]);
+  }
+
+  async invalidate(id) {
+    this.invalidations += 1;
+    try {
+      await this.backend.delete(id);
+    } catch (error) {
+      this.errors += 1;
+      console.error('User snippet cache invalidation error:', error.message);
+    }
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      backend: this.backend.constructor.name,
+      size: this.backend.size,
+      hits: this.hits,
+      misses: this.misses,
+      hitRate: lookups > 0 ? this.hits / lookups : 0,
+      invalidations: this.invalidations,
+      errors: this.errors
+    };
+  }
+}
+
+let userSnippetCache = null;
+
+export function getUserSnippetCache() {
+  if (!userSnippetCache) {
+    const options = { ttlMs: USER_SNIPPET_CACHE_TTL_MS, maxEntries: USER_SNIPPET_CACHE_MAX_ENTRIES };
+    if (process.env.REDIS_URL) {
+      // Connect lazily; the first calls use memory until Redis is ready
+      userSnippetCache = new UserSnippetCache(new MemoryCache(options));
+      createRedisClient(process.env.REDIS_URL)
+        .then(client => {
+          userSnippetCache.backend = new RedisCache(client, { ...options, prefix: 'user-snippet:' });
+        })
+        .catch(error => console.error('User snippet cache falling back to memory:', error.message));
+    } else {
+      userSnippetCache = new UserSnippetCache(new MemoryCache(options));
+    }
+  }
+  return userSnippetCache;
+}
+
+// Lets tests swap in a cache backed by a Redis stand-in
+export function setUserSnippetCache(cache) {
+  userSnippetCache = cache;
+}
@@ -20,7 +20,7 @@ type AuthContextType = {
     loading: boolean;
     login: (token: string, userData: User) => void;
     logout: () => void;
-    updateUser: (userData: User) => void;
+    updateUser: (userData: User, refreshedToken?: string | null) => void;
     showAuthDialog: boolean;
     setShowAuthDialog: (show: boolean) => void;
     authMode: string;
@@ -54,6 +54,7 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
             });
             if (res.ok) {
                 const data = await res.json();
+                storeRefreshedToken(res.headers.get('X-Refreshed-Token'));
                 setUser(data);
             } else {
                 localStorage.removeItem('token');
@@ -66,6 +67,14 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
         }
     };
 
+    // The server re-issues the token when the profile copy it carries is outdated
+    const storeRefreshedToken = (refreshedToken?: string | null) => {
+        if (refreshedToken) {
+            localStorage.setItem('token', refreshedToken);
+            setToken(refreshedToken);
+        }
+    };
+
     const login = (newToken: string, userData: User) => {
         localStorage.setItem('token', newToken);
         setToken(newToken);
@@ -87,7 +96,8 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
         });
     };
 
-    const updateUser = (userData: User) => {
+    const updateUser = (userData: User, refreshedToken?: string | null) => {
+        storeRefreshedToken(refreshedToken);
         setUser(userData);
     };
 
@@ -0,0 +1,12 @@
+// Runs once when the Next.js server starts
+export async function register() {
+  if (process.env.NEXT_RUNTIME !== 'nodejs') {
+    return;
+  }
+
+  const { warmUpDatabase } = await import('./backend/config/database.js');
+  // Requests still connect on demand if the warm-up fails
+  warmUpDatabase().catch((error: any) => {
+    console.error('MongoDB warm-up failed:', error.message);
+  });
+}
@@ -4,3 +4,33 @@ import { twMerge } from "tailwind-merge";
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs));
 }
+
+// List endpoints return one page per request and advertise the next one in
+// X-Next-Cursor; views load a page at a time and pass `nextCursor` back as
+// `after` when the user asks for more.
+export const PAGE_SIZE = 24;
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+export async function fetchPage<T = any>(
+  url: string,
+  { after = null, limit = PAGE_SIZE, init }: { after?: string | null; limit?: number; init?: RequestInit } = {}
+): Promise<Page<T>> {
+  const pageUrl = new URL(url, window.location.origin);
+  pageUrl.searchParams.set("limit", String(limit));
+  if (after) {
+    pageUrl.searchParams.set("after", after);
+  }
+  const res = await fetch(pageUrl, init);
+  if (!res.ok) {
+    throw new Error(`GET ${url} failed with status ${res.status}`);
+  }
+  const page = await res.json();
+  return {
+    items: Array.isArray(page) ? page : [],
+    nextCursor: res.headers.get("X-Next-Cursor")
+  };
+}
@@ -1,6 +1,11 @@
 /** @type {import('next').NextConfig} */
 const nextConfig = {
   output: 'standalone',
+  // bcryptjs is only required from inside the password worker threads, which
+  // the standalone tracer cannot see
+  outputFileTracingIncludes: {
+    '/api/**': ['./node_modules/bcryptjs/**'],
+  },
   images: {
     unoptimized: true,
   },
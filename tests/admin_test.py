@@ -4,14 +4,27 @@ Moto Saga Admin Readiness Test Suite
 Focus: Critical admin flows as requested in the review
 """
 
-import requests
 import json
+import os
 import uuid
-import time
 from datetime import datetime, timedelta
 
-# Configuration
-BASE_URL = "https://saga-riders.preview.emergentagent.com/api"
+try:
+    from http_client import format_timings, session, take_timings
+    from local_target import target_base_url
+    from runner import TestNode, parse_runner_args, run_suite
+except ImportError:  # imported as tests.admin_test
+    from tests.http_client import format_timings, session, take_timings
+    from tests.local_target import target_base_url
+    from tests.runner import TestNode, parse_runner_args, run_suite
+
+# Configuration; --local replaces BASE_URL with a throwaway local server
+BASE_URL = os.environ.get("BASE_URL", "https://saga-riders.preview.emergentagent.com/api")
+# Written at the repo root, which .gitignore covers, so runs leave the tree clean
+RESULTS_PATH = os.environ.get(
+    "ADMIN_TEST_RESULTS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "admin_test_results.json")
+)
 HEADERS = {"Content-Type": "application/json"}
 
 class AdminReadinessTest:
@@ -28,18 +41,24 @@ class AdminReadinessTest:
         self.test_id = uuid.uuid4().hex[:8]
         
     def log_result(self, test_name, success, message, details=None):
-        """Log test results"""
+        """Log test results with the client and server time of their requests"""
+        count, client_time, server_time = take_timings()
         result = {
             "test": test_name,
             "success": success,
             "message": message,
             "details": details,
+            "requests": count,
+            "client_time_ms": round(client_time * 1000, 1),
+            "server_time_ms": round(server_time * 1000, 1) if server_time is not None else None,
             "timestamp": datetime.now().isoformat()
         }
         self.results.append(result)
         status = "✅ PASS" if success else "❌ FAIL"
         print(f"{status}: {test_name}")
         print(f"   {message}")
+        if count:
+            print(f"   ⏱️  {format_timings(count, client_time, server_time)}")
         if details:
             print(f"   Details: {details}")
         print()
@@ -56,7 +75,7 @@ class AdminReadinessTest:
                 "bio": "Platform Administrator"
             }
             
-            response = requests.post(f"{BASE_URL}/auth/signup", 
+            response = session.post(f"{BASE_URL}/auth/signup", 
                                    json=admin_data, headers=HEADERS)
             
             if response.status_code == 200:
@@ -97,7 +116,7 @@ class AdminReadinessTest:
                 "bio": "Motorcycle enthusiast"
             }
             
-            response = requests.post(f"{BASE_URL}/auth/signup", 
+            response = session.post(f"{BASE_URL}/auth/signup", 
                                    json=rider_data, headers=HEADERS)
             
             if response.status_code == 200:
@@ -141,7 +160,7 @@ class AdminReadinessTest:
             }
             
             auth_headers = {**HEADERS, "Authorization": f"Bearer {self.admin_token}"}
-            response = requests.post(f"{BASE_URL}/events", 
+            response = session.post(f"{BASE_URL}/events", 
                                    json=event_data, headers=auth_headers)
             
             if response.status_code == 200:
@@ -190,7 +209,7 @@ class AdminReadinessTest:
             }
             
             auth_headers = {**HEADERS, "Authorization": f"Bearer {self.rider_token}"}
-            response = requests.post(f"{BASE_URL}/events", 
+            response = session.post(f"{BASE_URL}/events", 
                                    json=event_data, headers=auth_headers)
             
             if response.status_code == 403:
@@ -226,11 +245,11 @@ class AdminReadinessTest:
                 "title": "My Royal Enfield Adventure",
                 "content": "Just completed an amazing ride through the Western Ghats!",
                 "location": "Western Ghats, Maharashtra",
-                "mediaUrls": ["data:image/jpeg;base64,/9j/4AAQSkZJRgABAQAAAQABAAD//gA7Q1JFQVR"]
+                "mediaUrls": ["https://example.com/western-ghats.jpg"]
             }
             
             auth_headers = {**HEADERS, "Authorization": f"Bearer {self.rider_token}"}
-            response = requests.post(f"{BASE_URL}/stories", 
+            response = session.post(f"{BASE_URL}/stories", 
                                    json=story_data, headers=auth_headers)
             
             if response.status_code == 200:
@@ -264,7 +283,7 @@ class AdminReadinessTest:
             
         try:
             auth_headers = {**HEADERS, "Authorization": f"Bearer {self.admin_token}"}
-            response = requests.delete(f"{BASE_URL}/stories/{self.test_story_id}", 
+            response = session.delete(f"{BASE_URL}/stories/{self.test_story_id}", 
                                      headers=auth_headers)
             
             if response.status_code == 200:
@@ -297,7 +316,7 @@ class AdminReadinessTest:
             
         try:
             auth_headers = {**HEADERS, "Authorization": f"Bearer {self.admin_token}"}
-            response = requests.delete(f"{BASE_URL}/events/{self.test_event_id}", 
+            response = session.delete(f"{BASE_URL}/events/{self.test_event_id}", 
                                      headers=auth_headers)
             
             if response.status_code == 200:
@@ -330,7 +349,7 @@ class AdminReadinessTest:
             
         try:
             auth_headers = {**HEADERS, "Authorization": f"Bearer {self.admin_token}"}
-            response = requests.get(f"{BASE_URL}/admin/stats", headers=auth_headers)
+            response = session.get(f"{BASE_URL}/admin/stats", headers=auth_headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -357,6 +376,61 @@ class AdminReadinessTest:
             self.log_result("Admin Stats", False, f"Exception: {str(e)}")
             return False
     
+    def test_admin_users_pagination(self):
+        """Test GET /api/admin/users walks pages by X-Next-Cursor without overlap"""
+        print("📄 Testing Admin Users Pagination...")
+        if not self.admin_token:
+            self.log_result("Admin Users Pagination", False, "No admin token available")
+            return False
+            
+        try:
+            auth_headers = {**HEADERS, "Authorization": f"Bearer {self.admin_token}"}
+            first = session.get(f"{BASE_URL}/admin/users", params={"limit": 1}, headers=auth_headers)
+            cursor = first.headers.get("X-Next-Cursor")
+            if first.status_code != 200 or not cursor:
+                self.log_result("Admin Users Pagination", False,
+                              f"First page: status {first.status_code}, X-Next-Cursor {cursor!r}",
+                              first.text)
+                return False
+            
+            second = session.get(f"{BASE_URL}/admin/users", params={"limit": 1, "after": cursor}, headers=auth_headers)
+            # Users created meanwhile sort before the cursor, so the same
+            # cursor must keep returning the same page
+            again = session.get(f"{BASE_URL}/admin/users", params={"limit": 1, "after": cursor}, headers=auth_headers)
+            if second.status_code != 200 or again.status_code != 200:
+                self.log_result("Admin Users Pagination", False,
+                              f"Second page: status {second.status_code} then {again.status_code}")
+                return False
+            
+            first_page, second_page = first.json(), second.json()
+            first_ids = {user["id"] for user in first_page}
+            second_ids = [user["id"] for user in second_page]
+            if len(first_page) != 1 or len(second_page) != 1:
+                self.log_result("Admin Users Pagination", False,
+                              f"Expected one user per page, got {len(first_page)} and {len(second_page)}")
+                return False
+            if first_ids & set(second_ids):
+                self.log_result("Admin Users Pagination", False, f"Pages overlap on {first_ids & set(second_ids)}")
+                return False
+            if [user["id"] for user in again.json()] != second_ids:
+                self.log_result("Admin Users Pagination", False, "Same cursor returned a different page")
+                return False
+            # Newest first, ties broken by id
+            last, following = first_page[-1], second_page[0]
+            if (following["createdAt"], following["id"]) >= (last["createdAt"], last["id"]):
+                self.log_result("Admin Users Pagination", False,
+                              "Second page is not ordered after the first",
+                              f"{last['createdAt']}/{last['id']} then {following['createdAt']}/{following['id']}")
+                return False
+            
+            self.log_result("Admin Users Pagination", True,
+                          "Two pages walked by cursor, disjoint and in (createdAt, id) order")
+            return True
+                
+        except Exception as e:
+            self.log_result("Admin Users Pagination", False, f"Exception: {str(e)}")
+            return False
+    
     def test_rider_stats_forbidden(self):
         """Test 9: Test GET /api/admin/stats as rider (should fail)"""
         print("🚫 Testing Rider Access to Admin Stats (Should Fail)...")
@@ -366,7 +440,7 @@ class AdminReadinessTest:
             
         try:
             auth_headers = {**HEADERS, "Authorization": f"Bearer {self.rider_token}"}
-            response = requests.get(f"{BASE_URL}/admin/stats", headers=auth_headers)
+            response = session.get(f"{BASE_URL}/admin/stats", headers=auth_headers)
             
             if response.status_code == 401:
                 self.log_result("Rider Stats (Should Fail)", True, 
@@ -401,7 +475,7 @@ class AdminReadinessTest:
             }
             
             admin_headers = {**HEADERS, "Authorization": f"Bearer {self.admin_token}"}
-            event_response = requests.post(f"{BASE_URL}/events", 
+            event_response = session.post(f"{BASE_URL}/events", 
                                          json=event_data, headers=admin_headers)
             
             if event_response.status_code != 200:
@@ -412,20 +486,20 @@ class AdminReadinessTest:
             
             # Test RSVP as rider
             rider_headers = {**HEADERS, "Authorization": f"Bearer {self.rider_token}"}
-            rsvp_response = requests.post(f"{BASE_URL}/events/{event_id}/rsvp", 
+            rsvp_response = session.post(f"{BASE_URL}/events/{event_id}/rsvp", 
                                         headers=rider_headers)
             
             if rsvp_response.status_code == 200:
                 data = rsvp_response.json()
-                if self.rider_user_id in data.get("rsvps", []):
+                if data.get("attending") is True:
                     self.log_result("RSVP Functionality", True, 
                                   "RSVP functionality working correctly",
                                   f"User {self.rider_user_id} successfully RSVPed to event {event_id}")
                     return True
                 else:
                     self.log_result("RSVP Functionality", False, 
-                                  "RSVP response successful but user not in RSVP list",
-                                  f"RSVPs: {data.get('rsvps', [])}")
+                                  "RSVP response successful but user not marked as attending",
+                                  f"Response: {data}")
                     return False
             else:
                 self.log_result("RSVP Functionality", False, 
@@ -453,7 +527,7 @@ class AdminReadinessTest:
             }
             
             rider_headers = {**HEADERS, "Authorization": f"Bearer {self.rider_token}"}
-            story_response = requests.post(f"{BASE_URL}/stories", 
+            story_response = session.post(f"{BASE_URL}/stories", 
                                          json=story_data, headers=rider_headers)
             
             if story_response.status_code != 200:
@@ -463,20 +537,20 @@ class AdminReadinessTest:
             story_id = story_response.json().get("id")
             
             # Test like functionality
-            like_response = requests.post(f"{BASE_URL}/stories/{story_id}/like", 
+            like_response = session.post(f"{BASE_URL}/stories/{story_id}/like", 
                                         headers=rider_headers)
             
             if like_response.status_code == 200:
                 data = like_response.json()
-                if self.rider_user_id in data.get("likes", []):
+                if data.get("liked") is True:
                     self.log_result("Like Functionality", True, 
                                   "Like functionality working correctly",
                                   f"User {self.rider_user_id} successfully liked story {story_id}")
                     return True
                 else:
                     self.log_result("Like Functionality", False, 
-                                  "Like response successful but user not in likes list",
-                                  f"Likes: {data.get('likes', [])}")
+                                  "Like response successful but story not marked as liked",
+                                  f"Response: {data}")
                     return False
             else:
                 self.log_result("Like Functionality", False, 
@@ -488,8 +562,31 @@ class AdminReadinessTest:
             self.log_result("Like Functionality", False, f"Exception: {str(e)}")
             return False
     
-    def run_admin_readiness_tests(self):
-        """Run all admin readiness tests in sequence"""
+    def build_test_graph(self):
+        """Declares which tests create the tokens, story and event the others use"""
+        def node(name, func, requires=(), provides=()):
+            return TestNode(name, func, "admin", tuple(requires), tuple(provides), critical="CRITICAL" in name)
+        
+        return [
+            node("Admin Authentication", self.test_admin_signup, provides=["admin"]),
+            node("Rider Authentication", self.test_rider_signup, provides=["rider"]),
+            node("CRITICAL: Admin Event Creation", self.test_admin_event_creation,
+                 requires=["admin"], provides=["event"]),
+            node("CRITICAL: Rider Event Creation Block", self.test_rider_event_creation_forbidden, requires=["rider"]),
+            node("Story Creation Setup", self.test_story_creation, requires=["rider"], provides=["story"]),
+            node("CRITICAL: Admin Delete Story", self.test_admin_delete_story, requires=["admin", "story"]),
+            node("CRITICAL: Admin Delete Event", self.test_admin_delete_event, requires=["admin", "event"]),
+            node("CRITICAL: Admin Stats Access", self.test_admin_stats, requires=["admin"]),
+            # Both signups have to exist for there to be a second page
+            node("Admin Users Pagination", self.test_admin_users_pagination, requires=["admin", "rider"]),
+            node("Rider Stats Block", self.test_rider_stats_forbidden, requires=["rider"]),
+            node("RSVP Functionality", self.test_rsvp_functionality, requires=["admin", "rider"]),
+            node("Like Functionality", self.test_like_functionality, requires=["rider"])
+        ]
+    
+    def run_admin_readiness_tests(self, args=None):
+        """Run all admin readiness tests, independent ones concurrently"""
+        args = args or parse_runner_args([])
         print("🏍️  MOTO SAGA ADMIN READINESS TEST SUITE")
         print("=" * 80)
         print(f"🎯 Focus: Critical admin flows for platform readiness")
@@ -497,41 +594,14 @@ class AdminReadinessTest:
         print(f"🕒 Test ID: {self.test_id}")
         print("=" * 80)
         
-        # Test sequence for admin readiness
-        tests = [
-            ("Admin Authentication", self.test_admin_signup),
-            ("Rider Authentication", self.test_rider_signup),
-            ("CRITICAL: Admin Event Creation", self.test_admin_event_creation),
-            ("CRITICAL: Rider Event Creation Block", self.test_rider_event_creation_forbidden),
-            ("Story Creation Setup", self.test_story_creation),
-            ("CRITICAL: Admin Delete Story", self.test_admin_delete_story),
-            ("CRITICAL: Admin Delete Event", self.test_admin_delete_event),
-            ("CRITICAL: Admin Stats Access", self.test_admin_stats),
-            ("Rider Stats Block", self.test_rider_stats_forbidden),
-            ("RSVP Functionality", self.test_rsvp_functionality),
-            ("Like Functionality", self.test_like_functionality)
-        ]
+        run_results, wall_time = run_suite("admin_readiness", self.build_test_graph(), args)
         
-        passed = 0
-        failed = 0
-        critical_failures = []
-        
-        for test_name, test_func in tests:
-            print(f"🧪 Running: {test_name}")
-            try:
-                if test_func():
-                    passed += 1
-                else:
-                    failed += 1
-                    if "CRITICAL" in test_name:
-                        critical_failures.append(test_name)
-            except Exception as e:
-                print(f"❌ CRITICAL ERROR in {test_name}: {str(e)}")
-                failed += 1
-                critical_failures.append(test_name)
-            
-            # Small delay between tests
-            time.sleep(0.5)
+        passed = sum(1 for result in run_results if result.status == "passed")
+        failed = len(run_results) - passed
+        critical_failures = [
+            result.name for result in run_results
+            if (result.critical and result.status != "passed") or result.status == "error"
+        ]
         
         print("\n" + "=" * 80)
         print(f"🏍️  ADMIN READINESS TEST RESULTS")
@@ -539,6 +609,7 @@ class AdminReadinessTest:
         print(f"✅ Passed: {passed}")
         print(f"❌ Failed: {failed}")
         print(f"📊 Success Rate: {(passed/(passed+failed)*100):.1f}%")
+        print(f"⏱️  Wall Time: {wall_time:.2f}s")
         
         # Critical issues summary
         if critical_failures:
@@ -553,11 +624,13 @@ class AdminReadinessTest:
         return passed, failed, self.results, critical_failures
 
 if __name__ == "__main__":
-    tester = AdminReadinessTest()
-    passed, failed, results, critical_failures = tester.run_admin_readiness_tests()
+    args = parse_runner_args()
+    with target_base_url(args.local, BASE_URL) as BASE_URL:
+        tester = AdminReadinessTest()
+        passed, failed, results, critical_failures = tester.run_admin_readiness_tests(args)
     
     # Save detailed results
-    with open("/app/admin_test_results.json", "w") as f:
+    with open(RESULTS_PATH, "w") as f:
         json.dump({
             "summary": {
                 "passed": passed,
@@ -568,4 +641,4 @@ if __name__ == "__main__":
             "detailed_results": results
         }, f, indent=2)
     
-    print(f"\n📄 Detailed results saved to: /app/admin_test_results.json")
\ No newline at end of file
+    print(f"\n📄 Detailed results saved to: {RESULTS_PATH}")
\ No newline at end of file
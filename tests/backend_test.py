@@ -4,14 +4,35 @@ Moto Saga Backend API Test Suite
 Tests all backend endpoints for the motorcycle community platform
 """
 
-import requests
 import json
 import base64
 import io
+import os
+import re
+import uuid
 from datetime import datetime, timedelta
 
-# Base URL from environment
-BASE_URL = "https://saga-riders.preview.emergentagent.com/api"
+try:
+    from http_client import format_timings, session, take_timings
+    from local_target import target_base_url
+    from runner import TestNode, parse_runner_args, run_suite, summarize
+except ImportError:  # imported as tests.backend_test
+    from tests.http_client import format_timings, session, take_timings
+    from tests.local_target import target_base_url
+    from tests.runner import TestNode, parse_runner_args, run_suite, summarize
+
+# Base URL from environment; --local replaces it with a throwaway local server
+BASE_URL = os.environ.get("BASE_URL", "https://saga-riders.preview.emergentagent.com/api")
+
+# GET /api/stories populates authors, media and comments with batched
+# queries, so the MongoDB commands it issues (reported in Server-Timing) must
+# not grow with the page size. The slack allows for one extra author batch
+# when a larger page reaches authors the snippet cache has not seen yet.
+FEED_PAGE_SIZES = (1, 100)
+FEED_MAX_EXTRA_DB_COMMANDS = 1
+
+# Uploads are content-addressed: /api/media/<sha256>.<ext>
+MEDIA_URL_PATTERN = re.compile(r'/api/media/[a-f0-9]{64}\.[a-z0-9]+$')
 
 # Test data storage
 test_data = {
@@ -29,12 +50,16 @@ def print_test_header(test_name):
     print(f"{'='*80}")
 
 def print_result(success, message):
-    """Print test result"""
+    """Print test result with the client and server time of its requests"""
     status = "✅ PASS" if success else "❌ FAIL"
     print(f"{status}: {message}")
+    count, client_time, server_time = take_timings()
+    if count:
+        print(f"   ⏱️  {format_timings(count, client_time, server_time)}")
 
 def print_error(error_msg):
     """Print error message"""
+    take_timings()
     print(f"❌ ERROR: {error_msg}")
 
 # ============================================================================
@@ -59,7 +84,7 @@ def test_signup_rider():
             }
         }
         
-        response = requests.post(f"{BASE_URL}/auth/signup", json=payload)
+        response = session.post(f"{BASE_URL}/auth/signup", json=payload)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -99,7 +124,7 @@ def test_signup_club():
             }
         }
         
-        response = requests.post(f"{BASE_URL}/auth/signup", json=payload)
+        response = session.post(f"{BASE_URL}/auth/signup", json=payload)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -134,7 +159,7 @@ def test_signup_creator():
             "bio": "Motorcycle content creator and vlogger"
         }
         
-        response = requests.post(f"{BASE_URL}/auth/signup", json=payload)
+        response = session.post(f"{BASE_URL}/auth/signup", json=payload)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -167,7 +192,7 @@ def test_signup_admin():
             "bio": "Platform administrator"
         }
         
-        response = requests.post(f"{BASE_URL}/auth/signup", json=payload)
+        response = session.post(f"{BASE_URL}/auth/signup", json=payload)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -197,7 +222,7 @@ def test_login():
             "password": "RiderPass123!"
         }
         
-        response = requests.post(f"{BASE_URL}/auth/login", json=payload)
+        response = session.post(f"{BASE_URL}/auth/login", json=payload)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -226,7 +251,7 @@ def test_login_invalid():
             "password": "WrongPassword"
         }
         
-        response = requests.post(f"{BASE_URL}/auth/login", json=payload)
+        response = session.post(f"{BASE_URL}/auth/login", json=payload)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 401:
@@ -248,7 +273,7 @@ def test_get_current_user():
             "Authorization": f"Bearer {test_data['tokens']['rider1']}"
         }
         
-        response = requests.get(f"{BASE_URL}/auth/me", headers=headers)
+        response = session.get(f"{BASE_URL}/auth/me", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -273,7 +298,7 @@ def test_auth_unauthorized():
     print_test_header("Unauthorized Access Test")
     
     try:
-        response = requests.get(f"{BASE_URL}/auth/me")
+        response = session.get(f"{BASE_URL}/auth/me")
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 401:
@@ -292,7 +317,7 @@ def test_auth_unauthorized():
 
 def test_upload_file():
     """Test file upload to /api/upload"""
-    print_test_header("File Upload - Image to Base64")
+    print_test_header("File Upload - Content-Addressed Media URL")
     
     try:
         # Create a small test image (1x1 pixel PNG)
@@ -308,19 +333,27 @@ def test_upload_file():
             "Authorization": f"Bearer {test_data['tokens']['rider1']}"
         }
         
-        response = requests.post(f"{BASE_URL}/upload", files=files, headers=headers)
+        response = session.post(f"{BASE_URL}/upload", files=files, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
-            if 'url' in data and data['url'].startswith('data:'):
-                test_data['uploaded_image_url'] = data['url']
-                print_result(True, "File uploaded successfully")
-                print(f"   Data URL length: {len(data['url'])} chars")
-                return True
-            else:
-                print_result(False, "Response missing url or invalid format")
+            url = data.get('url', '')
+            if url.startswith('data:') or not MEDIA_URL_PATTERN.search(url):
+                print_result(False, f"Expected a content-addressed media URL, got: {url[:80]}")
+                return False
+            
+            # The URL must serve back exactly the uploaded bytes
+            media_url = url if url.startswith('http') else BASE_URL[:-len('/api')] + url
+            media_response = session.get(media_url)
+            if media_response.status_code != 200 or media_response.content != test_image_data:
+                print_result(False, f"Uploaded media not served back intact (status {media_response.status_code})")
                 return False
+            
+            test_data['uploaded_image_url'] = url
+            print_result(True, "File uploaded successfully")
+            print(f"   Media URL: {url}")
+            return True
         else:
             print_result(False, f"Upload failed: {response.text}")
             return False
@@ -338,8 +371,8 @@ def test_create_story_with_media():
             "content": "Just completed an amazing 10-day journey through the Himalayas. The roads were challenging but the views were absolutely breathtaking! Met some incredible fellow riders along the way.",
             "location": "Leh, Ladakh",
             "mediaUrls": [
-                test_data.get('uploaded_image_url', 'data:image/png;base64,test'),
-                "data:image/jpeg;base64,/9j/4AAQSkZJRg=="
+                test_data.get('uploaded_image_url', 'https://example.com/leh-ladakh.jpg'),
+                "https://example.com/khardung-la.jpg"
             ]
         }
         
@@ -348,11 +381,17 @@ def test_create_story_with_media():
             "Content-Type": "application/json"
         }
         
-        response = requests.post(f"{BASE_URL}/stories", json=payload, headers=headers)
+        response = session.post(f"{BASE_URL}/stories", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
+            if any(url.startswith('data:') for url in data.get('mediaUrls', [])):
+                print_result(False, "Story stored inline data: URLs instead of media references")
+                return False
+            if len(data.get('media', [])) != len(data.get('mediaUrls', [])):
+                print_result(False, "Story is missing srcset metadata for its media")
+                return False
             if 'id' in data and 'user' in data:
                 test_data['stories'].append(data)
                 print_result(True, f"Story created - ID: {data['id']}")
@@ -387,7 +426,7 @@ def test_create_story_simple():
             "Content-Type": "application/json"
         }
         
-        response = requests.post(f"{BASE_URL}/stories", json=payload, headers=headers)
+        response = session.post(f"{BASE_URL}/stories", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -407,19 +446,20 @@ def test_list_all_stories():
     print_test_header("List All Stories")
     
     try:
-        response = requests.get(f"{BASE_URL}/stories")
+        response = session.get(f"{BASE_URL}/stories")
+        elapsed = response.elapsed.total_seconds()
         print(f"Status Code: {response.status_code}")
+        print(f"Response Time: {elapsed:.3f}s")
         
         if response.status_code == 200:
             data = response.json()
-            if isinstance(data, list):
-                print_result(True, f"Retrieved {len(data)} stories")
-                for i, story in enumerate(data[:3], 1):
-                    print(f"   Story {i}: {story['title']} by {story.get('user', {}).get('name', 'Unknown')}")
-                return True
-            else:
+            if not isinstance(data, list):
                 print_result(False, "Response is not a list")
                 return False
+            print_result(True, f"Retrieved {len(data)} stories in {elapsed:.3f}s")
+            for i, story in enumerate(data[:3], 1):
+                print(f"   Story {i}: {story['title']} by {story.get('user', {}).get('name', 'Unknown')}")
+            return True
         else:
             print_result(False, f"Failed to list stories: {response.text}")
             return False
@@ -427,6 +467,112 @@ def test_list_all_stories():
         print_error(f"Exception during list stories: {str(e)}")
         return False
 
+def test_feed_queries_flat_in_page_size():
+    """Test GET /api/stories issues as many DB commands for a large page as a small one"""
+    print_test_header("Feed DB Round Trips Independent of Page Size")
+    
+    try:
+        pages = {}
+        for limit in FEED_PAGE_SIZES:
+            # A fresh query string misses the response cache, so the handler runs
+            response = session.get(f"{BASE_URL}/stories", params={"limit": limit, "probe": uuid.uuid4().hex})
+            if response.status_code != 200:
+                print_result(False, f"limit={limit} failed: {response.text}")
+                return False
+            if response.db_commands is None:
+                print_result(False, "Server-Timing carries no db command count")
+                return False
+            pages[limit] = (len(response.json()), response.db_commands)
+            print(f"limit={limit}: {pages[limit][0]} stories, {response.db_commands} DB commands")
+        
+        small, large = (pages[limit] for limit in FEED_PAGE_SIZES)
+        if large[0] <= small[0]:
+            print_result(False, f"Need more than {small[0]} stories to compare page sizes, got {large[0]}")
+            return False
+        if large[1] > small[1] + FEED_MAX_EXTRA_DB_COMMANDS:
+            print_result(False, f"{large[0]} stories took {large[1]} DB commands vs {small[1]} for {small[0]}")
+            return False
+        
+        print_result(True, f"{small[1]} DB commands for {small[0]} stories, {large[1]} for {large[0]}")
+        return True
+    except Exception as e:
+        print_error(f"Exception during feed round-trip check: {str(e)}")
+        return False
+
+def test_stories_pagination():
+    """Test GET /api/stories?limit=N&after=<cursor> - keyset pagination"""
+    print_test_header("Paginate Stories with Cursor")
+    
+    try:
+        response = session.get(f"{BASE_URL}/stories", params={"limit": 1})
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code != 200:
+            print_result(False, f"Failed to fetch first page: {response.text}")
+            return False
+        
+        first_page = response.json()
+        next_cursor = response.headers.get('X-Next-Cursor')
+        if len(first_page) != 1 or not next_cursor:
+            print_result(False, f"Expected 1 story and a next cursor, got {len(first_page)} stories, cursor={next_cursor}")
+            return False
+        
+        response = session.get(f"{BASE_URL}/stories", params={"limit": 1, "after": next_cursor})
+        if response.status_code != 200:
+            print_result(False, f"Failed to fetch second page: {response.text}")
+            return False
+        
+        second_page = response.json()
+        if not second_page or second_page[0]['id'] == first_page[0]['id']:
+            print_result(False, "Second page did not advance past the first")
+            return False
+        if second_page[0]['createdAt'] > first_page[0]['createdAt']:
+            print_result(False, "Second page is not ordered after the first")
+            return False
+        
+        response = session.get(f"{BASE_URL}/stories", params={"after": "not-a-cursor"})
+        if response.status_code != 400:
+            print_result(False, f"Expected 400 for a malformed cursor, got {response.status_code}")
+            return False
+        
+        print_result(True, "Cursor pagination advances and rejects malformed cursors")
+        return True
+    except Exception as e:
+        print_error(f"Exception during stories pagination: {str(e)}")
+        return False
+
+def test_stories_conditional_get():
+    """Test GET /api/stories with If-None-Match - ETag revalidation"""
+    print_test_header("Revalidate Stories Feed with ETag")
+    
+    try:
+        response = session.get(f"{BASE_URL}/stories")
+        print(f"Status Code: {response.status_code}")
+        
+        etag = response.headers.get('ETag')
+        if response.status_code != 200 or not etag:
+            print_result(False, f"Expected 200 with an ETag, got {response.status_code}, ETag={etag}")
+            return False
+        
+        response = session.get(f"{BASE_URL}/stories", headers={"If-None-Match": etag})
+        if response.status_code != 304 or response.content:
+            print_result(False, f"Expected an empty 304 for a matching ETag, got {response.status_code}")
+            return False
+        if response.headers.get('ETag') != etag:
+            print_result(False, "304 response did not repeat the ETag")
+            return False
+        
+        response = session.get(f"{BASE_URL}/stories", headers={"If-None-Match": '"stale"'})
+        if response.status_code != 200 or not isinstance(response.json(), list):
+            print_result(False, f"Expected the full feed for a stale ETag, got {response.status_code}")
+            return False
+        
+        print_result(True, "Matching ETag returns 304, stale ETag returns the feed")
+        return True
+    except Exception as e:
+        print_error(f"Exception during conditional GET: {str(e)}")
+        return False
+
 def test_get_single_story():
     """Test GET /api/stories/:id - get single story"""
     print_test_header("Get Single Story by ID")
@@ -437,7 +583,7 @@ def test_get_single_story():
             return False
         
         story_id = test_data['stories'][0]['id']
-        response = requests.get(f"{BASE_URL}/stories/{story_id}")
+        response = session.get(f"{BASE_URL}/stories/{story_id}")
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -445,7 +591,7 @@ def test_get_single_story():
             if data['id'] == story_id:
                 print_result(True, f"Story retrieved - {data['title']}")
                 print(f"   Likes: {len(data.get('likes', []))}")
-                print(f"   Comments: {len(data.get('comments', []))}")
+                print(f"   Comments: {data.get('commentCount', 0)}")
                 return True
             else:
                 print_result(False, "Story ID mismatch")
@@ -471,13 +617,15 @@ def test_like_story():
             "Authorization": f"Bearer {test_data['tokens']['club1']}"
         }
         
-        response = requests.post(f"{BASE_URL}/stories/{story_id}/like", headers=headers)
+        response = session.post(f"{BASE_URL}/stories/{story_id}/like", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
-            likes_count = len(data.get('likes', []))
-            print_result(True, f"Story liked - Total likes: {likes_count}")
+            if data.get('liked') is not True or 'likes' in data:
+                print_result(False, f"Expected compact {{liked, likeCount}} response, got: {data}")
+                return False
+            print_result(True, f"Story liked - Total likes: {data['likeCount']}")
             return True
         else:
             print_result(False, f"Failed to like story: {response.text}")
@@ -500,12 +648,16 @@ def test_unlike_story():
             "Authorization": f"Bearer {test_data['tokens']['club1']}"
         }
         
-        response = requests.post(f"{BASE_URL}/stories/{story_id}/like", headers=headers)
+        # Request the full document to cover the legacy response form
+        response = session.post(f"{BASE_URL}/stories/{story_id}/like", params={"full": "true"}, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
-            likes_count = len(data.get('likes', []))
+            if data.get('id') != story_id or 'likes' not in data:
+                print_result(False, "Expected the full story document with ?full=true")
+                return False
+            likes_count = len(data['likes'])
             print_result(True, f"Story unliked - Total likes: {likes_count}")
             return True
         else:
@@ -534,15 +686,18 @@ def test_add_comment():
             "Content-Type": "application/json"
         }
         
-        response = requests.post(f"{BASE_URL}/stories/{story_id}/comment", json=payload, headers=headers)
+        response = session.post(f"{BASE_URL}/stories/{story_id}/comment", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
-            comments_count = len(data.get('comments', []))
+            comments_count = data.get('commentCount', 0)
+            recent_comments = data.get('recentComments', [])
+            if comments_count < 1 or not recent_comments or 'comments' in data:
+                print_result(False, f"Expected commentCount and recentComments on the story, got: {data}")
+                return False
             print_result(True, f"Comment added - Total comments: {comments_count}")
-            if comments_count > 0:
-                print(f"   Latest comment: {data['comments'][-1]['text'][:50]}...")
+            print(f"   Latest comment: {recent_comments[-1]['text'][:50]}...")
             return True
         else:
             print_result(False, f"Failed to add comment: {response.text}")
@@ -551,6 +706,36 @@ def test_add_comment():
         print_error(f"Exception during add comment: {str(e)}")
         return False
 
+def test_list_story_comments():
+    """Test GET /api/stories/:id/comments - paginated comments"""
+    print_test_header("List Story Comments")
+    
+    try:
+        if not test_data['stories']:
+            print_result(False, "No stories available to test")
+            return False
+        
+        story_id = test_data['stories'][0]['id']
+        response = session.get(f"{BASE_URL}/stories/{story_id}/comments", params={"limit": 10})
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            if not isinstance(data, list) or not data:
+                print_result(False, f"Expected a non-empty list of comments, got: {data}")
+                return False
+            if any(comment.get('storyId') != story_id for comment in data):
+                print_result(False, "Comment list contains comments from another story")
+                return False
+            print_result(True, f"Retrieved {len(data)} comments")
+            return True
+        else:
+            print_result(False, f"Failed to list comments: {response.text}")
+            return False
+    except Exception as e:
+        print_error(f"Exception during list comments: {str(e)}")
+        return False
+
 # ============================================================================
 # 3. EVENT SYSTEM FLOW TESTS (CRITICAL)
 # ============================================================================
@@ -577,7 +762,7 @@ def test_create_event_as_admin():
             "Content-Type": "application/json"
         }
         
-        response = requests.post(f"{BASE_URL}/events", json=payload, headers=headers)
+        response = session.post(f"{BASE_URL}/events", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -621,7 +806,7 @@ def test_create_event_as_club():
             "Content-Type": "application/json"
         }
         
-        response = requests.post(f"{BASE_URL}/events", json=payload, headers=headers)
+        response = session.post(f"{BASE_URL}/events", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 403:
@@ -661,7 +846,7 @@ def test_create_event_as_creator():
             "Content-Type": "application/json"
         }
         
-        response = requests.post(f"{BASE_URL}/events", json=payload, headers=headers)
+        response = session.post(f"{BASE_URL}/events", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -696,7 +881,7 @@ def test_create_event_as_rider():
             "Content-Type": "application/json"
         }
         
-        response = requests.post(f"{BASE_URL}/events", json=payload, headers=headers)
+        response = session.post(f"{BASE_URL}/events", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 403:
@@ -714,7 +899,7 @@ def test_list_all_events():
     print_test_header("List All Events")
     
     try:
-        response = requests.get(f"{BASE_URL}/events")
+        response = session.get(f"{BASE_URL}/events")
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -748,13 +933,15 @@ def test_rsvp_to_event():
             "Authorization": f"Bearer {test_data['tokens']['rider1']}"
         }
         
-        response = requests.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers)
+        response = session.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
-            rsvp_count = len(data.get('rsvps', []))
-            print_result(True, f"RSVP successful - Total RSVPs: {rsvp_count}")
+            if data.get('attending') is not True:
+                print_result(False, f"Expected attending=true, got: {data}")
+                return False
+            print_result(True, f"RSVP successful - Total RSVPs: {data['rsvpCount']}")
             return True
         else:
             print_result(False, f"RSVP failed: {response.text}")
@@ -763,6 +950,46 @@ def test_rsvp_to_event():
         print_error(f"Exception during RSVP: {str(e)}")
         return False
 
+def test_list_attending_events():
+    """Test GET /api/events?attending=me - only the viewer's RSVPs"""
+    print_test_header("List Attending Events")
+    
+    try:
+        if not test_data['events']:
+            print_result(False, "No events available to test")
+            return False
+        
+        event_id = test_data['events'][0]['id']
+        headers = {
+            "Authorization": f"Bearer {test_data['tokens']['rider1']}"
+        }
+        
+        response = session.get(f"{BASE_URL}/events", params={"attending": "me"}, headers=headers)
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code != 200:
+            print_result(False, f"Failed to list attending events: {response.text}")
+            return False
+        
+        data = response.json()
+        if event_id not in [event['id'] for event in data]:
+            print_result(False, f"RSVP'd event {event_id} missing from attending list")
+            return False
+        if not all(event.get('isAttending') for event in data):
+            print_result(False, "Attending list contains events the rider has not RSVP'd to")
+            return False
+        
+        anonymous = session.get(f"{BASE_URL}/events", params={"attending": "me"})
+        if anonymous.status_code != 401:
+            print_result(False, f"Expected 401 without a token, got {anonymous.status_code}")
+            return False
+        
+        print_result(True, f"Attending list has {len(data)} event(s), anonymous request rejected")
+        return True
+    except Exception as e:
+        print_error(f"Exception during attending events list: {str(e)}")
+        return False
+
 def test_rsvp_toggle():
     """Test POST /api/events/:id/rsvp - toggle RSVP off"""
     print_test_header("Toggle RSVP Off")
@@ -777,13 +1004,15 @@ def test_rsvp_toggle():
             "Authorization": f"Bearer {test_data['tokens']['rider1']}"
         }
         
-        response = requests.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers)
+        response = session.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
-            rsvp_count = len(data.get('rsvps', []))
-            print_result(True, f"RSVP toggled off - Total RSVPs: {rsvp_count}")
+            if data.get('attending') is not False:
+                print_result(False, f"Expected attending=false, got: {data}")
+                return False
+            print_result(True, f"RSVP toggled off - Total RSVPs: {data['rsvpCount']}")
             return True
         else:
             print_result(False, f"RSVP toggle failed: {response.text}")
@@ -814,7 +1043,7 @@ def test_max_attendees_limit():
             "Content-Type": "application/json"
         }
         
-        response = requests.post(f"{BASE_URL}/events", json=payload, headers=headers)
+        response = session.post(f"{BASE_URL}/events", json=payload, headers=headers)
         
         if response.status_code != 200:
             print_result(False, "Failed to create test event")
@@ -824,11 +1053,11 @@ def test_max_attendees_limit():
         
         # First RSVP should succeed
         headers_rsvp = {"Authorization": f"Bearer {test_data['tokens']['rider1']}"}
-        response1 = requests.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers_rsvp)
+        response1 = session.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers_rsvp)
         
         # Second RSVP should fail
         headers_rsvp2 = {"Authorization": f"Bearer {test_data['tokens']['creator1']}"}
-        response2 = requests.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers_rsvp2)
+        response2 = session.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers_rsvp2)
         
         print(f"First RSVP Status: {response1.status_code}")
         print(f"Second RSVP Status: {response2.status_code}")
@@ -853,7 +1082,7 @@ def test_get_event_by_id():
             return False
         
         event_id = test_data['events'][0]['id']
-        response = requests.get(f"{BASE_URL}/events/{event_id}")
+        response = session.get(f"{BASE_URL}/events/{event_id}")
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -883,7 +1112,7 @@ def test_get_user_profile():
     
     try:
         user_id = test_data['users']['rider1']['id']
-        response = requests.get(f"{BASE_URL}/users/{user_id}")
+        response = session.get(f"{BASE_URL}/users/{user_id}")
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -927,7 +1156,7 @@ def test_update_own_profile():
             "Content-Type": "application/json"
         }
         
-        response = requests.put(f"{BASE_URL}/users/{user_id}", json=payload, headers=headers)
+        response = session.put(f"{BASE_URL}/users/{user_id}", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -947,6 +1176,60 @@ def test_update_own_profile():
         print_error(f"Exception during profile update: {str(e)}")
         return False
 
+def jwt_claims(token):
+    """Decoded JWT payload; signatures are the server's business"""
+    payload = token.split('.')[1]
+    return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+
+def test_me_reflects_profile_update():
+    """Test GET /api/auth/me shows a profile edit even with the pre-edit token"""
+    print_test_header("Current User Reflects Profile Update")
+    
+    try:
+        user_id = test_data['users']['rider1']['id']
+        old_token = test_data['tokens']['rider1']
+        headers = {
+            "Authorization": f"Bearer {old_token}",
+            "Content-Type": "application/json"
+        }
+        new_bio = f"Updated at {datetime.now().isoformat()}"
+        
+        response = session.put(f"{BASE_URL}/users/{user_id}", json={"bio": new_bio}, headers=headers)
+        if response.status_code != 200:
+            print_result(False, f"Profile update failed: {response.text}")
+            return False
+        refreshed_token = response.headers.get('X-Refreshed-Token')
+        if not refreshed_token:
+            print_result(False, "Profile update did not return X-Refreshed-Token")
+            return False
+        
+        old_claims, refreshed_claims = jwt_claims(old_token), jwt_claims(refreshed_token)
+        if refreshed_claims.get('exp') != old_claims.get('exp'):
+            print_result(False, f"Refreshed token moved exp from {old_claims.get('exp')} to {refreshed_claims.get('exp')}")
+            return False
+        leaked = {'email', 'password'} & set(refreshed_claims.get('profile', {}))
+        if leaked:
+            print_result(False, f"Profile claim exposes {sorted(leaked)}")
+            return False
+        
+        # The old token carries an outdated profile claim
+        response = session.get(f"{BASE_URL}/auth/me", headers=headers)
+        if response.status_code != 200 or response.json().get('bio') != new_bio:
+            print_result(False, f"/auth/me with the old token returned a stale profile: {response.text}")
+            return False
+        
+        response = session.get(f"{BASE_URL}/auth/me", headers={"Authorization": f"Bearer {refreshed_token}"})
+        if response.status_code != 200 or response.json().get('bio') != new_bio:
+            print_result(False, f"/auth/me with the refreshed token failed: {response.text}")
+            return False
+        
+        test_data['tokens']['rider1'] = refreshed_token
+        print_result(True, "Profile edit visible immediately with old and refreshed tokens")
+        return True
+    except Exception as e:
+        print_error(f"Exception during profile claim check: {str(e)}")
+        return False
+
 def test_update_other_profile_unauthorized():
     """Test PUT /api/users/:id - try to update another user's profile (should fail)"""
     print_test_header("Update Other User's Profile (Should Fail)")
@@ -962,7 +1245,7 @@ def test_update_other_profile_unauthorized():
             "Content-Type": "application/json"
         }
         
-        response = requests.put(f"{BASE_URL}/users/{user_id}", json=payload, headers=headers)
+        response = session.put(f"{BASE_URL}/users/{user_id}", json=payload, headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 403:
@@ -988,7 +1271,7 @@ def test_admin_stats():
             "Authorization": f"Bearer {test_data['tokens']['admin']}"
         }
         
-        response = requests.get(f"{BASE_URL}/admin/stats", headers=headers)
+        response = session.get(f"{BASE_URL}/admin/stats", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -1010,6 +1293,40 @@ def test_admin_stats():
         print_error(f"Exception during admin stats: {str(e)}")
         return False
 
+def test_admin_pool_stats():
+    """Test GET /api/admin/pool-stats - Mongo connection pool metrics"""
+    print_test_header("Admin Pool Stats")
+    
+    try:
+        headers = {
+            "Authorization": f"Bearer {test_data['tokens']['admin']}"
+        }
+        
+        response = session.get(f"{BASE_URL}/admin/pool-stats", headers=headers)
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code != 200:
+            print_result(False, f"Failed to get pool stats: {response.text}")
+            return False
+        
+        mongo = response.json().get('mongo', {})
+        required = ['maxPoolSize', 'open', 'inUse', 'checkouts', 'checkoutWaitMs']
+        missing = [key for key in required if key not in mongo]
+        if missing:
+            print_result(False, f"Pool stats missing {missing}")
+            return False
+        if mongo['checkouts'] == 0 or mongo['open'] == 0:
+            print_result(False, "Pool reports no connections after a full test run")
+            return False
+        
+        print_result(True, "Pool stats retrieved successfully")
+        print(f"   Open/In use: {mongo['open']}/{mongo['inUse']} (max {mongo['maxPoolSize']})")
+        print(f"   Checkout wait p99: {mongo['checkoutWaitMs']['p99']}ms")
+        return True
+    except Exception as e:
+        print_error(f"Exception during pool stats: {str(e)}")
+        return False
+
 def test_admin_stats_unauthorized():
     """Test GET /api/admin/stats as non-admin (should fail)"""
     print_test_header("Admin Stats - Unauthorized (Should Fail)")
@@ -1019,7 +1336,7 @@ def test_admin_stats_unauthorized():
             "Authorization": f"Bearer {test_data['tokens']['rider1']}"
         }
         
-        response = requests.get(f"{BASE_URL}/admin/stats", headers=headers)
+        response = session.get(f"{BASE_URL}/admin/stats", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 401:
@@ -1046,7 +1363,7 @@ def test_delete_own_story():
             "Authorization": f"Bearer {test_data['tokens']['rider1']}"
         }
         
-        response = requests.delete(f"{BASE_URL}/stories/{story_id}", headers=headers)
+        response = session.delete(f"{BASE_URL}/stories/{story_id}", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -1073,7 +1390,7 @@ def test_delete_other_story_unauthorized():
             "Authorization": f"Bearer {test_data['tokens']['rider1']}"
         }
         
-        response = requests.delete(f"{BASE_URL}/stories/{story_id}", headers=headers)
+        response = session.delete(f"{BASE_URL}/stories/{story_id}", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 403:
@@ -1100,7 +1417,7 @@ def test_admin_delete_any_story():
             "Authorization": f"Bearer {test_data['tokens']['admin']}"
         }
         
-        response = requests.delete(f"{BASE_URL}/stories/{story_id}", headers=headers)
+        response = session.delete(f"{BASE_URL}/stories/{story_id}", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -1127,7 +1444,7 @@ def test_delete_own_event():
             "Authorization": f"Bearer {test_data['tokens']['club1']}"
         }
         
-        response = requests.delete(f"{BASE_URL}/events/{event_id}", headers=headers)
+        response = session.delete(f"{BASE_URL}/events/{event_id}", headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
@@ -1144,101 +1461,113 @@ def test_delete_own_event():
 # MAIN TEST RUNNER
 # ============================================================================
 
-def run_all_tests():
-    """Run all backend tests in order"""
-    print("\n" + "="*80)
-    print("MOTO SAGA BACKEND API TEST SUITE")
-    print("="*80)
-    print(f"Base URL: {BASE_URL}")
-    print(f"Test Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*80)
-    
-    results = {
-        'passed': 0,
-        'failed': 0,
-        'total': 0
-    }
+AUTH = "Authentication Flow"
+STORIES = "Story Creation Flow"
+EVENTS = "Event System Flow"
+PROFILE = "User Profile Flow"
+ADMIN = "Admin Functions"
+
+# Story reads and interactions that must finish before the stories are deleted
+STORY_READERS = (
+    'test_list_all_stories', 'test_feed_queries_flat_in_page_size', 'test_stories_pagination',
+    'test_stories_conditional_get', 'test_get_single_story', 'test_like_story', 'test_unlike_story',
+    'test_add_comment', 'test_list_story_comments'
+)
+
+def build_test_graph():
+    """Declares what shared test_data each test needs and creates"""
+    def node(func, group, requires=(), provides=(), after=(), exclusive=False):
+        return TestNode(func.__name__, func, group, tuple(requires), tuple(provides), tuple(after), exclusive)
     
-    tests = [
+    return [
         # 1. Authentication Flow (CRITICAL)
-        ("Authentication Flow", [
-            test_signup_rider,
-            test_signup_club,
-            test_signup_creator,
-            test_signup_admin,
-            test_login,
-            test_login_invalid,
-            test_get_current_user,
-            test_auth_unauthorized
-        ]),
+        node(test_signup_rider, AUTH, provides=['user.rider1']),
+        node(test_signup_club, AUTH, provides=['user.club1']),
+        node(test_signup_creator, AUTH, provides=['user.creator1']),
+        node(test_signup_admin, AUTH, provides=['user.admin']),
+        node(test_login, AUTH, requires=['user.rider1']),
+        node(test_login_invalid, AUTH),
+        node(test_get_current_user, AUTH, requires=['user.rider1']),
+        node(test_auth_unauthorized, AUTH),
         
         # 2. Story Creation Flow (CRITICAL - THE AHA MOMENT)
-        ("Story Creation Flow", [
-            test_upload_file,
-            test_create_story_with_media,
-            test_create_story_simple,
-            test_list_all_stories,
-            test_get_single_story,
-            test_like_story,
-            test_unlike_story,
-            test_add_comment
-        ]),
+        node(test_upload_file, STORIES, requires=['user.rider1']),
+        node(test_create_story_with_media, STORIES, requires=['user.rider1'], provides=['story.rider1']),
+        # stories[0] must stay the rider's story
+        node(test_create_story_simple, STORIES, requires=['user.creator1'], provides=['story.creator1'],
+             after=['test_create_story_with_media']),
+        # Latency budget and ETag checks are disturbed by concurrent writes
+        node(test_list_all_stories, STORIES, requires=['story.rider1', 'story.creator1']),
+        node(test_feed_queries_flat_in_page_size, STORIES, requires=['story.rider1', 'story.creator1']),
+        node(test_stories_pagination, STORIES, requires=['story.rider1', 'story.creator1']),
+        node(test_stories_conditional_get, STORIES, requires=['story.rider1'], exclusive=True),
+        node(test_get_single_story, STORIES, requires=['story.rider1']),
+        node(test_like_story, STORIES, requires=['story.rider1', 'user.club1']),
+        node(test_unlike_story, STORIES, requires=['story.rider1', 'user.club1'], after=['test_like_story']),
+        node(test_add_comment, STORIES, requires=['story.rider1', 'user.creator1'], provides=['comment']),
+        node(test_list_story_comments, STORIES, requires=['comment']),
         
         # 3. Event System Flow (CRITICAL - ADMIN FOCUS)
-        ("Event System Flow", [
-            test_create_event_as_admin,
-            test_create_event_as_club,
-            test_create_event_as_creator,
-            test_create_event_as_rider,
-            test_list_all_events,
-            test_rsvp_to_event,
-            test_rsvp_toggle,
-            test_max_attendees_limit,
-            test_get_event_by_id
-        ]),
+        node(test_create_event_as_admin, EVENTS, requires=['user.admin'], provides=['event.admin']),
+        # events[0] must stay the admin's event
+        node(test_create_event_as_club, EVENTS, requires=['user.club1'], after=['test_create_event_as_admin']),
+        node(test_create_event_as_creator, EVENTS, requires=['user.creator1'], after=['test_create_event_as_admin']),
+        node(test_create_event_as_rider, EVENTS, requires=['user.rider1']),
+        node(test_list_all_events, EVENTS, requires=['event.admin']),
+        node(test_rsvp_to_event, EVENTS, requires=['event.admin', 'user.rider1']),
+        node(test_list_attending_events, EVENTS, requires=['event.admin', 'user.rider1'], after=['test_rsvp_to_event']),
+        node(test_rsvp_toggle, EVENTS, requires=['event.admin', 'user.rider1'],
+             after=['test_rsvp_to_event', 'test_list_attending_events']),
+        node(test_max_attendees_limit, EVENTS, requires=['user.club1', 'user.creator1', 'user.rider1']),
+        node(test_get_event_by_id, EVENTS, requires=['event.admin'], after=['test_rsvp_toggle']),
         
         # 4. User Profile Flow
-        ("User Profile Flow", [
-            test_get_user_profile,
-            test_update_own_profile,
-            test_update_other_profile_unauthorized
-        ]),
+        node(test_get_user_profile, PROFILE, requires=['user.rider1']),
+        node(test_update_own_profile, PROFILE, requires=['user.rider1'], provides=['profile.rider1']),
+        node(test_me_reflects_profile_update, PROFILE, requires=['profile.rider1']),
+        node(test_update_other_profile_unauthorized, PROFILE, requires=['user.rider1', 'user.club1']),
         
         # 5. Admin Functions
-        ("Admin Functions", [
-            test_admin_stats,
-            test_admin_stats_unauthorized,
-            test_delete_own_story,
-            test_delete_other_story_unauthorized,
-            test_admin_delete_any_story,
-            test_delete_own_event
-        ])
+        node(test_admin_stats, ADMIN, requires=['user.admin']),
+        node(test_admin_pool_stats, ADMIN, requires=['user.admin']),
+        node(test_admin_stats_unauthorized, ADMIN, requires=['user.rider1']),
+        node(test_delete_own_story, ADMIN, requires=['story.rider1'], after=STORY_READERS),
+        node(test_delete_other_story_unauthorized, ADMIN, requires=['story.creator1', 'user.rider1']),
+        node(test_admin_delete_any_story, ADMIN, requires=['story.creator1', 'user.admin'],
+             after=STORY_READERS + ('test_delete_other_story_unauthorized',)),
+        node(test_delete_own_event, ADMIN, requires=['event.admin'],
+             after=['test_list_all_events', 'test_rsvp_toggle', 'test_get_event_by_id'])
     ]
+
+def run_all_tests(args=None):
+    """Run all backend tests, independent branches concurrently"""
+    args = args or parse_runner_args([])
+    print("\n" + "="*80)
+    print("MOTO SAGA BACKEND API TEST SUITE")
+    print("="*80)
+    print(f"Base URL: {BASE_URL}")
+    print(f"Workers: {args.workers}")
+    print(f"Test Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*80)
     
-    for section_name, section_tests in tests:
-        print(f"\n{'#'*80}")
-        print(f"# {section_name}")
-        print(f"{'#'*80}")
-        
-        for test_func in section_tests:
-            results['total'] += 1
-            try:
-                if test_func():
-                    results['passed'] += 1
-                else:
-                    results['failed'] += 1
-            except Exception as e:
-                print_error(f"Test crashed: {str(e)}")
-                results['failed'] += 1
+    results, wall_time = run_suite("backend", build_test_graph(), args)
+    counts = summarize(results)
+    total = len(results)
     
     # Print final summary
     print("\n" + "="*80)
     print("TEST SUMMARY")
     print("="*80)
-    print(f"Total Tests: {results['total']}")
-    print(f"✅ Passed: {results['passed']}")
-    print(f"❌ Failed: {results['failed']}")
-    print(f"Success Rate: {(results['passed']/results['total']*100):.1f}%")
+    print(f"Total Tests: {total}")
+    print(f"✅ Passed: {counts['passed']}")
+    print(f"❌ Failed: {counts['failed'] + counts['error']}")
+    print(f"⏭️  Skipped: {counts['skipped']}")
+    print(f"Success Rate: {(counts['passed']/total*100):.1f}%")
+    print(f"Wall Time: {wall_time:.2f}s")
+    print("="*80)
+    print("Slowest tests:")
+    for result in sorted(results, key=lambda r: r.duration, reverse=True)[:5]:
+        print(f"   {result.duration:6.2f}s  {result.name}")
     print("="*80)
     print(f"Test End Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*80)
@@ -1246,4 +1575,6 @@ def run_all_tests():
     return results
 
 if __name__ == "__main__":
-    run_all_tests()
+    args = parse_runner_args()
+    with target_base_url(args.local, BASE_URL) as BASE_URL:
+        run_all_tests(args)
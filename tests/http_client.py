@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the Python test suites.
+
+One pooled requests.Session with keep-alive replaces the module-level
+requests.get/post calls, which opened a new TCP+TLS connection per call,
+so measured times are dominated by the server rather than the handshake.
+
+Every response is timed. `client_time` is what the suite waited for the
+response headers; `server_time` is the handler's own duration from the
+API's Server-Timing header (None when the target does not send one), and
+`db_commands` the number of MongoDB commands the handler issued, from the
+same header. take_timings() hands a thread's timings to the result helpers.
+
+    HTTP_POOL_SIZE   connections kept per host (default 16)
+    HTTP_RETRIES     retries on connection errors, and on 502/503/504 for
+                     idempotent methods (default 2)
+    HTTP_TIMEOUT     seconds per request (default 30)
+"""
+
+import os
+import re
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "16"))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "2"))
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "30"))
+
+SERVER_TIMING_DURATION = re.compile(r'(?:^|,)\s*app\s*;[^,]*?dur=([\d.]+)')
+SERVER_TIMING_DB_COMMANDS = re.compile(r'(?:^|,)\s*db\s*;[^,]*?desc="?(\d+)')
+
+_local = threading.local()
+
+
+def parse_server_timing(header):
+    """Seconds from a `Server-Timing: app;dur=<ms>` header, or None"""
+    match = SERVER_TIMING_DURATION.search(header or "")
+    return float(match.group(1)) / 1000 if match else None
+
+
+def parse_db_commands(header):
+    """MongoDB command count from a `Server-Timing: db;desc=<n>` header, or None"""
+    match = SERVER_TIMING_DB_COMMANDS.search(header or "")
+    return int(match.group(1)) if match else None
+
+
+def _record_timing(response, *args, **kwargs):
+    response.client_time = response.elapsed.total_seconds()
+    response.server_time = parse_server_timing(response.headers.get("Server-Timing"))
+    response.db_commands = parse_db_commands(response.headers.get("Server-Timing"))
+    if not hasattr(_local, "timings"):
+        _local.timings = []
+    _local.timings.append((response.client_time, response.server_time))
+
+
+def take_timings():
+    """(requests, client seconds, server seconds or None) recorded on this
+    thread since the last call"""
+    timings = getattr(_local, "timings", [])
+    _local.timings = []
+    if not timings:
+        return 0, 0.0, None
+    server_times = [server for _, server in timings if server is not None]
+    return (
+        len(timings),
+        sum(client for client, _ in timings),
+        sum(server_times) if server_times else None
+    )
+
+
+def format_timings(count, client_time, server_time):
+    server = f"{server_time*1000:.1f}ms" if server_time is not None else "n/a"
+    return f"{count} request{'s' if count != 1 else ''}: client {client_time*1000:.1f}ms, server {server}"
+
+
+class PooledSession(requests.Session):
+    """requests.Session with a default timeout and no cookie jar, so tests
+    sharing it cannot leak state into each other"""
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, retries=HTTP_RETRIES, timeout=HTTP_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            status_forcelist=(502, 503, 504),
+            backoff_factor=0.2,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        self.hooks["response"].append(_record_timing)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+session = PooledSession()
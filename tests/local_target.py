@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Hermetic local target for the test suites.
+
+LocalTarget boots the Next.js API on an ephemeral port against a throwaway
+MongoDB and a fresh database, with its own JWT secret and upload
+directory, so correctness and latency runs do not depend on a remote
+preview host or on data left behind by earlier runs.
+
+MongoDB comes from mongodb-memory-server (tests/memory_mongo.mjs) unless
+LOCAL_MONGO_URL points at an existing server, e.g. a `mongod` started for
+CI. Either way each run gets its own database name.
+
+LOCAL_TARGET_MODE=start serves a production build (run `yarn build`
+first) instead of `next dev`, which compiles routes on first request and
+skews latency.
+"""
+
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import uuid
+from contextlib import contextmanager
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NEXT_BIN = os.path.join(ROOT_DIR, "node_modules", ".bin", "next")
+MEMORY_MONGO_SCRIPT = os.path.join(ROOT_DIR, "tests", "memory_mongo.mjs")
+
+# `next dev` compiles the API route on the first request
+STARTUP_TIMEOUT_SECONDS = float(os.environ.get("LOCAL_TARGET_STARTUP_TIMEOUT", "120"))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _stop(process, timeout=10):
+    if process is None or process.poll() is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+class LocalTarget:
+    """Context manager; `base_url` is the API root once entered"""
+
+    def __init__(self, env=None, mode=None):
+        self.extra_env = env or {}
+        self.mode = mode or os.environ.get("LOCAL_TARGET_MODE", "dev")
+        self.base_url = None
+        self.workdir = None
+        self.mongo = None
+        self.server = None
+        self.log_path = None
+
+    def __enter__(self):
+        self.workdir = tempfile.mkdtemp(prefix="motosaga-target-")
+        try:
+            self.start()
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        # Keep next.log around when the run failed
+        if exc_type is None:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def start(self):
+        mongo_url = os.environ.get("LOCAL_MONGO_URL") or self.start_memory_mongo()
+        port = free_port()
+        env = {
+            **os.environ,
+            "MONGO_URL": mongo_url,
+            "DB_NAME": f"moto_saga_test_{uuid.uuid4().hex[:8]}",
+            "JWT_SECRET": uuid.uuid4().hex,
+            "UPLOAD_DIR": os.path.join(self.workdir, "uploads"),
+            "NEXT_TELEMETRY_DISABLED": "1",
+            **self.extra_env
+        }
+        env.pop("REDIS_URL", None)
+
+        self.log_path = os.path.join(self.workdir, "next.log")
+        with open(self.log_path, "w") as log:
+            self.server = subprocess.Popen(
+                [NEXT_BIN, self.mode, "--hostname", "127.0.0.1", "--port", str(port)],
+                cwd=ROOT_DIR,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
+        self.base_url = f"http://127.0.0.1:{port}/api"
+        self.wait_until_ready()
+
+    def start_memory_mongo(self):
+        self.mongo = subprocess.Popen(
+            ["node", MEMORY_MONGO_SCRIPT],
+            cwd=ROOT_DIR,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            start_new_session=True
+        )
+        # The first line is the URI, or EOF if it failed (reason on stderr)
+        uri = self.mongo.stdout.readline().strip()
+        if not uri:
+            raise RuntimeError("In-memory MongoDB did not start")
+        return uri
+
+    def wait_until_ready(self):
+        deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            if self.server.poll() is not None:
+                raise RuntimeError(f"Next.js exited with {self.server.returncode}:\n{self.log_tail()}")
+            try:
+                with urllib.request.urlopen(f"{self.base_url}/stories", timeout=30):
+                    return
+            except (urllib.error.URLError, OSError):
+                pass
+            time.sleep(0.5)
+        raise RuntimeError(f"Next.js not ready after {STARTUP_TIMEOUT_SECONDS:.0f}s:\n{self.log_tail()}")
+
+    def log_tail(self, lines=40):
+        with open(self.log_path) as f:
+            return "".join(f.readlines()[-lines:])
+
+    def stop(self):
+        _stop(self.server)
+        if self.mongo and self.mongo.poll() is None:
+            self.mongo.stdin.close()
+            try:
+                self.mongo.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                _stop(self.mongo)
+
+
+@contextmanager
+def target_base_url(local, base_url, env=None):
+    """Yields `base_url`, or a fresh LocalTarget's when `local` is set"""
+    if not local:
+        yield base_url
+        return
+    print("Starting local target (Next.js + throwaway MongoDB)...")
+    with LocalTarget(env=env) as target:
+        print(f"Local target ready at {target.base_url} (log: {target.log_path})")
+        yield target.base_url
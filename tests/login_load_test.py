@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Moto Saga Login Load Test
+Measures GET /api/stories latency while a burst of logins is in flight.
+Password hashing runs on worker threads, so feed p99 under login load should
+stay close to the idle baseline.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+try:
+    from http_client import format_timings, session, take_timings
+    from local_target import target_base_url
+    from runner import TestNode, parse_runner_args, run_suite, summarize
+except ImportError:  # imported as tests.login_load_test
+    from tests.http_client import format_timings, session, take_timings
+    from tests.local_target import target_base_url
+    from tests.runner import TestNode, parse_runner_args, run_suite, summarize
+
+# Base URL from environment; --local replaces it with a throwaway local server
+BASE_URL = os.environ.get("BASE_URL", "https://saga-riders.preview.emergentagent.com/api")
+
+FEED_SAMPLES = int(os.environ.get("FEED_SAMPLES", "50"))
+LOGIN_CONCURRENCY = int(os.environ.get("LOGIN_CONCURRENCY", "16"))
+
+# Loaded feed p99 may not exceed this budget, nor this multiple of the idle p99
+FEED_P99_BUDGET_SECONDS = float(os.environ.get("FEED_P99_BUDGET_SECONDS", "1.0"))
+FEED_P99_MAX_SLOWDOWN = float(os.environ.get("FEED_P99_MAX_SLOWDOWN", "3.0"))
+
+
+def print_test_header(test_name):
+    """Print formatted test header"""
+    print(f"\n{'='*80}")
+    print(f"TEST: {test_name}")
+    print(f"{'='*80}")
+
+def print_result(success, message):
+    """Print test result with the client and server time of its requests"""
+    status = "✅ PASS" if success else "❌ FAIL"
+    print(f"{status}: {message}")
+    count, client_time, server_time = take_timings()
+    if count:
+        print(f"   ⏱️  {format_timings(count, client_time, server_time)}")
+
+def print_error(error_msg):
+    """Print error message"""
+    print(f"❌ ERROR: {error_msg}")
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of seconds"""
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+def sample_feed(count):
+    """Time `count` sequential GET /api/stories calls"""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = session.get(f"{BASE_URL}/stories", params={"limit": 20})
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return latencies
+
+def create_login_user():
+    credentials = {
+        "email": f"loadtest-{uuid.uuid4().hex[:8]}@motosaga.com",
+        "password": "LoadTest123!"
+    }
+    response = session.post(f"{BASE_URL}/auth/signup", json={
+        **credentials,
+        "name": "Load Test Rider",
+        "role": "rider"
+    })
+    response.raise_for_status()
+    return credentials
+
+
+def test_feed_p99_during_login_burst():
+    """Test GET /api/stories p99 while logins run concurrently"""
+    print_test_header("Feed p99 During Login Burst")
+
+    try:
+        credentials = create_login_user()
+
+        idle = sample_feed(FEED_SAMPLES)
+        idle_p99 = percentile(idle, 99)
+        print(f"Idle feed: p50={percentile(idle, 50)*1000:.0f}ms p99={idle_p99*1000:.0f}ms")
+
+        stop = threading.Event()
+        login_statuses = []
+        status_lock = threading.Lock()
+
+        def login_loop():
+            while not stop.is_set():
+                response = session.post(f"{BASE_URL}/auth/login", json=credentials)
+                with status_lock:
+                    login_statuses.append(response.status_code)
+
+        with ThreadPoolExecutor(max_workers=LOGIN_CONCURRENCY) as pool:
+            for _ in range(LOGIN_CONCURRENCY):
+                pool.submit(login_loop)
+            try:
+                loaded = sample_feed(FEED_SAMPLES)
+            finally:
+                stop.set()
+
+        loaded_p99 = percentile(loaded, 99)
+        print(f"Loaded feed: p50={percentile(loaded, 50)*1000:.0f}ms p99={loaded_p99*1000:.0f}ms")
+        print(f"Logins: {len(login_statuses)} total, "
+              f"{login_statuses.count(200)} ok, {login_statuses.count(503)} shed (503)")
+
+        unexpected = [s for s in login_statuses if s not in (200, 503)]
+        if unexpected:
+            print_result(False, f"Unexpected login statuses: {sorted(set(unexpected))}")
+            return False
+        if login_statuses.count(200) == 0:
+            print_result(False, "No login succeeded during the burst")
+            return False
+
+        limit = min(FEED_P99_BUDGET_SECONDS, max(idle_p99 * FEED_P99_MAX_SLOWDOWN, 0.05))
+        if loaded_p99 > limit:
+            print_result(False, f"Feed p99 {loaded_p99*1000:.0f}ms exceeds {limit*1000:.0f}ms under login load")
+            return False
+
+        print_result(True, f"Feed p99 {loaded_p99*1000:.0f}ms within {limit*1000:.0f}ms under login load")
+        return True
+    except Exception as e:
+        print_error(f"Exception during login load test: {str(e)}")
+        return False
+
+
+def run_all_tests(args=None):
+    """Run the login load test"""
+    args = args or parse_runner_args([])
+    print("\n" + "="*80)
+    print("MOTO SAGA LOGIN LOAD TEST")
+    print("="*80)
+    print(f"Base URL: {BASE_URL}")
+    print(f"Test Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*80)
+
+    # Exclusive: the measurement is only meaningful with nothing else running
+    nodes = [TestNode(test_feed_p99_during_login_burst.__name__, test_feed_p99_during_login_burst,
+                      "load", exclusive=True)]
+    results, _ = run_suite("login_load", nodes, args)
+    passed = summarize(results)["passed"] == len(results)
+
+    print("\n" + "="*80)
+    print(f"RESULT: {'✅ PASS' if passed else '❌ FAIL'}")
+    print("="*80)
+    return passed
+
+if __name__ == "__main__":
+    args = parse_runner_args()
+    with target_base_url(args.local, BASE_URL) as BASE_URL:
+        run_all_tests(args)
@@ -0,0 +1,30 @@
+// Starts a throwaway MongoDB for local test runs and prints its URI on the
+// first line of stdout. Stops when stdin closes or on SIGTERM/SIGINT, so the
+// Python side only has to close the pipe.
+//
+// Needs mongodb-memory-server (`yarn add -D mongodb-memory-server`), which
+// downloads a mongod binary on first use.
+let MongoMemoryServer;
+try {
+  ({ MongoMemoryServer } = await import('mongodb-memory-server'));
+} catch {
+  console.error('mongodb-memory-server is not installed. Run `yarn add -D mongodb-memory-server`, '
+    + 'or set LOCAL_MONGO_URL to a MongoDB you can write test databases to.');
+  process.exit(1);
+}
+
+const server = await MongoMemoryServer.create();
+console.log(server.getUri());
+
+let stopping = false;
+async function stop() {
+  if (stopping) return;
+  stopping = true;
+  await server.stop();
+  process.exit(0);
+}
+
+process.stdin.on('end', stop);
+process.stdin.resume();
+process.on('SIGTERM', stop);
+process.on('SIGINT', stop);
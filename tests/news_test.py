@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Moto Saga News Proxy Test Suite
+Runs /api/news against a local fake NewsAPI to check caching, single-flight
+coalescing and serving the last good payload when the upstream fails.
+
+With --local the suite boots its own server already pointed at the fake.
+Otherwise the server under test must be started that way by hand, e.g.:
+
+    NEWSAPI_URL=http://127.0.0.1:8765/v2/everything NEWSAPI_KEY=test \\
+    NEWS_CACHE_TTL_MS=2000 NEWS_UPSTREAM_BACKOFF_MS=0 yarn dev
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+try:
+    from http_client import format_timings, session, take_timings
+    from local_target import target_base_url
+    from runner import TestNode, parse_runner_args, run_suite, summarize
+except ImportError:  # imported as tests.news_test
+    from tests.http_client import format_timings, session, take_timings
+    from tests.local_target import target_base_url
+    from tests.runner import TestNode, parse_runner_args, run_suite, summarize
+
+# The fake upstream has to be reachable from the server, so this suite runs
+# against a local server by default; --local starts one itself
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000/api")
+FAKE_NEWSAPI_PORT = int(os.environ.get("FAKE_NEWSAPI_PORT", "8765"))
+NEWS_CACHE_TTL_MS = int(os.environ.get("NEWS_CACHE_TTL_MS", "2000"))
+NEWS_CACHE_TTL_SECONDS = NEWS_CACHE_TTL_MS / 1000
+
+# Server environment for --local, pointing /api/news at the fake
+LOCAL_TARGET_ENV = {
+    "NEWSAPI_URL": f"http://127.0.0.1:{FAKE_NEWSAPI_PORT}/v2/everything",
+    "NEWSAPI_KEY": "test",
+    "NEWS_CACHE_TTL_MS": str(NEWS_CACHE_TTL_MS),
+    "NEWS_UPSTREAM_BACKOFF_MS": "0"
+}
+
+# Slow enough that concurrent requests overlap while the first is in flight
+FAKE_UPSTREAM_DELAY_SECONDS = 0.5
+
+
+class FakeNewsAPI(BaseHTTPRequestHandler):
+    """Answers /v2/everything like NewsAPI and counts calls per query"""
+    calls = {}
+    failing = False
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+        with FakeNewsAPI.lock:
+            FakeNewsAPI.calls[query] = FakeNewsAPI.calls.get(query, 0) + 1
+            call_number = FakeNewsAPI.calls[query]
+
+        time.sleep(FAKE_UPSTREAM_DELAY_SECONDS)
+
+        if FakeNewsAPI.failing:
+            self.send_response(429)
+            self.end_headers()
+            self.wfile.write(b'{"status":"error","code":"rateLimited"}')
+            return
+
+        body = json.dumps({
+            "status": "ok",
+            "articles": [{
+                "title": f"{query} #{call_number}",
+                "description": "Fake article",
+                "url": "https://example.com/article",
+                "urlToImage": None,
+                "publishedAt": datetime.now().isoformat(),
+                "source": {"name": "Fake News"}
+            }]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_newsapi():
+    server = ThreadingHTTPServer(("127.0.0.1", FAKE_NEWSAPI_PORT), FakeNewsAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def unique_query():
+    return f"moto-{uuid.uuid4().hex[:8]}"
+
+
+def print_test_header(test_name):
+    """Print formatted test header"""
+    print(f"\n{'='*80}")
+    print(f"TEST: {test_name}")
+    print(f"{'='*80}")
+
+def print_result(success, message):
+    """Print test result with the client and server time of its requests"""
+    status = "✅ PASS" if success else "❌ FAIL"
+    print(f"{status}: {message}")
+    count, client_time, server_time = take_timings()
+    if count:
+        print(f"   ⏱️  {format_timings(count, client_time, server_time)}")
+
+def print_error(error_msg):
+    """Print error message"""
+    print(f"❌ ERROR: {error_msg}")
+
+
+def test_concurrent_misses_share_one_call():
+    """Test concurrent GET /api/news misses coalesce into one upstream call"""
+    print_test_header("Concurrent Misses Share One Upstream Call")
+
+    try:
+        q = unique_query()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(
+                lambda _: session.get(f"{BASE_URL}/news", params={"q": q}),
+                range(8)
+            ))
+
+        statuses = [r.status_code for r in responses]
+        if any(status != 200 for status in statuses):
+            print_result(False, f"Expected all 200s, got {statuses}")
+            return False
+
+        calls = FakeNewsAPI.calls.get(q, 0)
+        if calls != 1:
+            print_result(False, f"Expected 1 upstream call for 8 concurrent requests, got {calls}")
+            return False
+
+        print_result(True, "8 concurrent requests made 1 upstream call")
+        return True
+    except Exception as e:
+        print_error(f"Exception during single-flight test: {str(e)}")
+        return False
+
+def test_fresh_entry_is_cached():
+    """Test a repeated GET /api/news is served from cache"""
+    print_test_header("Repeated Request Served from Cache")
+
+    try:
+        q = unique_query()
+        first = session.get(f"{BASE_URL}/news", params={"q": q})
+        second = session.get(f"{BASE_URL}/news", params={"q": q})
+        print(f"X-Cache: {first.headers.get('X-Cache')} then {second.headers.get('X-Cache')}")
+
+        if first.status_code != 200 or second.status_code != 200:
+            print_result(False, f"Expected 200s, got {first.status_code} and {second.status_code}")
+            return False
+        if second.headers.get('X-Cache') != 'HIT' or FakeNewsAPI.calls.get(q) != 1:
+            print_result(False, f"Second request went upstream ({FakeNewsAPI.calls.get(q)} calls)")
+            return False
+        if second.json() != first.json():
+            print_result(False, "Cached payload differs from the original")
+            return False
+
+        print_result(True, "Second request was a cache hit")
+        return True
+    except Exception as e:
+        print_error(f"Exception during cache hit test: {str(e)}")
+        return False
+
+def test_serves_last_good_payload_on_failure():
+    """Test GET /api/news keeps serving cached articles while the upstream fails"""
+    print_test_header("Last Good Payload Served on Upstream Failure")
+
+    try:
+        q = unique_query()
+        good = session.get(f"{BASE_URL}/news", params={"q": q})
+        if good.status_code != 200:
+            print_result(False, f"Initial fetch failed: {good.status_code}")
+            return False
+
+        FakeNewsAPI.failing = True
+        try:
+            time.sleep(NEWS_CACHE_TTL_SECONDS + 0.2)
+
+            # First stale read triggers a refresh that fails upstream, the
+            # one after it must still get the cached articles
+            for attempt in range(2):
+                response = session.get(f"{BASE_URL}/news", params={"q": q})
+                if response.status_code != 200 or response.json() != good.json():
+                    print_result(False, f"Attempt {attempt + 1}: expected cached articles, got {response.status_code}")
+                    return False
+                time.sleep(FAKE_UPSTREAM_DELAY_SECONDS + 0.2)
+        finally:
+            FakeNewsAPI.failing = False
+
+        if FakeNewsAPI.calls.get(q, 0) < 2:
+            print_result(False, "Stale entry was never refreshed upstream")
+            return False
+
+        print_result(True, "Cached articles served while the upstream returned 429")
+        return True
+    except Exception as e:
+        print_error(f"Exception during upstream failure test: {str(e)}")
+        return False
+
+def test_invalid_page_size():
+    """Test GET /api/news rejects a malformed pageSize"""
+    print_test_header("Reject Invalid pageSize")
+
+    try:
+        response = session.get(f"{BASE_URL}/news", params={"pageSize": "lots"})
+        if response.status_code != 400:
+            print_result(False, f"Expected 400, got {response.status_code}")
+            return False
+
+        print_result(True, "Malformed pageSize rejected with 400")
+        return True
+    except Exception as e:
+        print_error(f"Exception during pageSize validation test: {str(e)}")
+        return False
+
+
+def build_test_graph():
+    """Each test uses its own query; the failure test flips the fake for
+    everyone, so it runs alone"""
+    def node(func, exclusive=False):
+        return TestNode(func.__name__, func, "news", exclusive=exclusive)
+
+    return [
+        node(test_concurrent_misses_share_one_call),
+        node(test_fresh_entry_is_cached),
+        node(test_serves_last_good_payload_on_failure, exclusive=True),
+        node(test_invalid_page_size)
+    ]
+
+def run_all_tests(args=None):
+    """Run all news proxy tests against the fake upstream"""
+    args = args or parse_runner_args([])
+    print("\n" + "="*80)
+    print("MOTO SAGA NEWS PROXY TEST SUITE")
+    print("="*80)
+    print(f"Base URL: {BASE_URL}")
+    print(f"Fake NewsAPI: http://127.0.0.1:{FAKE_NEWSAPI_PORT}/v2/everything")
+    print(f"Workers: {args.workers}")
+    print("="*80)
+
+    server = start_fake_newsapi()
+    try:
+        results, wall_time = run_suite("news", build_test_graph(), args)
+    finally:
+        server.shutdown()
+    counts = summarize(results)
+
+    print("\n" + "="*80)
+    print("TEST SUMMARY")
+    print("="*80)
+    print(f"Total Tests: {len(results)}")
+    print(f"✅ Passed: {counts['passed']}")
+    print(f"❌ Failed: {counts['failed'] + counts['error']}")
+    print(f"Wall Time: {wall_time:.2f}s")
+    print("="*80)
+
+    return results
+
+if __name__ == "__main__":
+    args = parse_runner_args()
+    with target_base_url(args.local, BASE_URL, env=LOCAL_TARGET_ENV) as BASE_URL:
+        run_all_tests(args)
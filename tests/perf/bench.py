@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Moto Saga HTTP Benchmark
+Drives N concurrent virtual riders through the weighted journeys in
+scenarios.py and reports throughput and p50/p95/p99 per endpoint.
+
+Riders are asyncio tasks sharing one pooled httpx client, so the numbers
+measure the server rather than connection setup. Each run writes a JSON
+report; with --baseline it is compared against a saved run and any
+endpoint whose latency or error rate regressed past the tolerance fails
+the run (exit code 1).
+
+    pip install httpx
+    python -m tests.perf.bench --riders 50 --duration 60 \\
+        --baseline tests/perf/baselines/local.json
+
+Record or refresh a baseline with --update-baseline. Baselines only mean
+something for the same target, rider count and dataset.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+import httpx
+
+try:
+    from tests.local_target import target_base_url
+    from tests.perf.histogram import LatencyHistogram
+    from tests.perf.scenarios import SCENARIOS, RIDER_PASSWORD, seed_events
+except ImportError:  # run as a script, python tests/perf/bench.py
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from local_target import target_base_url
+    from histogram import LatencyHistogram
+    from scenarios import SCENARIOS, RIDER_PASSWORD, seed_events
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000/api")
+
+# A regression is a slowdown past both the relative tolerance and this many
+# milliseconds, so sub-millisecond jitter on fast endpoints does not fail runs
+DEFAULT_TOLERANCE = 0.20
+LATENCY_SLACK_MS = 5.0
+ERROR_RATE_SLACK = 0.01
+
+SEED_STORIES = 20
+SEED_EVENTS = 5
+
+# Written at the repo root, which .gitignore covers, so runs leave the tree clean
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bench_results.json"
+)
+
+
+class EndpointStats:
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.statuses = {}
+
+    def record(self, seconds, status):
+        self.histogram.record(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+
+
+class Recorder:
+    """Per-endpoint stats; riders only record requests started after warm-up"""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.transport_errors = 0
+        self.recording = False
+
+    def record(self, label, seconds, status):
+        self.endpoints.setdefault(label, EndpointStats()).record(seconds, status)
+
+
+class SharedState:
+    """Ids the riders act on, grown as they post stories"""
+
+    def __init__(self, admin_token, story_ids, event_ids):
+        self.admin_token = admin_token
+        self.story_ids = story_ids
+        self.event_ids = event_ids
+
+    def pick_story(self, rng):
+        # Skew towards recent stories, like a feed reader would
+        recent = self.story_ids[-50:]
+        return rng.choice(recent if rng.random() < 0.8 else self.story_ids)
+
+    def pick_event(self, rng):
+        return rng.choice(self.event_ids)
+
+
+class VirtualRider:
+    def __init__(self, index, client, recorder, shared, seed, think_time):
+        self.index = index
+        self.client = client
+        self.recorder = recorder
+        self.shared = shared
+        self.rng = random.Random(seed * 1_000_003 + index)
+        self.think_time = think_time
+        self.email = None
+        self.token = None
+        self.user_id = None
+
+    async def sign_up(self, run_id):
+        self.email = f"bench-{run_id}-{self.index}@motosaga.com"
+        response = await self.call("POST /auth/signup", "POST", "/auth/signup", json={
+            "email": self.email,
+            "password": RIDER_PASSWORD,
+            "name": f"Bench Rider {self.index}",
+            "role": "rider"
+        })
+        response.raise_for_status()
+        data = response.json()
+        self.token = data["token"]
+        self.user_id = data["user"]["id"]
+
+    async def call(self, label, method, path, auth=False, token=None, **kwargs):
+        token = token or (self.token if auth else None)
+        if token:
+            kwargs["headers"] = {"Authorization": f"Bearer {token}"}
+        recording = self.recorder.recording
+        start = time.perf_counter()
+        response = await self.client.request(method, path, **kwargs)
+        elapsed = time.perf_counter() - start
+        if recording:
+            self.recorder.record(label, elapsed, response.status_code)
+        return response
+
+    async def run(self, deadline):
+        _, weights, scenarios = zip(*SCENARIOS)
+        while time.monotonic() < deadline:
+            scenario = self.rng.choices(scenarios, weights)[0]
+            try:
+                await scenario(self)
+            except httpx.HTTPError as e:
+                if self.recorder.recording:
+                    self.recorder.transport_errors += 1
+                print(f"❌ ERROR: rider {self.index} {scenario.__name__}: {type(e).__name__}: {e}")
+            if self.think_time:
+                await asyncio.sleep(self.rng.expovariate(1 / self.think_time))
+
+
+async def set_up(client, recorder, args, run_id):
+    """Signs up the riders and an admin, and seeds stories and events"""
+    riders = [
+        VirtualRider(i, client, recorder, None, args.seed, args.think_time)
+        for i in range(args.riders)
+    ]
+    for start in range(0, len(riders), args.pool_size):
+        await asyncio.gather(*(rider.sign_up(run_id) for rider in riders[start:start + args.pool_size]))
+
+    response = await client.post("/auth/signup", json={
+        "email": f"bench-{run_id}-admin@motosaga.com",
+        "password": RIDER_PASSWORD,
+        "name": "Bench Admin",
+        "role": "admin"
+    })
+    response.raise_for_status()
+    admin_token = response.json()["token"]
+
+    story_ids = []
+    for i in range(SEED_STORIES):
+        author = riders[i % len(riders)]
+        response = await client.post("/stories", headers={"Authorization": f"Bearer {author.token}"}, json={
+            "title": f"Benchmark Story {i + 1}",
+            "content": "Seed story for the load benchmark.",
+            "location": "Mumbai",
+            "mediaUrls": []
+        })
+        response.raise_for_status()
+        story_ids.append(response.json()["id"])
+
+    shared = SharedState(admin_token, story_ids, await seed_events(client, admin_token, SEED_EVENTS))
+    for rider in riders:
+        rider.shared = shared
+    return riders
+
+
+def build_report(recorder, measured_seconds, args):
+    endpoints = {}
+    totals = LatencyHistogram()
+    total_errors = recorder.transport_errors
+    for label, stats in sorted(recorder.endpoints.items()):
+        count = stats.histogram.total_count
+        totals.merge(stats.histogram)
+        total_errors += stats.errors
+        endpoints[label] = {
+            "count": count,
+            "throughput": round(count / measured_seconds, 2),
+            "errors": stats.errors,
+            "error_rate": round(stats.errors / count, 4) if count else 0,
+            "statuses": {str(status): n for status, n in sorted(stats.statuses.items())},
+            "latency_ms": stats.histogram.summary()
+        }
+
+    return {
+        "meta": {
+            "base_url": BASE_URL,
+            "riders": args.riders,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "think_time": args.think_time,
+            "pool_size": args.pool_size,
+            "seed": args.seed,
+            "created_at": datetime.now().isoformat()
+        },
+        "total": {
+            "count": totals.total_count,
+            "throughput": round(totals.total_count / measured_seconds, 2),
+            "errors": total_errors,
+            "transport_errors": recorder.transport_errors,
+            "error_rate": round(total_errors / totals.total_count, 4) if totals.total_count else 0,
+            "latency_ms": totals.summary()
+        },
+        "endpoints": endpoints
+    }
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """Returns a list of human-readable regressions"""
+    regressions = []
+    for key in ("riders", "think_time"):
+        if baseline["meta"].get(key) != report["meta"].get(key):
+            print(f"⚠️  Baseline was recorded with {key}={baseline['meta'].get(key)}, "
+                  f"this run used {report['meta'].get(key)}")
+
+    for label, before in baseline["endpoints"].items():
+        after = report["endpoints"].get(label)
+        if not after:
+            print(f"⚠️  {label}: no samples this run")
+            continue
+        for percentile in ("p50", "p95", "p99"):
+            old = before["latency_ms"][percentile]
+            new = after["latency_ms"][percentile]
+            if new > old * (1 + tolerance) and new - old > LATENCY_SLACK_MS:
+                regressions.append(f"{label} {percentile} {old:.1f}ms -> {new:.1f}ms")
+        if after["error_rate"] > before["error_rate"] + ERROR_RATE_SLACK:
+            regressions.append(f"{label} error rate {before['error_rate']:.2%} -> {after['error_rate']:.2%}")
+
+    old, new = baseline["total"]["throughput"], report["total"]["throughput"]
+    if new < old * (1 - tolerance):
+        regressions.append(f"total throughput {old:.1f} -> {new:.1f} req/s")
+    return regressions
+
+
+def print_report(report):
+    print("\n" + "="*80)
+    print("BENCHMARK RESULTS")
+    print("="*80)
+    print(f"{'Endpoint':<32}{'count':>8}{'req/s':>9}{'err':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["total"])]
+    for label, row in rows:
+        latency = row["latency_ms"]
+        print(f"{label:<32}{row['count']:>8}{row['throughput']:>9.1f}{row['errors']:>7}"
+              f"{latency['p50']:>8.1f}ms{latency['p95']:>7.1f}ms{latency['p99']:>7.1f}ms")
+    print("="*80)
+
+
+async def run_benchmark(args):
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=args.pool_size, max_keepalive_connections=args.pool_size)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=args.timeout) as client:
+        print(f"Setting up {args.riders} riders...")
+        riders = await set_up(client, recorder, args, run_id)
+
+        deadline = time.monotonic() + args.warmup + args.duration
+        tasks = [asyncio.create_task(rider.run(deadline)) for rider in riders]
+
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+        measure_start = time.perf_counter()
+        print(f"Measuring for {args.duration}s...")
+        await asyncio.gather(*tasks)
+        measured_seconds = time.perf_counter() - measure_start
+
+    return build_report(recorder, measured_seconds, args)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP load benchmark for the Moto Saga API")
+    parser.add_argument("--riders", type=int, default=20, help="concurrent virtual riders (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds (default: %(default)s)")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds first (default: %(default)s)")
+    parser.add_argument("--think-time", type=float, default=0.1,
+                        help="mean pause between a rider's journeys in seconds, 0 for closed-loop (default: %(default)s)")
+    parser.add_argument("--pool-size", type=int, default=100, help="HTTP connection pool size (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for scenario selection (default: %(default)s)")
+    parser.add_argument("--output", metavar="PATH", default=DEFAULT_OUTPUT,
+                        help="JSON report (default: bench_results.json at the repo root)")
+    parser.add_argument("--baseline", metavar="PATH", help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run to --baseline instead of comparing")
+    parser.add_argument("--local", action="store_true",
+                        help="boot a local Next.js server on a throwaway MongoDB instead of using BASE_URL")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline requires --baseline PATH")
+    return args
+
+
+def main(argv=None):
+    global BASE_URL
+    args = parse_args(argv)
+    with target_base_url(args.local, BASE_URL) as BASE_URL:
+        return report_and_compare(args)
+
+
+def report_and_compare(args):
+    print("\n" + "="*80)
+    print("MOTO SAGA HTTP BENCHMARK")
+    print("="*80)
+    print(f"Base URL: {BASE_URL}")
+    print(f"Riders: {args.riders}, warm-up {args.warmup}s, measured {args.duration}s, seed {args.seed}")
+    print("="*80)
+
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📄 Report saved to: {args.output}")
+
+    if not report["total"]["count"]:
+        print("❌ FAIL: No requests completed")
+        return 1
+
+    if args.baseline and args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Baseline updated: {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ FAIL: {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"   • {regression}")
+            return 1
+        print(f"\n✅ PASS: Within {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
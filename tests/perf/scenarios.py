@@ -0,0 +1,106 @@
+"""
+Weighted user journeys for the benchmark, mirroring the flows that
+backend_test.py checks for a single user: browse the feed, read a story and
+its comments, like, comment, post, RSVP, log in and look at admin stats.
+
+Each scenario is an async function taking the VirtualRider that runs it.
+Requests go through `rider.call`, which times them under an endpoint label
+with ids folded out (`POST /stories/:id/like`).
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+RIDER_PASSWORD = "BenchRider123!"
+
+
+async def browse_feed(rider):
+    response = await rider.call("GET /stories", "GET", "/stories", params={"limit": 20})
+    next_cursor = response.headers.get("X-Next-Cursor")
+    # About a third of readers scroll to the second page
+    if next_cursor and rider.rng.random() < 0.35:
+        await rider.call("GET /stories?after", "GET", "/stories", params={"limit": 20, "after": next_cursor})
+
+
+async def read_story(rider):
+    story_id = rider.shared.pick_story(rider.rng)
+    await rider.call("GET /stories/:id", "GET", f"/stories/{story_id}")
+    await rider.call("GET /stories/:id/comments", "GET", f"/stories/{story_id}/comments", params={"limit": 10})
+
+
+async def like_story(rider):
+    story_id = rider.shared.pick_story(rider.rng)
+    await rider.call("POST /stories/:id/like", "POST", f"/stories/{story_id}/like", auth=True)
+
+
+async def comment_on_story(rider):
+    story_id = rider.shared.pick_story(rider.rng)
+    await rider.call("POST /stories/:id/comment", "POST", f"/stories/{story_id}/comment", auth=True, json={
+        "text": f"Great ride! Which route did you take? ({uuid.uuid4().hex[:6]})"
+    })
+
+
+async def post_story(rider):
+    response = await rider.call("POST /stories", "POST", "/stories", auth=True, json={
+        "title": f"Weekend Ride {uuid.uuid4().hex[:6]}",
+        "content": "Early start, empty highways and chai at the top of the ghat. Perfect Sunday.",
+        "location": "Lonavala, Maharashtra",
+        "mediaUrls": []
+    })
+    if response.status_code == 200:
+        rider.shared.story_ids.append(response.json()["id"])
+
+
+async def rsvp_to_event(rider):
+    await rider.call("GET /events", "GET", "/events", auth=True)
+    event_id = rider.shared.pick_event(rider.rng)
+    await rider.call("POST /events/:id/rsvp", "POST", f"/events/{event_id}/rsvp", auth=True)
+
+
+async def view_own_profile(rider):
+    await rider.call("GET /auth/me", "GET", "/auth/me", auth=True)
+    await rider.call("GET /users/:id", "GET", f"/users/{rider.user_id}")
+
+
+async def log_in_again(rider):
+    response = await rider.call("POST /auth/login", "POST", "/auth/login", json={
+        "email": rider.email,
+        "password": RIDER_PASSWORD
+    })
+    if response.status_code == 200:
+        rider.token = response.json()["token"]
+
+
+async def check_admin_stats(rider):
+    await rider.call("GET /admin/stats", "GET", "/admin/stats", token=rider.shared.admin_token)
+
+
+# (name, weight, scenario); weights are relative, roughly a read-heavy feed
+SCENARIOS = [
+    ("browse_feed", 40, browse_feed),
+    ("read_story", 20, read_story),
+    ("like_story", 12, like_story),
+    ("comment_on_story", 6, comment_on_story),
+    ("rsvp_to_event", 6, rsvp_to_event),
+    ("view_own_profile", 6, view_own_profile),
+    ("post_story", 4, post_story),
+    ("log_in_again", 4, log_in_again),
+    ("check_admin_stats", 2, check_admin_stats)
+]
+
+
+async def seed_events(client, admin_token, count):
+    """Events for riders to RSVP to, big enough that the limit never trips"""
+    event_ids = []
+    for i in range(count):
+        response = await client.post("/events", headers={"Authorization": f"Bearer {admin_token}"}, json={
+            "title": f"Benchmark Group Ride {i + 1}",
+            "description": "Open group ride for the load benchmark.",
+            "date": (datetime.now() + timedelta(days=30 + i)).isoformat(),
+            "location": "Gateway of India, Mumbai",
+            "eventType": "ride",
+            "maxAttendees": 1_000_000
+        })
+        response.raise_for_status()
+        event_ids.append(response.json()["id"])
+    return event_ids
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware concurrent runner for the Moto Saga test suites.
+
+Each test is a TestNode that names the pieces of shared state it needs
+(`requires`) and the ones it creates (`provides`), e.g. signup provides
+"user.rider1" and story creation requires it. Those declarations form a DAG.
+Independent branches run concurrently on a thread pool, and a test whose
+required state was never produced is skipped instead of failing on a
+missing key. `after` adds ordering-only edges for tests that touch the
+same record without handing data to each other (like -> unlike). An
+`exclusive` test runs with nothing else in flight, for latency budgets and
+cache checks that concurrent writes would disturb.
+
+Results can be written as a JUnit XML and/or JSON report with per-test
+wall time.
+"""
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+DEFAULT_WORKERS = 8
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+SKIPPED = "skipped"
+
+
+@dataclass
+class TestNode:
+    name: str
+    func: Callable[[], bool]
+    group: str = ""
+    requires: tuple = ()
+    provides: tuple = ()
+    after: tuple = ()
+    exclusive: bool = False
+    critical: bool = False
+
+
+@dataclass
+class TestResult:
+    name: str
+    group: str
+    status: str
+    duration: float = 0.0
+    message: str = ""
+    output: str = ""
+    critical: bool = False
+    started_at: Optional[str] = None
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that keeps each test's prints in its own buffer"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self):
+        self.local.buffer = io.StringIO()
+
+    def release(self):
+        buffer = getattr(self.local, "buffer", None)
+        self.local.buffer = None
+        return buffer.getvalue() if buffer else ""
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def build_graph(nodes):
+    """Returns {name: (blocking deps, ordering deps)}; raises on bad graphs"""
+    names = {node.name for node in nodes}
+    providers = {}
+    for node in nodes:
+        for key in node.provides:
+            providers.setdefault(key, set()).add(node.name)
+
+    graph = {}
+    for node in nodes:
+        blocking = set()
+        for key in node.requires:
+            if key not in providers:
+                raise ValueError(f"{node.name} requires '{key}', which no test provides")
+            blocking |= providers[key]
+        unknown = set(node.after) - names
+        if unknown:
+            raise ValueError(f"{node.name} runs after unknown tests: {sorted(unknown)}")
+        graph[node.name] = (blocking - {node.name}, set(node.after))
+
+    # Kahn's algorithm, only to reject cycles up front
+    indegree = {name: len(blocking | ordering) for name, (blocking, ordering) in graph.items()}
+    dependents = {name: [] for name in graph}
+    for name, (blocking, ordering) in graph.items():
+        for dep in blocking | ordering:
+            dependents[dep].append(name)
+    ready = [name for name, degree in indegree.items() if degree == 0]
+    visited = 0
+    while ready:
+        name = ready.pop()
+        visited += 1
+        for dependent in dependents[name]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+    if visited != len(graph):
+        cycle = sorted(name for name, degree in indegree.items() if degree > 0)
+        raise ValueError(f"Dependency cycle between: {cycle}")
+
+    return graph
+
+
+def _run_node(node, output):
+    started_at = datetime.now().isoformat()
+    output.capture()
+    start = time.perf_counter()
+    try:
+        status = PASSED if node.func() else FAILED
+        message = ""
+    except Exception as e:
+        status = ERROR
+        message = f"{type(e).__name__}: {e}"
+    duration = time.perf_counter() - start
+    return TestResult(
+        name=node.name,
+        group=node.group,
+        status=status,
+        duration=duration,
+        message=message,
+        output=output.release(),
+        critical=node.critical,
+        started_at=started_at
+    )
+
+
+def run_graph(nodes, workers=DEFAULT_WORKERS):
+    """Runs every node as soon as its dependencies are done. Returns
+    results in declaration order."""
+    graph = build_graph(nodes)
+    by_name = {node.name: node for node in nodes}
+    order = [node.name for node in nodes]
+    results = {}
+    print_lock = threading.Lock()
+
+    output = _ThreadOutput(sys.stdout)
+    real_stdout, sys.stdout = sys.stdout, output
+
+    def report(result):
+        with print_lock:
+            real_stdout.write(result.output)
+            if result.status == SKIPPED:
+                real_stdout.write(f"\n⏭️  SKIPPED {result.name}: {result.message}\n")
+            elif result.status == ERROR:
+                real_stdout.write(f"❌ ERROR: Test crashed: {result.message}\n")
+            real_stdout.flush()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            running = {}
+            while len(results) < len(order):
+                progressed = False
+                for name in order:
+                    if name in results or name in running.values():
+                        continue
+                    blocking, ordering = graph[name]
+                    if not (blocking | ordering) <= results.keys():
+                        continue
+
+                    failed = sorted(dep for dep in blocking if results[dep].status != PASSED)
+                    if failed:
+                        results[name] = TestResult(
+                            name=name,
+                            group=by_name[name].group,
+                            status=SKIPPED,
+                            message=f"blocked by {', '.join(failed)}",
+                            critical=by_name[name].critical
+                        )
+                        report(results[name])
+                        progressed = True
+                        continue
+
+                    # Exclusive tests wait for the pool to drain (nothing new
+                    # starts meanwhile) and keep it empty while they run
+                    node = by_name[name]
+                    if running and (node.exclusive or any(by_name[n].exclusive for n in running.values())):
+                        break
+                    running[pool.submit(_run_node, node, output)] = name
+                    progressed = True
+                    if node.exclusive:
+                        break
+
+                if progressed and not running:
+                    continue
+                if not running:
+                    raise RuntimeError("Test graph stalled")
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    report(results[name])
+    finally:
+        sys.stdout = real_stdout
+
+    return [results[name] for name in order]
+
+
+def summarize(results):
+    counts = {PASSED: 0, FAILED: 0, ERROR: 0, SKIPPED: 0}
+    for result in results:
+        counts[result.status] += 1
+    return counts
+
+
+def write_json_report(results, path, suite_name, wall_time):
+    with open(path, "w") as f:
+        json.dump({
+            "suite": suite_name,
+            "wall_time": round(wall_time, 3),
+            "summary": summarize(results),
+            "tests": [
+                {
+                    "name": result.name,
+                    "group": result.group,
+                    "status": result.status,
+                    "duration": round(result.duration, 3),
+                    "message": result.message,
+                    "critical": result.critical,
+                    "started_at": result.started_at
+                }
+                for result in results
+            ]
+        }, f, indent=2)
+
+
+def write_junit_report(results, path, suite_name, wall_time):
+    counts = summarize(results)
+    suite = ET.Element("testsuite", {
+        "name": suite_name,
+        "tests": str(len(results)),
+        "failures": str(counts[FAILED]),
+        "errors": str(counts[ERROR]),
+        "skipped": str(counts[SKIPPED]),
+        "time": f"{wall_time:.3f}",
+        "timestamp": datetime.now().isoformat()
+    })
+    for result in results:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": f"{suite_name}.{result.group}" if result.group else suite_name,
+            "name": result.name,
+            "time": f"{result.duration:.3f}"
+        })
+        if result.status == FAILED:
+            ET.SubElement(case, "failure", {"message": "test returned False"})
+        elif result.status == ERROR:
+            ET.SubElement(case, "error", {"message": result.message})
+        elif result.status == SKIPPED:
+            ET.SubElement(case, "skipped", {"message": result.message})
+        if result.output:
+            ET.SubElement(case, "system-out").text = result.output
+
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def parse_runner_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="tests run concurrently (default: %(default)s)")
+    parser.add_argument("--sequential", action="store_true",
+                        help="run one test at a time in declaration order")
+    parser.add_argument("--junit", metavar="PATH", help="write a JUnit XML report")
+    parser.add_argument("--json-report", metavar="PATH", help="write a JSON report")
+    parser.add_argument("--local", action="store_true",
+                        help="boot a local Next.js server on a throwaway MongoDB instead of using BASE_URL")
+    args = parser.parse_args(argv)
+    if args.sequential:
+        args.workers = 1
+    return args
+
+
+def run_suite(suite_name, nodes, args):
+    """Runs the graph, writes the requested reports, returns (results, wall time)"""
+    start = time.perf_counter()
+    results = run_graph(nodes, workers=args.workers)
+    wall_time = time.perf_counter() - start
+
+    if args.junit:
+        write_junit_report(results, args.junit, suite_name, wall_time)
+    if args.json_report:
+        write_json_report(results, args.json_report, suite_name, wall_time)
+    return results, wall_time
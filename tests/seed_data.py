@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Moto Saga Synthetic Data Seeder
+Bulk-loads production-shaped data straight into MongoDB so the feed, event
+and admin paths can be exercised and benchmarked at scale:
+
+  * users across every USER_ROLES value (mostly riders)
+  * stories with heavy-tailed likes, comments in the `comments` collection
+    and the matching commentCount / recentComments on each story
+  * events with large RSVP lists, some of them paid
+  * payments for paid events in every PAYMENT_STATUS
+
+Documents match what the models write (uuid `id`, ISO timestamps,
+profileVersion, bcrypt password hashes), so seeded users can log in with
+SEED_PASSWORD. Output is deterministic for a given --seed and --anchor.
+
+    pip install pymongo bcrypt
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=moto_saga_bench \\
+        python tests/seed_data.py --users 100000 --drop
+
+The target database must be named with --db-name or DB_NAME; the app's
+own database (moto_saga_db) is refused unless --force is given. The
+server builds its indexes on startup. --drop clears the collections the
+seeder writes first; nothing else is touched, so the admin stats snapshot
+picks the new data up at its next reconciliation.
+"""
+
+import argparse
+import os
+import random
+import string
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import bcrypt
+from pymongo import MongoClient
+
+# Mirrors backend/config/constants.js
+USER_ROLES = ("rider", "club", "creator", "admin")
+EVENT_TYPES = ("ride", "meetup", "race", "exhibition", "workshop")
+PAYMENT_STATUS = ("pending", "completed", "failed", "refunded", "cancelled")
+PAYMENT_GATEWAYS = ("razorpay", "paypal")
+BCRYPT_COST = int(os.environ.get("BCRYPT_COST", "10"))
+# Mirrors RECENT_COMMENTS_LIMIT in backend/models/Story.js
+RECENT_COMMENTS_LIMIT = 3
+
+SEED_PASSWORD = "SeedRider123!"
+SEED_EMAIL_DOMAIN = "seed.motosaga.com"
+
+ROLE_WEIGHTS = {"rider": 85, "creator": 8, "club": 6, "admin": 1}
+PAYMENT_STATUS_WEIGHTS = {"completed": 60, "pending": 15, "failed": 12, "cancelled": 8, "refunded": 5}
+
+SEEDED_COLLECTIONS = ("users", "stories", "comments", "events", "payments")
+# The database the app itself uses when DB_NAME is unset
+APP_DB_NAME = "moto_saga_db"
+
+FIRST_NAMES = ("Rajesh", "Priya", "Arjun", "Ananya", "Vikram", "Meera", "Karan", "Sneha",
+               "Rohan", "Kavya", "Aditya", "Isha", "Siddharth", "Neha", "Varun", "Pooja")
+LAST_NAMES = ("Kumar", "Sharma", "Patel", "Reddy", "Singh", "Iyer", "Nair", "Gupta",
+              "Mehta", "Joshi", "Rao", "Das", "Menon", "Chopra", "Bose", "Kapoor")
+CITIES = ("Mumbai", "Pune", "Bengaluru", "Delhi", "Chennai", "Hyderabad", "Kolkata",
+          "Jaipur", "Goa", "Leh", "Manali", "Shillong", "Kochi", "Ooty")
+BIKES = (("Royal Enfield", "Himalayan 450"), ("Royal Enfield", "Classic 350"),
+         ("KTM", "390 Adventure"), ("Bajaj", "Dominar 400"), ("Honda", "CB350"),
+         ("Triumph", "Speed 400"), ("Yamaha", "MT-15"), ("BMW", "G 310 GS"))
+RIDE_WORDS = ("sunrise", "monsoon", "ghat", "coastal", "highway", "mountain pass",
+              "night", "solo", "group", "weekend", "long-distance", "off-road")
+
+
+def seeded_uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def iso(moment):
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def heavy_tail(rng, mean, cap):
+    """Pareto-distributed count with roughly the given mean: most documents
+    get a few, a handful get thousands"""
+    alpha = 1.5
+    scale = mean * (alpha - 1) / alpha
+    return min(cap, int(scale * rng.paretovariate(alpha)))
+
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(RIDE_WORDS) for _ in range(words)).capitalize() + "."
+
+
+class Dataset:
+    """Ids of what has been generated so far, for the later collections"""
+
+    def __init__(self):
+        self.users = []  # (id, role, email, name)
+        self.by_role = {role: [] for role in USER_ROLES}
+        self.paid_events = []  # (id, ticketPrice, creatorId)
+
+    def add_user(self, user):
+        index = len(self.users)
+        self.users.append((user["id"], user["role"], user["email"], user["name"]))
+        self.by_role[user["role"]].append(index)
+
+    def user_ids(self, rng, count):
+        """`count` distinct random user ids"""
+        count = min(count, len(self.users))
+        return [self.users[i][0] for i in rng.sample(range(len(self.users)), count)]
+
+
+def generate_users(rng, count, anchor, password_hash, dataset):
+    roles = list(ROLE_WEIGHTS)
+    weights = list(ROLE_WEIGHTS.values())
+    for i in range(count):
+        # At least one of every role, whatever the count
+        role = roles[i] if i < len(roles) else rng.choices(roles, weights)[0]
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        city = rng.choice(CITIES)
+        created = anchor - timedelta(days=rng.uniform(0, 730))
+        brand, model = rng.choice(BIKES)
+        user = {
+            "id": seeded_uuid(rng),
+            "email": f"{role}{i}@{SEED_EMAIL_DOMAIN}",
+            "password": password_hash,
+            "name": name,
+            "role": role,
+            "bio": f"Rider from {city}",
+            "profileImage": "",
+            "bikeInfo": {"brand": brand, "model": model, "year": rng.randint(2012, 2025)} if role == "rider" else None,
+            "clubInfo": {
+                "location": city,
+                "memberCount": rng.randint(20, 2000),
+                "established": rng.randint(1990, 2024)
+            } if role == "club" else None,
+            "profileVersion": 1,
+            "createdAt": iso(created),
+            "updatedAt": iso(created)
+        }
+        dataset.add_user(user)
+        yield user
+
+
+def generate_stories(rng, count, anchor, dataset, mean_likes, mean_comments, comments_out):
+    """Yields stories; their comments are appended to `comments_out` so
+    both collections can be written in the same pass"""
+    # Creators post far more often than riders and clubs; admins do not post
+    authors = dataset.by_role["creator"] * 8 + dataset.by_role["rider"] + dataset.by_role["club"]
+    for _ in range(count):
+        author = dataset.users[rng.choice(authors)]
+        created = anchor - timedelta(days=rng.uniform(0, 365))
+        story_id = seeded_uuid(rng)
+
+        comments = []
+        moment = created
+        for _ in range(heavy_tail(rng, mean_comments, 2000)):
+            commenter = dataset.users[rng.randrange(len(dataset.users))][0]
+            moment = min(anchor, moment + timedelta(minutes=rng.uniform(1, 600)))
+            comments.append({
+                "id": seeded_uuid(rng),
+                "storyId": story_id,
+                "userId": commenter,
+                "text": sentence(rng, rng.randint(4, 20)),
+                "createdAt": iso(moment)
+            })
+        comments_out.extend(comments)
+
+        updated = max(created, moment)
+        yield {
+            "id": story_id,
+            "userId": author[0],
+            "title": f"{rng.choice(RIDE_WORDS).title()} ride to {rng.choice(CITIES)}",
+            "content": sentence(rng, rng.randint(20, 80)),
+            "mediaUrls": [],
+            "location": rng.choice(CITIES),
+            "likes": dataset.user_ids(rng, heavy_tail(rng, mean_likes, 20000)),
+            "commentCount": len(comments),
+            "recentComments": [
+                {key: comment[key] for key in ("id", "userId", "text", "createdAt")}
+                for comment in comments[-RECENT_COMMENTS_LIMIT:]
+            ],
+            "createdAt": iso(created),
+            "updatedAt": iso(updated)
+        }
+
+
+def generate_events(rng, count, anchor, dataset, mean_rsvps):
+    creators = dataset.by_role["admin"] + dataset.by_role["club"]
+    for _ in range(count):
+        creator_id = dataset.users[rng.choice(creators)][0]
+        created = anchor - timedelta(days=rng.uniform(0, 180))
+        rsvps = dataset.user_ids(rng, heavy_tail(rng, mean_rsvps, 50000))
+        # A third are full or nearly full; the rest are unlimited (0) or roomy
+        capacity_kind = rng.random()
+        if capacity_kind < 0.33:
+            max_attendees = len(rsvps) + rng.randint(0, 5)
+        elif capacity_kind < 0.66:
+            max_attendees = 0
+        else:
+            max_attendees = len(rsvps) * 2 + 50
+        ticket_price = rng.choice((0, 0, 0, 299, 499, 999, 2499))
+        event = {
+            "id": seeded_uuid(rng),
+            "creatorId": creator_id,
+            "title": f"{rng.choice(CITIES)} {rng.choice(RIDE_WORDS)} {rng.choice(EVENT_TYPES)}",
+            "description": sentence(rng, rng.randint(15, 50)),
+            "date": iso(anchor + timedelta(days=rng.uniform(-90, 270))),
+            "location": rng.choice(CITIES),
+            "eventType": rng.choice(EVENT_TYPES),
+            "maxAttendees": max_attendees,
+            "imageUrl": "",
+            "ticketPrice": ticket_price,
+            "currency": "INR",
+            "requiresPayment": ticket_price > 0,
+            "rsvps": rsvps,
+            "createdAt": iso(created),
+            "updatedAt": iso(created + timedelta(days=rng.uniform(0, 30)))
+        }
+        if ticket_price:
+            dataset.paid_events.append((event["id"], ticket_price, creator_id))
+        yield event
+
+
+def generate_payments(rng, count, anchor, dataset):
+    if not dataset.paid_events:
+        return
+    statuses = list(PAYMENT_STATUS_WEIGHTS)
+    weights = list(PAYMENT_STATUS_WEIGHTS.values())
+    for i in range(count):
+        # Every status appears at least once
+        status = statuses[i] if i < len(statuses) else rng.choices(statuses, weights)[0]
+        event_id, ticket_price, _ = rng.choice(dataset.paid_events)
+        user_id, _, email, name = dataset.users[rng.randrange(len(dataset.users))]
+        gateway = rng.choice(PAYMENT_GATEWAYS)
+        quantity = rng.choices((1, 2, 3, 4), (70, 20, 7, 3))[0]
+        created = anchor - timedelta(days=rng.uniform(0, 180))
+        order_suffix = "".join(rng.choices(string.ascii_letters + string.digits, k=14))
+        payment = {
+            "id": seeded_uuid(rng),
+            "userId": user_id,
+            "eventId": event_id,
+            "amount": ticket_price * quantity,
+            "currency": "INR",
+            "gateway": gateway,
+            "gatewayOrderId": f"order_{order_suffix}" if gateway == "razorpay" else order_suffix.upper(),
+            "gatewayPaymentId": "",
+            "quantity": quantity,
+            "status": status,
+            "userEmail": email,
+            "userName": name,
+            "metadata": {},
+            "createdAt": iso(created),
+            "updatedAt": iso(created + timedelta(minutes=rng.uniform(1, 30)))
+        }
+        if status in ("completed", "refunded"):
+            payment["gatewayPaymentId"] = f"pay_{order_suffix}"
+            payment["completedAt"] = payment["updatedAt"]
+        yield payment
+
+
+def insert_batches(collection, documents, batch_size):
+    """insert_many in unordered batches; returns the number inserted"""
+    inserted = 0
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch, ordered=False)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+    return inserted
+
+
+def parse_args(argv=None):
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic Moto Saga data")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME"),
+                        help="database to seed (default: $DB_NAME; required)")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--stories", type=int, default=20_000)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--payments", type=int, default=20_000)
+    parser.add_argument("--mean-likes", type=float, default=25, help="mean likes per story (heavy-tailed)")
+    parser.add_argument("--mean-comments", type=float, default=5, help="mean comments per story (heavy-tailed)")
+    parser.add_argument("--mean-rsvps", type=float, default=400, help="mean RSVPs per event (heavy-tailed)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=datetime.fromisoformat, default=today,
+                        help="'now' for generated timestamps (default: today 00:00 UTC)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--drop", action="store_true", help="clear the seeded collections first")
+    parser.add_argument("--force", action="store_true", help=f"allow seeding {APP_DB_NAME}")
+    args = parser.parse_args(argv)
+    if not args.db_name:
+        parser.error("--db-name (or DB_NAME) is required")
+    if args.db_name == APP_DB_NAME and not args.force:
+        parser.error(f"refusing to seed the app database {APP_DB_NAME} without --force")
+    if args.anchor.tzinfo is None:
+        args.anchor = args.anchor.replace(tzinfo=timezone.utc)
+    return args
+
+
+BCRYPT_ALPHABET = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def bcrypt_salt(rng):
+    """22 characters of bcrypt's base64 alphabet; the last one only carries
+    two bits, so it is drawn from the characters bcrypt itself emits there"""
+    return ("".join(rng.choice(BCRYPT_ALPHABET) for _ in range(21)) + rng.choice(".Oeu")).encode()
+
+
+def seed(args):
+    rng = random.Random(args.seed)
+    # One hash for everyone: hashing per user would take minutes, and a
+    # salt drawn from the seed keeps the output reproducible
+    salt = f"$2a${BCRYPT_COST:02d}$".encode() + bcrypt_salt(random.Random(f"{args.seed}-salt"))
+    password_hash = bcrypt.hashpw(SEED_PASSWORD.encode(), salt).decode()
+
+    client = MongoClient(args.mongo_url)
+    db = client[args.db_name]
+    if args.drop:
+        for name in SEEDED_COLLECTIONS:
+            db[name].delete_many({})
+
+    dataset = Dataset()
+    counts = {}
+    start = time.perf_counter()
+
+    counts["users"] = insert_batches(
+        db["users"], generate_users(rng, args.users, args.anchor, password_hash, dataset), args.batch_size)
+
+    comments = []
+    counts["stories"] = insert_batches(
+        db["stories"],
+        generate_stories(rng, args.stories, args.anchor, dataset, args.mean_likes, args.mean_comments, comments),
+        args.batch_size)
+    counts["comments"] = insert_batches(db["comments"], comments, args.batch_size)
+
+    counts["events"] = insert_batches(
+        db["events"], generate_events(rng, args.events, args.anchor, dataset, args.mean_rsvps), args.batch_size)
+    counts["payments"] = insert_batches(
+        db["payments"], generate_payments(rng, args.payments, args.anchor, dataset), args.batch_size)
+
+    client.close()
+    return counts, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print("\n" + "="*80)
+    print("MOTO SAGA SYNTHETIC DATA SEEDER")
+    print("="*80)
+    print(f"Target: {args.mongo_url} / {args.db_name}")
+    print(f"Seed: {args.seed}, anchor: {iso(args.anchor)}")
+    print("="*80)
+
+    counts, elapsed = seed(args)
+
+    for name, count in counts.items():
+        print(f"   {name:<10} {count:>10,}")
+    print(f"\n✅ Seeded in {elapsed:.1f}s. Seeded users log in with {SEED_PASSWORD}")